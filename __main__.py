@@ -1,6 +1,5 @@
 if __name__ == '__main__':
     import argparse
-    from paqc.driver import driver
 
     # define command line parser
     parser = argparse.ArgumentParser(prog='paqc', description='Data QC package '
@@ -13,10 +12,22 @@ if __name__ == '__main__':
     parser.add_argument('--silent', action='store_false',
                         help="Controls verbosity. Use it if you want paqc to"
                              "run with less messages.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of threads/processes the QCs of an input "
+                             "file are executed with, if the executor in the "
+                             "general section of the config is threads or "
+                             "processes, and size of the process pool of the "
+                             "connectors. Defaults to the number of CPUs.")
+    parser.add_argument('--no-cache', action='store_false', dest='use_cache',
+                        help="Executes every QC, instead of reusing the "
+                             "results cached by earlier runs for the input "
+                             "files and QCs that didn't change.")
 
     # parse input parameters
     args = parser.parse_args()
 
-    # execute PAQC pipeline
-    d = driver.Driver(args.config_path, verbose=args.silent, debug=args.debug)
+    # execute PAQC pipeline, imported only now so --help stays fast
+    from paqc.driver import driver
+    d = driver.Driver(args.config_path, verbose=args.silent, debug=args.debug,
+                      workers=args.workers, use_cache=args.use_cache)
     d.run()
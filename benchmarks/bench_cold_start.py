@@ -0,0 +1,60 @@
+"""
+Cold-start benchmark of paqc. Every measurement runs in a fresh Python
+process, so nothing is cached in memory between runs.
+
+It times:
+    - the command line interface with --help,
+    - constructing a Driver and looking up a single QC function (qc4) with the
+      lazy QCRegistry,
+    - the same with the eager import_submodules, which imports every QC
+      collection.
+
+Run it from the root of the repository:
+    python benchmarks/bench_cold_start.py [n_runs]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    'cli --help': None,
+    'Driver + qc4 (lazy registry)': (
+        "from paqc.driver import driver\n"
+        "d = driver.Driver('paqc/tests/data/config_test_check19.yml')\n"
+        "d.qc_functions['qc4']\n"),
+    'import_submodules + qc4 (eager)': (
+        "import paqc.qc_functions as qcs_main\n"
+        "qcs_main.import_submodules(qcs_main)['qc4']\n"),
+}
+
+
+def time_command(cmd, n_runs):
+    """
+    :param cmd: Command to run, as a list.
+    :param n_runs: Number of times to run it.
+    :return: List of wall times in seconds.
+    """
+    times = []
+    for _ in range(n_runs):
+        ts = time.time()
+        subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.time() - ts)
+    return times
+
+
+def main(n_runs=5):
+    print("%-35s %10s %10s" % ('benchmark', 'min (s)', 'median (s)'))
+    for name, snippet in SNIPPETS.items():
+        if snippet is None:
+            cmd = [sys.executable, '__main__.py', 'config.yml', '--help']
+        else:
+            cmd = [sys.executable, '-c', snippet]
+        times = sorted(time_command(cmd, n_runs))
+        print("%-35s %10.3f %10.3f" % (name, times[0], times[len(times) // 2]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,93 @@
+"""
+Benchmark of the QCs that read the profile of the columns of their input
+(qc3, qc6, qc15, qc16 and qc41), on a frame of random counts, flags, floats
+and dates with a binary target column.
+
+It times the QCs one after another:
+    - each with a profile of its own, as when they are executed without the
+      Driver,
+    - sharing a single :class:`~paqc.utils.column_profile.ColumnProfile`, as
+      the Driver does, so each column is profiled once.
+Run it from the root of the repository:
+    python benchmarks/bench_column_profile.py [n_rows] [n_cols] [n_runs]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy as np
+import pandas as pd
+
+from paqc.qc_functions.qcs_all_data_1to13 import qc3, qc6
+from paqc.qc_functions.qcs_all_data_others import qc15, qc16
+from paqc.qc_functions.qcs_flagprop import qc41
+from paqc.utils import column_profile
+
+GENERAL = {'target_col': 'target', 'flag_cols': '_flag',
+           'count_cols': '_count', 'freq_cols': '_freq', 'age_col': 'AGE'}
+QC_FUNCTIONS = [qc3, qc6, qc15, qc16, qc41]
+
+
+def generate_df(n_rows, n_cols, seed=0):
+    rnd = np.random.RandomState(seed)
+    dict_cols = {'target': rnd.randint(0, 2, n_rows)}
+    for i in range(n_cols):
+        kind = i % 4
+        if kind == 0:
+            dict_cols['feature%d_count' % i] = rnd.randint(0, 5, n_rows)
+        elif kind == 1:
+            dict_cols['feature%d_flag' % i] = \
+                (rnd.rand(n_rows) < 0.3).astype(np.int64)
+        elif kind == 2:
+            ss = rnd.rand(n_rows)
+            ss[rnd.rand(n_rows) < 0.2] = np.nan
+            dict_cols['feature%d_score' % i] = ss
+        else:
+            ss = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+                rnd.randint(0, 3000, n_rows), unit='D'))
+            ss[rnd.rand(n_rows) < 0.2] = pd.NaT
+            dict_cols['feature%d_first_exp_dt' % i] = ss
+    return pd.DataFrame(dict_cols)
+
+
+def best_time(func, n_runs):
+    """
+    :return: Best wall time in seconds and the output of func.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+    return min(times), output
+
+
+def run_qcs(df, shared):
+    """
+    :return: List of the (passed, extra) of the QC_FUNCTIONS.
+    """
+    dict_config = {'general': GENERAL, 'qc': {'qc_num': 'qc', 'level': 'error',
+                                              'input_file': 'input1',
+                                              'input_file_path': 'input1'}}
+    if shared:
+        dict_config['column_profile'] = column_profile.ColumnProfile(df)
+    return [(rpi.passed, rpi.extra) for rpi in
+            (qc_function(df, dict_config) for qc_function in QC_FUNCTIONS)]
+
+
+def main(n_rows=100000, n_cols=1000, n_runs=3):
+    df = generate_df(n_rows, n_cols)
+    print("%d rows, %d columns, %.1f MB" % (
+        n_rows, n_cols, df.memory_usage().sum() / 2 ** 20))
+    time_own, output_own = best_time(lambda: run_qcs(df, False), n_runs)
+    time_shared, output_shared = best_time(lambda: run_qcs(df, True),
+                                           n_runs)
+    assert output_own == output_shared
+    print("%24s %10.3fs" % ('a profile per QC', time_own))
+    print("%24s %10.3fs" % ('shared profile', time_shared))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,83 @@
+"""
+Benchmark of the descriptive statistics of qc49 (min, max, mean, median and
+fraction of zero or null values) on a frame of random counts, flags, floats
+with missing values and dates with missing values.
+
+It times:
+    - DataFrame.apply with np.min, np.max and the functions of
+      :mod:`~paqc.utils.utils`, as qc49 used to,
+    - :func:`~paqc.utils.column_stats.describe_columns`.
+
+Run it from the root of the repository:
+    python benchmarks/bench_column_stats.py [n_rows] [n_cols] [n_runs]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy as np
+import pandas as pd
+
+from paqc.utils import column_stats
+from paqc.utils import utils
+
+
+def generate_df(n_rows, n_cols, seed=0):
+    """
+    :return: DataFrame of n_cols numeric and datetime columns.
+    """
+    rnd = np.random.RandomState(seed)
+    dict_cols = {}
+    for i in range(n_cols):
+        kind = i % 4
+        if kind == 0:
+            ss = rnd.randint(0, 5, n_rows)
+        elif kind == 1:
+            ss = (rnd.rand(n_rows) < 0.3).astype(np.int64)
+        elif kind == 2:
+            ss = rnd.rand(n_rows)
+            ss[rnd.rand(n_rows) < 0.2] = np.nan
+        else:
+            ss = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+                rnd.randint(0, 3000, n_rows), unit='D')).astype(
+                'datetime64[us]')
+            ss[rnd.rand(n_rows) < 0.2] = pd.NaT
+        dict_cols['feature%d_%d' % (i, kind)] = ss
+    return pd.DataFrame(dict_cols)
+
+
+def describe_apply(df):
+    df_summary = df.apply([np.min, np.max, utils.mean_all_types,
+                           utils.median_all_types,
+                           utils.fraction_zeroes_or_null]).transpose()
+    df_summary.columns = column_stats.STATS
+    return df_summary
+
+
+def best_time(func, df, n_runs):
+    """
+    :return: Best wall time in seconds and the output of func.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        output = func(df)
+        times.append(time.perf_counter() - start)
+    return min(times), output
+
+
+def main(n_rows=100000, n_cols=200, n_runs=3):
+    df = generate_df(n_rows, n_cols)
+    print("%d rows, %d columns" % (n_rows, n_cols))
+    time_apply, df_apply = best_time(describe_apply, df, n_runs)
+    time_kernel, df_kernel = best_time(column_stats.describe_columns, df,
+                                       n_runs)
+    pd.testing.assert_frame_equal(df_kernel, df_apply)
+    print("%18s %10.3fs" % ('apply', time_apply))
+    print("%18s %10.3fs" % ('describe_columns', time_kernel))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
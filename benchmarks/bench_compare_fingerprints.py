@@ -0,0 +1,121 @@
+"""
+Benchmark of the comparison QCs qc48 and qc49 on an old and a refreshed
+extract that only differ in a handful of columns: a frame of random counts,
+flags, floats and dates, and a copy of it with n_changed columns changed.
+
+It times:
+    - fingerprinting the columns of both frames, which the Driver does once
+      per loaded input, see :func:`~paqc.utils.hashing.column_fingerprints`,
+    - qc48 on all columns and qc49, comparing every column value by value, as
+      without the fingerprints,
+    - the same QCs only comparing the columns whose fingerprints differ,
+and the peak of the memory they allocate.
+
+The motivating case is two frames of 1M rows and 5000 columns, which need
+about 80GB of memory, so the default frames are smaller. Run it from the
+root of the repository:
+    python benchmarks/bench_compare_fingerprints.py [n_rows] [n_cols]
+    [n_changed] [n_runs]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy as np
+import pandas as pd
+
+from paqc.qc_functions import qcs_compare
+from paqc.utils import hashing
+
+GENERAL = {'patient_id_col': 'patient_id'}
+
+
+def generate_dfs(n_rows, n_cols, n_changed, seed=0):
+    """
+    :return: Tuple of the old and new DataFrame.
+    """
+    rnd = np.random.RandomState(seed)
+    dict_cols = {'patient_id': np.arange(n_rows)}
+    for i in range(n_cols - 1):
+        kind = i % 4
+        if kind == 0:
+            ss = rnd.randint(0, 5, n_rows)
+        elif kind == 1:
+            ss = (rnd.rand(n_rows) < 0.3).astype(np.int64)
+        elif kind == 2:
+            ss = rnd.rand(n_rows)
+            ss[rnd.rand(n_rows) < 0.2] = np.nan
+        else:
+            ss = pd.Timestamp('2010-01-01') + pd.to_timedelta(
+                rnd.randint(0, 3000, n_rows), unit='D')
+        dict_cols['feature%d_%d' % (i, kind)] = ss
+    df_old = pd.DataFrame(dict_cols)
+    df_new = df_old.copy()
+    for col in rnd.choice(df_old.columns[1:], n_changed, replace=False):
+        rows = rnd.choice(n_rows, max(n_rows // 1000, 1), replace=False)
+        df_new.loc[rows, col] = df_new.loc[rows[::-1], col].values
+    return df_old, df_new
+
+
+def best_time(func, n_runs):
+    """
+    :return: Best wall time in seconds, peak of the allocated memory in MB
+             and the output of func.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return min(times), peak, output
+
+
+def main(n_rows=100000, n_cols=500, n_changed=5, n_runs=3):
+    df_old, df_new = generate_dfs(n_rows, n_cols, n_changed)
+    print("2 frames of %d rows, %d columns, %d changed columns, %.1f MB each"
+          % (n_rows, n_cols, n_changed,
+             df_old.memory_usage().sum() / 2 ** 20))
+    dict_config = {'general': GENERAL, 'qc': {'qc_num': 'qc48',
+                                              'level': 'error',
+                                              'input_file': 'input1',
+                                              'input_file_path': 'input1'}}
+
+    # in a single process, to time the hashing itself
+    def fingerprint():
+        return [pd.Series(hashing.column_fingerprints(df, parallel=False),
+                          index=df.columns, dtype=object)
+                for df in (df_old, df_new)]
+
+    print("%36s %10s %12s" % ('', 'time', 'peak memory'))
+    time_fp, peak_fp, fingerprints = best_time(fingerprint, n_runs)
+    print("%36s %10.3fs %10.1fMB" % ('fingerprints of both frames', time_fp,
+                                     peak_fp))
+    dict_config_fp = dict(dict_config, column_fingerprints=fingerprints)
+    ls_colnames = df_old.columns.tolist()
+    for qc_num, qc_function, args in [
+            ('qc48', qcs_compare.qc48, (ls_colnames,)),
+            ('qc49', qcs_compare.qc49, ())]:
+        time_full, peak_full, rpi_full = best_time(
+            lambda: qc_function(df_old, df_new, dict_config, *args), n_runs)
+        time_changed, peak_changed, rpi_changed = best_time(
+            lambda: qc_function(df_old, df_new, dict_config_fp, *args),
+            n_runs)
+        if qc_num == 'qc48':
+            assert rpi_full.extra == rpi_changed.extra
+        else:
+            pd.testing.assert_frame_equal(rpi_full.extra, rpi_changed.extra)
+        print("%36s %10.3fs %10.1fMB" % (qc_num + ', all columns',
+                                         time_full, peak_full))
+        print("%36s %10.3fs %10.1fMB" % (qc_num + ', changed columns',
+                                         time_changed, peak_changed))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,102 @@
+"""
+Benchmark of the conversion of the date columns of CS03-like data, i.e.
+paqc/data/CS03.csv (27 date columns) repeated to the wanted number of rows and
+split in shards, as the csv connector sees them.
+
+It times, per shard and in total:
+    - the previous conversion, which parsed each column with pd.to_datetime
+      on a new Pool(cpu_count()) for every large file,
+    - the :class:`~paqc.connectors.date_parser.DateParser`, which factorizes
+      all date columns together and only parses new distinct strings.
+
+Only the conversion is timed, reading the csv files is the same for both.
+
+Run it from the root of the repository:
+    python benchmarks/bench_date_parsing.py [n_rows_per_shard] [n_shards]
+"""
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool, cpu_count
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import pandas as pd
+
+from paqc.connectors import date_parser, parse_utils
+from paqc.utils import utils, worker_pool
+from paqc.utils.config_utils import config_open
+
+CS03_PATH = 'paqc/data/CS03.csv'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_COLS_KEYS = ['date_cols', 'first_exp_date_cols', 'last_exp_date_cols',
+                  'index_date_col', 'lookback_date_col']
+
+
+def load_shards(n_rows, n_shards):
+    """
+    :return: Tuple of the list of shards, DataFrames with string dates, and
+             the list of date columns.
+    """
+    config = config_open('paqc/data/CS03_config.yml')[1]
+    header = pd.read_csv(CS03_PATH, nrows=0)
+    date_cols = utils.generate_list_columns(header, config, DATE_COLS_KEYS)
+    df = pd.read_csv(CS03_PATH, dtype={date_col: str for date_col in
+                                       date_cols})
+    n_repeats = -(-n_rows * n_shards // len(df))
+    df = pd.concat([df] * n_repeats, ignore_index=True)
+    return [df.iloc[i * n_rows:(i + 1) * n_rows].copy() for i in
+            range(n_shards)], date_cols
+
+
+def parse_previous(df, date_cols):
+    # the code paths of read_csv before the DateParser
+    if len(date_cols) > 50 or (df.shape[0] > 20000 and len(date_cols) > 1):
+        pool = Pool(cpu_count())
+        df_parsed = pd.concat(pool.map(partial(parse_utils.parse_dates,
+                                               format=DATE_FORMAT),
+                                       [df[col] for col in date_cols]),
+                              axis=1)
+        pool.close()
+        pool.join()
+        return df_parsed
+    return df[date_cols].apply(pd.to_datetime, format=DATE_FORMAT)
+
+
+def parse_date_parser(df, date_cols):
+    return date_parser.parse_date_columns(df, date_cols, DATE_FORMAT)
+
+
+def time_shards(func, ls_shards, date_cols):
+    """
+    :return: Tuple of the list of times per shard in seconds and the list of
+             parsed DataFrames.
+    """
+    times = []
+    ls_parsed = []
+    for df in ls_shards:
+        start = time.perf_counter()
+        ls_parsed.append(func(df, date_cols))
+        times.append(time.perf_counter() - start)
+    return times, ls_parsed
+
+
+def main(n_rows=100000, n_shards=4):
+    ls_shards, date_cols = load_shards(n_rows, n_shards)
+    print("%d shards of %d rows, %d date columns, %d cores" % (
+        n_shards, n_rows, len(date_cols), cpu_count()))
+    times_prev, ls_prev = time_shards(parse_previous, ls_shards, date_cols)
+    times_new, ls_new = time_shards(parse_date_parser, ls_shards, date_cols)
+    for df_prev, df_new in zip(ls_prev, ls_new):
+        pd.testing.assert_frame_equal(df_prev, df_new)
+    print("%8s %14s %14s" % ('shard', 'previous (s)', 'DateParser (s)'))
+    for i, (time_prev, time_new) in enumerate(zip(times_prev, times_new)):
+        print("%8d %14.3f %14.3f" % (i, time_prev, time_new))
+    print("%8s %14.3f %14.3f" % ('total', sum(times_prev), sum(times_new)))
+    worker_pool.get_pool().close()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,102 @@
+"""
+Benchmark of the selection of the features that belong to a list of clinical
+code descriptions, as done by qc22, qc24, qc30 and generate_list_cc0x_columns.
+
+It times, for a growing number of code descriptions and of features:
+    - the regex alternation "(a)|(b)|..." of all descriptions the QCs used to
+      compile and search,
+    - the :class:`~paqc.utils.feature_matcher.FeatureMatcher`.
+
+The descriptions and features are random cleaned strings of 5 to 40
+characters, a tenth of the features contain a description. The regex takes
+minutes for 10000 descriptions, so it's only timed up to 1000 of them.
+
+Run it from the root of the repository:
+    python benchmarks/bench_feature_matcher.py [n_runs]
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from paqc.utils.feature_matcher import FeatureMatcher
+
+N_CODES = (100, 1000, 10000)
+N_FEATURES = (100, 1000, 10000)
+ALPHABET = string.ascii_lowercase + '_'
+MAX_REGEX_CODES = 1000
+
+
+def random_string(rnd, min_len=5, max_len=40):
+    """
+    :param rnd: random.Random instance.
+    :return: Random string of lowercase letters and underscores.
+    """
+    return ''.join(rnd.choice(ALPHABET) for _ in
+                   range(rnd.randint(min_len, max_len)))
+
+
+def generate_data(n_codes, n_features, seed=0):
+    """
+    :param n_codes: Number of code descriptions.
+    :param n_features: Number of features.
+    :return: Tuple of the list of descriptions and the list of features.
+    """
+    rnd = random.Random(seed)
+    ls_codes = [random_string(rnd) for _ in range(n_codes)]
+    ls_features = []
+    for _ in range(n_features):
+        if rnd.random() < 0.1:
+            ls_features.append(rnd.choice(ls_codes) + '_' +
+                               random_string(rnd, 0, 5))
+        else:
+            ls_features.append(random_string(rnd))
+    return ls_codes, ls_features
+
+
+def select_regex(ls_codes, ls_features):
+    prog = re.compile("(" + ")|(".join(ls_codes) + ")")
+    return [feature for feature in ls_features if prog.search(feature)]
+
+
+def select_matcher(ls_codes, ls_features):
+    return FeatureMatcher(ls_codes).filter(ls_features)
+
+
+def best_time(func, args, n_runs):
+    """
+    :return: Tuple of the best wall time in seconds and the function's output.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        output = func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), output
+
+
+def main(n_runs=3):
+    print("%8s %10s %12s %12s %8s" % ('codes', 'features', 'regex (s)',
+                                      'matcher (s)', 'speedup'))
+    for n_codes in N_CODES:
+        for n_features in N_FEATURES:
+            args = generate_data(n_codes, n_features)
+            time_matcher, out_matcher = best_time(select_matcher, args, n_runs)
+            if n_codes > MAX_REGEX_CODES:
+                print("%8d %10d %12s %12.4f %8s" % (n_codes, n_features, '-',
+                                                   time_matcher, '-'))
+                continue
+            time_regex, out_regex = best_time(select_regex, args, n_runs)
+            assert out_regex == out_matcher
+            print("%8d %10d %12.4f %12.4f %7.1fx" % (
+                n_codes, n_features, time_regex, time_matcher,
+                time_regex / time_matcher))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,71 @@
+"""
+Benchmark of the fractions of zero or null values per class of qc16 and
+qc50, on a frame of random counts, flags, floats and dates with a binary
+target column.
+
+It times df.groupby(target).agg(fraction_zeroes_or_null), which qc16 and
+qc50 did before, against
+:func:`~paqc.utils.utils.grouped_fraction_zeroes_or_null`, and checks they
+give the same fractions. Run it from the root of the repository:
+    python benchmarks/bench_grouped_fractions.py [n_rows] [n_cols] [n_runs]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy as np
+import pandas as pd
+
+from paqc.utils import utils
+
+
+def generate_df(n_rows, n_cols, seed=0):
+    rnd = np.random.RandomState(seed)
+    dict_cols = {'target': rnd.randint(0, 2, n_rows)}
+    for i in range(n_cols):
+        kind = i % 4
+        if kind == 0:
+            ss = rnd.randint(0, 5, n_rows)
+        elif kind == 1:
+            ss = (rnd.rand(n_rows) < 0.3).astype(np.int64)
+        elif kind == 2:
+            ss = rnd.rand(n_rows)
+            ss[rnd.rand(n_rows) < 0.2] = np.nan
+        else:
+            ss = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+                rnd.randint(0, 3000, n_rows), unit='D'))
+            ss[rnd.rand(n_rows) < 0.2] = pd.NaT
+        dict_cols['feature%d_%d' % (i, kind)] = ss
+    return pd.DataFrame(dict_cols)
+
+
+def best_time(func, n_runs):
+    """
+    :return: Best wall time in seconds and the output of func.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+    return min(times), output
+
+
+def main(n_rows=100000, n_cols=1000, n_runs=3):
+    df = generate_df(n_rows, n_cols)
+    print("%d rows, %d columns, %.1f MB" % (
+        n_rows, n_cols, df.memory_usage().sum() / 2 ** 20))
+    time_agg, df_agg = best_time(
+        lambda: df.groupby('target').agg(utils.fraction_zeroes_or_null),
+        n_runs)
+    time_kernel, df_kernel = best_time(
+        lambda: utils.grouped_fraction_zeroes_or_null(df, 'target'), n_runs)
+    pd.testing.assert_frame_equal(df_kernel, df_agg)
+    print("%32s %10.3fs" % ('groupby agg', time_agg))
+    print("%32s %10.3fs" % ('grouped_fraction_zeroes_or_null', time_kernel))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,100 @@
+"""
+Benchmark of the QCs that look for null values (qc6, qc7, qc12, qc14, qc26
+and qc41), on a frame of features with flag, count and date columns that
+are missing together on some rows, and a few single missing values.
+
+It times the QCs one after another:
+    - each with a null mask of its own, as when they are executed without
+      the Driver,
+    - sharing a single :class:`~paqc.utils.null_mask.NullMask`, as the
+      Driver does, so the nulls of each column are computed once,
+and compares the memory of the packed mask with the one of df.isnull().
+Run it from the root of the repository:
+    python benchmarks/bench_null_mask.py [n_rows] [n_feats] [n_runs]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy as np
+import pandas as pd
+
+from paqc.qc_functions.qcs_all_data_1to13 import qc6, qc7, qc12
+from paqc.qc_functions.qcs_all_data_others import qc14
+from paqc.qc_functions.qcs_CS02 import qc26
+from paqc.qc_functions.qcs_flagprop import qc41
+from paqc.utils import null_mask
+
+GENERAL = {'count_cols': '_count', 'freq_cols': '_FREQ', 'flag_cols': '_flag',
+           'first_exp_date_cols': '_first_exp_dt',
+           'last_exp_date_cols': '_last_exp_dt',
+           'patient_id_col': 'patient_id'}
+QC_FUNCTIONS = [qc6, qc7, qc12, qc14, qc26, qc41]
+
+
+def generate_df(n_rows, n_feats, seed=0):
+    rnd = np.random.RandomState(seed)
+    dict_cols = {'patient_id': np.arange(n_rows).astype(float),
+                 'diseasefirstexp_dt': pd.Series(pd.NaT, index=range(n_rows),
+                                                 dtype='datetime64[ns]')}
+    dates = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+        rnd.randint(0, 3000, n_rows), unit='D'))
+    for i in range(n_feats):
+        missing = rnd.rand(n_rows) < 0.5
+        dict_cols['pred%d_flag' % i] = np.where(missing, 0, 1)
+        dict_cols['pred%d_count' % i] = np.where(
+            missing, np.nan, rnd.randint(1, 5, n_rows))
+        dict_cols['pred%d_first_exp_dt' % i] = dates.where(~missing)
+    df = pd.DataFrame(dict_cols)
+    df.loc[rnd.randint(0, n_rows, 10), 'patient_id'] = np.nan
+    return df
+
+
+def best_time(func, n_runs):
+    """
+    :return: Best wall time in seconds and the output of func.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+    return min(times), output
+
+
+def run_qcs(df, shared):
+    """
+    :return: List of the (passed, extra) of the QC_FUNCTIONS.
+    """
+    dict_config = {'general': GENERAL, 'qc': {'qc_num': 'qc', 'level': 'error',
+                                              'input_file': 'input1',
+                                              'input_file_path': 'input1'}}
+    if shared:
+        dict_config['null_mask'] = null_mask.NullMask(df)
+    return [(rpi.passed, rpi.extra) for rpi in
+            (qc_function(df, dict_config) for qc_function in QC_FUNCTIONS)]
+
+
+def main(n_rows=100000, n_feats=300, n_runs=3):
+    df = generate_df(n_rows, n_feats)
+    print("%d rows, %d columns, %.1f MB" % (
+        n_rows, df.shape[1], df.memory_usage().sum() / 2 ** 20))
+    time_own, output_own = best_time(lambda: run_qcs(df, False), n_runs)
+    time_shared, output_shared = best_time(lambda: run_qcs(df, True),
+                                           n_runs)
+    assert output_own == output_shared
+    print("%24s %10.3fs" % ('a null mask per QC', time_own))
+    print("%24s %10.3fs" % ('shared null mask', time_shared))
+
+    mask = null_mask.NullMask(df)
+    mask.count(df)
+    size_packed = sum(arr.nbytes for arr in mask.packed_columns.values())
+    print("%24s %10.1fMB" % ('df.isnull()',
+                             df.isnull().memory_usage().sum() / 2 ** 20))
+    print("%24s %10.1fMB" % ('packed null mask', size_packed / 2 ** 20))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,91 @@
+"""
+Benchmark of the readers of .rds files, on CS03-like data, i.e.
+paqc/data/CS03.csv repeated to the wanted number of rows, with its date
+columns as Date/POSIXct columns and a factor column, written to a temporary
+.rds file with :func:`~paqc.connectors.rds_native.write_rds_file`.
+
+It times the reading of the file into a DataFrame by:
+    - the rpy2 reader, readRDS + pandas2ri.ri2py, if rpy2 and R are
+      installed,
+    - the native reader of :mod:`~paqc.connectors.rds_native`,
+    - pd.read_csv of the same data as a csv file, for reference.
+
+Run it from the root of the repository:
+    python benchmarks/bench_rds_reader.py [n_rows] [n_runs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import pandas as pd
+
+from paqc.connectors import rds, rds_native
+from paqc.utils import utils
+from paqc.utils.config_utils import config_open
+
+CS03_PATH = 'paqc/data/CS03.csv'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_COLS_KEYS = ['date_cols', 'first_exp_date_cols', 'last_exp_date_cols',
+                  'index_date_col', 'lookback_date_col']
+
+
+def generate_df(n_rows):
+    """
+    :return: DataFrame of CS03 repeated to n_rows rows, with parsed dates and
+             the gender as a factor.
+    """
+    config = config_open('paqc/data/CS03_config.yml')[1]
+    df = pd.read_csv(CS03_PATH)
+    date_cols = utils.generate_list_columns(df, config, DATE_COLS_KEYS)
+    df[date_cols] = df[date_cols].apply(pd.to_datetime, format=DATE_FORMAT)
+    df = pd.concat([df] * -(-n_rows // len(df)), ignore_index=True)
+    df = df.iloc[:n_rows]
+    gender_col = config['general']['gender_col']
+    df[gender_col] = df[gender_col].astype('category')
+    return df
+
+
+def read_rpy2(path):
+    from rpy2.robjects import pandas2ri
+
+    return pandas2ri.ri2py(rds.get_readRDS()(path))
+
+
+def best_time(func, path, n_runs):
+    """
+    :return: Best wall time in seconds.
+    """
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        func(path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(n_rows=100000, n_runs=3):
+    df = generate_df(n_rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_rds = os.path.join(tmp_dir, 'CS03.rds')
+        path_csv = os.path.join(tmp_dir, 'CS03.csv')
+        rds_native.write_rds_file(df, path_rds)
+        df.to_csv(path_csv, index=False)
+        print("%d rows, %d columns, .rds file of %.1f MB" % (
+            df.shape[0], df.shape[1], os.path.getsize(path_rds) / 2 ** 20))
+
+        ls_readers = [('native', rds_native.read_rds_file, path_rds),
+                      ('read_csv', pd.read_csv, path_csv)]
+        try:
+            import rpy2
+            ls_readers.insert(0, ('rpy2', read_rpy2, path_rds))
+        except ImportError:
+            print("%10s %s" % ('rpy2', 'not installed'))
+        for name, func, path in ls_readers:
+            print("%10s %10.3fs" % (name, best_time(func, path, n_runs)))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
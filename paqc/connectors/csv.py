@@ -1,6 +1,6 @@
 import pandas as pd
 from paqc.utils import utils
-from paqc.connectors import parse_utils
+from paqc.connectors import date_parser
 
 
 def read_csv_header(input_file_path):
@@ -13,21 +13,25 @@ def read_csv_header(input_file_path):
     return pd.read_csv(input_file_path, nrows=0)
 
 
-def read_csv(config, input_file_path):
+def read_csv(config, input_file_path, columns=None):
     """
     Reads in a csv file, and attempts to use the date format that is specified
     in the config file. The date columns it uses are the ones that are specified
     by the date_cols, first_exp_date_cols, last_exp_date_cols, index_date_col
     and lookback_date_col params in the general section of the YAML config.
-    Depending on the size of the dataset, and the number of date columns, we
-    might use parallelisation to speed things up.
+    All date columns are converted together by the
+    :class:`~connectors.date_parser.DateParser` of the date format.
 
     :param config: Parsed YAML config file.
     :param input_file_path: Absolute path to the csv file.
+    :param columns: List of the names of the columns to read, all columns if
+           None.
     :return: Tuple: first is a Boolean whether loading and parsing was
              successful, second is the pandas DataFrame if Bool=True.
     """
     header = read_csv_header(input_file_path)
+    if columns is not None:
+        header = header[columns]
 
     general = config['general']
     date_cols_types = ['date_cols',
@@ -38,18 +42,44 @@ def read_csv(config, input_file_path):
     date_cols = utils.generate_list_columns(header, config, date_cols_types)
     # it turns out we should read the dates first in as strings
     date_cols_types = {date_col: str for date_col in date_cols}
-    df = pd.read_csv(input_file_path, dtype=date_cols_types)
+    df = pd.read_csv(input_file_path, dtype=date_cols_types, usecols=columns)
     # convert string dates to dates using the date format
-    # Large dataset, conversion done in parallel
-    if len(date_cols) > 50 or (df.shape[0] > 20000 and len(date_cols) > 1):
-        print('parallel!')
-        # we have to do this in parallel otherwise it takes forever
-        df[date_cols] = parse_utils.apply_parallel(df[date_cols],
-                                                   parse_utils.parse_dates,
-                                                   format=general['date_format'])
-    # Small dataset, faster to convert in non-parallel fashion
-    elif len(date_cols) > 0:
-        df[date_cols] = df[date_cols].apply(pd.to_datetime,
-                                            format=general['date_format'])
+    if len(date_cols) > 0:
+        df[date_cols] = date_parser.parse_date_columns(df, date_cols,
+                                                       general['date_format'])
     return df
 
+
+def read_csv_chunks(config, input_file_path, chunksize, columns=None):
+    """
+    Reads in a csv file chunk by chunk, so files larger than memory can be
+    streamed through the QCs. The date columns of each chunk are converted
+    the same way as in :func:`~connectors.csv.read_csv`. The chunks keep the
+    row index they would have in the fully loaded DataFrame.
+
+    :param config: Parsed YAML config file.
+    :param input_file_path: Absolute path to the csv file.
+    :param chunksize: Number of rows in each chunk.
+    :param columns: List of the names of the columns to read, all columns if
+           None.
+    :return: Generator of pandas DataFrames.
+    """
+    header = read_csv_header(input_file_path)
+    if columns is not None:
+        header = header[columns]
+
+    general = config['general']
+    date_cols_types = ['date_cols',
+                       'first_exp_date_cols',
+                       'last_exp_date_cols',
+                       'index_date_col',
+                       'lookback_date_col']
+    date_cols = utils.generate_list_columns(header, config, date_cols_types)
+    date_cols_types = {date_col: str for date_col in date_cols}
+    for df in pd.read_csv(input_file_path, dtype=date_cols_types,
+                          usecols=columns, chunksize=chunksize):
+        # the date parser remembers the dates of the previous chunks
+        if len(date_cols) > 0:
+            df[date_cols] = date_parser.parse_date_columns(
+                df, date_cols, general['date_format'])
+        yield df
@@ -1,7 +1,7 @@
 from paqc.connectors import parse_utils
 
 
-def parse_dataframe(config, df):
+def parse_dataframe(config, df, inplace=False):
     """
     Accepts an already loaded pandas DataFrame. This is useful if you want to
     paqc in an interactive session, or for development. For this, you need to
@@ -11,9 +11,12 @@ def parse_dataframe(config, df):
 
     :param config: Parsed YAML config file.
     :param df: Input pandas DataFrame.
+    :param inplace: Boolean, whether the date columns of df that aren't
+           datetimes yet are converted in df itself, see
+           :func:`~connectors.parse_utils.check_dates`.
     :return: Tuple: first is a Boolean whether loading and parsing was
              successful, second is the pandas DataFrame if Bool=True.
     """
 
-    df = parse_utils.check_dates(config, df)
+    df = parse_utils.check_dates(config, df, inplace)
     return df
@@ -0,0 +1,180 @@
+"""
+Conversion of the date columns of an input file to datetimes, using the
+date_format of the general section of the config.
+
+Claims data repeats the same dates over and over, across rows, across date
+columns and across the shards of an input. The :class:`DateParser` therefore
+factorizes each date column in a single pass, and parses the distinct strings
+of all columns it hasn't seen before together. The strings it parsed
+are kept, so later columns, chunks and files with the same date_format are
+mostly lookups. Once more than CACHE_MAX_STRINGS strings are kept, e.g. for
+timestamps that rarely repeat, only the ones of the current file are, so
+the cache doesn't grow for the whole run. When a lot of new strings show up at once, e.g. for the first
+file of a cohort, they're parsed in chunks on the active
+:class:`~utils.worker_pool.WorkerPool`, which write the datetimes to shared
+memory.
+"""
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from paqc.connectors import parse_utils
+from paqc.utils import worker_pool
+
+# Number of new distinct strings from which they're parsed on the process pool
+PARALLEL_MIN_UNIQUES = 200000
+# Number of parsed strings kept by a DateParser, beyond which it only keeps
+# the ones of the columns it's parsing
+CACHE_MAX_STRINGS = 2000000
+
+
+class DateParser:
+    """
+    Parses strings with a single date format, remembering the strings it has
+    already parsed.
+    """
+
+    def __init__(self, date_format):
+        """
+        :param date_format: Format of the dates, see pd.to_datetime.
+        """
+        self.date_format = date_format
+        # parsed strings: datetimes
+        self.ss_cache = pd.Series(pd.to_datetime([], format=date_format),
+                                  index=pd.Index([], dtype=object))
+
+    def parse_uniques(self, arr_uniques):
+        """
+        Parses the values that aren't in the cache yet and adds them to it.
+        If the cache would hold more than CACHE_MAX_STRINGS strings, it's
+        reset to the values.
+
+        :param arr_uniques: Array of distinct, non null values.
+        :return: None
+        """
+        arr_cached = pd.Index(arr_uniques).isin(self.ss_cache.index)
+        arr_new = arr_uniques[~arr_cached]
+        if len(self.ss_cache) + len(arr_new) > CACHE_MAX_STRINGS:
+            self.ss_cache = self.ss_cache.reindex(arr_uniques[arr_cached])
+        if len(arr_new) >= PARALLEL_MIN_UNIQUES:
+            ss_new = pd.Series(self.parse_parallel(arr_new), index=arr_new)
+        elif len(arr_new):
+            ss_new = pd.Series(parse_utils.parse_dates(
+                arr_new, format=self.date_format), index=arr_new)
+        else:
+            ss_new = None
+        if ss_new is not None:
+            self.ss_cache = pd.concat([self.ss_cache, ss_new])
+
+    def parse_parallel(self, arr_strings):
+        """
+        Parses chunks of the strings on the active
+        :class:`~utils.worker_pool.WorkerPool`. The workers write the parsed
+        datetimes to shared memory instead of pickling them back.
+
+        :param arr_strings: Array of strings.
+        :return: Numpy datetime64 array of the parsed strings.
+        """
+        pool = worker_pool.get_pool()
+        ls_starts = [int(start) for start in np.linspace(
+            0, len(arr_strings), pool.processes + 1)]
+        shm = shared_memory.SharedMemory(
+            create=True, size=max(1, len(arr_strings) * 8))
+        try:
+            ls_dtypes = pool.map(
+                partial(_parse_to_shared, self.date_format, shm.name),
+                [(start, arr_strings[start:end]) for start, end in
+                 zip(ls_starts[:-1], ls_starts[1:])])
+            # each chunk has the resolution pd.to_datetime gave it, they're
+            # joined at the finest one
+            arr_int = np.ndarray(len(arr_strings), dtype=np.int64,
+                                 buffer=shm.buf)
+            arr_dates = np.empty(len(arr_strings),
+                                 dtype=np.result_type(*ls_dtypes))
+            for start, end, dtype in zip(ls_starts[:-1], ls_starts[1:],
+                                         ls_dtypes):
+                arr_dates[start:end] = arr_int[start:end].view(dtype)
+            del arr_int
+        finally:
+            shm.close()
+            shm.unlink()
+        return arr_dates
+
+    def parse_columns(self, df, date_cols):
+        """
+        :param df: pandas DataFrame.
+        :param date_cols: List of the names of the columns of df to parse.
+        :return: pandas DataFrame with the parsed date_cols, with the index
+                 of df.
+        """
+        # one pass over each column to find its distinct strings
+        dict_factorized = {col: pd.factorize(df[col]) for col in date_cols}
+        # the new strings of all columns are parsed together, the columns
+        # share most of their dates
+        arr_uniques = pd.unique(np.concatenate(
+            [np.asarray(uniques, dtype=object) for codes, uniques in
+             dict_factorized.values()]))
+        self.parse_uniques(arr_uniques)
+
+        dict_parsed = dict()
+        for col, (arr_codes, uniques) in dict_factorized.items():
+            # pd.to_datetime gives columns without any dates their own
+            # resolution
+            if len(uniques) == 0:
+                dict_parsed[col] = parse_utils.parse_dates(
+                    df[col], format=self.date_format).values
+                continue
+            arr_dates = self.ss_cache.reindex(
+                np.asarray(uniques, dtype=object)).values
+            # nulls have code -1 and become NaT
+            dict_parsed[col] = np.append(arr_dates, np.array(
+                ['NaT'], dtype=arr_dates.dtype))[arr_codes]
+        return pd.DataFrame(dict_parsed, index=df.index, columns=date_cols)
+
+
+def _parse_to_shared(date_format, name, chunk):
+    """
+    Runs in the workers of :meth:`DateParser.parse_parallel`.
+
+    :param date_format: Format of the dates, see pd.to_datetime.
+    :param name: Name of the shared memory block of the output.
+    :param chunk: Tuple of the position of the chunk in the output and the
+           array of strings to parse.
+    :return: dtype of the parsed datetimes, whose int64 values are written to
+             the output.
+    """
+    start, arr_strings = chunk
+    arr_dates = np.asarray(parse_utils.parse_dates(arr_strings,
+                                                   format=date_format))
+    shm = shared_memory.SharedMemory(name=name)
+    arr_out = np.ndarray(len(arr_dates), dtype=np.int64, buffer=shm.buf,
+                         offset=start * 8)
+    arr_out[:] = arr_dates.view(np.int64)
+    del arr_out
+    shm.close()
+    return arr_dates.dtype
+
+
+_date_parsers = dict()
+
+
+def get_date_parser(date_format):
+    """
+    :param date_format: Format of the dates, see pd.to_datetime.
+    :return: The :class:`DateParser` of this process for the date format.
+    """
+    if date_format not in _date_parsers:
+        _date_parsers[date_format] = DateParser(date_format)
+    return _date_parsers[date_format]
+
+
+def parse_date_columns(df, date_cols, date_format):
+    """
+    :param df: pandas DataFrame.
+    :param date_cols: List of the names of the columns of df to parse.
+    :param date_format: Format of the dates, see pd.to_datetime.
+    :return: pandas DataFrame with the parsed date_cols, with the index of df.
+    """
+    return get_date_parser(date_format).parse_columns(df, date_cols)
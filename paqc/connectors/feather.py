@@ -2,16 +2,55 @@ import pandas as pd
 from paqc.connectors import parse_utils
 
 
-def read_feather(config, input_file_path):
+def read_feather_columns(input_file_path):
+    """
+    Reads the column names from the schema of a .feather file, without
+    reading any data. Only Feather V2 (Arrow IPC) files have a schema that
+    can be read on its own: for V1 files, the column names are unknown and
+    the whole file is loaded.
+
+    :param input_file_path: Absolute path to the .feather file.
+    :return: List of the column names, or None for Feather V1 files.
+    """
+    import pyarrow
+    import pyarrow.ipc
+
+    try:
+        with pyarrow.ipc.open_file(input_file_path) as reader:
+            return reader.schema.names
+    except pyarrow.ArrowInvalid:
+        return None
+
+
+def read_feather(config, input_file_path, columns=None):
     """
     Reads in .feather files directly into pandas. You need to have
     feather-format installed in python.
 
+    If memory_map is true in the general section of the config, the file is
+    memory-mapped instead of read into memory first and then converted. For
+    uncompressed files written as a single record batch (e.g.
+    df.to_feather(path, compression='uncompressed', chunksize=len(df))), the
+    numeric and datetime columns without missing values are read-only views
+    on the file, so the processes QC-ing several shards of an input at once
+    share their pages instead of each holding a copy. Other columns and files
+    are still converted into memory, but without the intermediate copy.
+
     :param config: Parsed YAML config file.
     :param input_file_path: Absolute path to the csv file.
+    :param columns: List of the names of the columns to read, all columns if
+           None.
     :return: Tuple: first is a Boolean whether loading and parsing was
              successful, second is the pandas DataFrame if Bool=True.
     """
 
-    df = pd.read_feather(input_file_path)
+    if config['general'].get('memory_map'):
+        import pyarrow.feather
+
+        table = pyarrow.feather.read_table(input_file_path, columns=columns,
+                                           memory_map=True)
+        # a block per column, so columns can stay views on the file
+        df = table.to_pandas(split_blocks=True)
+    else:
+        df = pd.read_feather(input_file_path, columns=columns)
     return parse_utils.check_dates(config, df)
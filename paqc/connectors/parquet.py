@@ -0,0 +1,65 @@
+"""
+Reads parquet files with pyarrow, which is only imported once a parquet file
+is actually read. Parquet stores each column separately, so only the columns
+the QCs need are read from disk (see :mod:`~qc_functions.column_needs`), and
+its row groups can be streamed through the QCs one batch at a time.
+"""
+from paqc.connectors import parse_utils
+
+
+def read_parquet_columns(input_file_path):
+    """
+    Reads the column names from the schema of a parquet file, without
+    reading any data.
+
+    :param input_file_path: Absolute path to the parquet file.
+    :return: List of the column names.
+    """
+    import pyarrow.parquet as pq
+
+    return pq.read_schema(input_file_path).names
+
+
+def read_parquet(config, input_file_path, columns=None):
+    """
+    Reads in a parquet file, or only some of its columns. Date columns that
+    weren't stored as timestamps are converted with the date_format of the
+    config, as for the other connectors.
+
+    :param config: Parsed YAML config file.
+    :param input_file_path: Absolute path to the parquet file.
+    :param columns: List of the names of the columns to read, all columns if
+           None.
+    :return: pandas DataFrame.
+    """
+    import pyarrow.parquet as pq
+
+    df = pq.read_table(input_file_path, columns=columns).to_pandas()
+    return parse_utils.check_dates(config, df)
+
+
+def read_parquet_chunks(config, input_file_path, chunksize, columns=None):
+    """
+    Reads in a parquet file in batches of at most chunksize rows, one row
+    group after the other, so files larger than memory can be streamed
+    through the QCs. The dates of each chunk are converted the same way as in
+    :func:`~connectors.parquet.read_parquet`, and the chunks keep the row
+    index they would have in the fully loaded DataFrame.
+
+    :param config: Parsed YAML config file.
+    :param input_file_path: Absolute path to the parquet file.
+    :param chunksize: Maximum number of rows in each chunk.
+    :param columns: List of the names of the columns to read, all columns if
+           None.
+    :return: Generator of pandas DataFrames.
+    """
+    import pyarrow.parquet as pq
+
+    n_rows = 0
+    parquet_file = pq.ParquetFile(input_file_path)
+    for batch in parquet_file.iter_batches(batch_size=chunksize,
+                                           columns=columns):
+        df = batch.to_pandas()
+        df.index = df.index + n_rows
+        n_rows += len(df)
+        yield parse_utils.check_dates(config, df)
@@ -1,55 +1,58 @@
 import pandas as pd
-import numpy as np
-from functools import partial
-from multiprocessing import cpu_count, Pool
 from paqc.utils import utils
+from paqc.utils import worker_pool
 
 
 def parse_dates(column, **kwargs):
     """
-    Helper function we'll apply to each date column in parallel to parse dates.
-    Don't use this without apply_parallel.
-
-    :param column: DataFrame column, with type str.
-    :return: DataFrame column as datatime column with date_format applied.
+    Parses strings to datetimes. The
+    :class:`~connectors.date_parser.DateParser` calls it on the distinct
+    strings it hasn't parsed yet, in the process or in the workers of the
+    active :class:`~utils.worker_pool.WorkerPool`, and on the columns
+    without any date.
+
+    :param column: DataFrame column or array, with type str.
+    :param kwargs: Arguments of pd.to_datetime, e.g. format.
+    :return: The datetimes of column, as pd.to_datetime returns them.
     """
     return pd.to_datetime(column, **kwargs)
 
 
 def apply_parallel(df, func, **kwargs):
     """
-    Parallelizes the apply function of pandas. Works for columns only.
+    Parallelizes the apply function of pandas. Works for columns only. The
+    columns are sent in batches to the active
+    :class:`~utils.worker_pool.WorkerPool`.
 
     :param df: DataFrame to use. Note, all columns are used.
     :param func: Function to apply to each column of df.
     :return: Transformed df.
     """
+    return worker_pool.get_pool().map_columns(func, df, **kwargs)
 
-    # split DataFrame into columns
-    df_cols = [df[col] for col in df]
-
-    # use all cores and do parallel magic
-    pool = Pool(cpu_count())
-    df = pd.concat(pool.map(partial(func, **kwargs), df_cols), axis=1)
-    pool.close()
-    pool.join()
-
-    return df
 
-
-def check_dates(config, df):
+def check_dates(config, df, inplace=False):
     """
     Util function for certain connectors. It takes in a pandas DataFrame and
     the config file to check if there are any date columns that do not conform
     with the date_format field of the config file. If there are, it converts
-    these two to the required date format either doing this in parallel or in
-    series, depending on the size of the DataFrame.
+    these to the required date format with the
+    :class:`~connectors.date_parser.DateParser` of the date format.
+
+    Only the converted columns are allocated: they replace the date columns
+    in a shallow copy of df, which shares all other columns with df, so df
+    itself isn't changed. With inplace=True, they replace the date columns
+    of df itself, so the original date columns can be freed right away.
 
     :param config: Parsed YAML config file.
     :param df: Input pandas DataFrame.
+    :param inplace: Boolean, whether to convert the date columns of df in
+           place.
     :return: pandas DataFrame with all dates conforming the requested
              date_format of the config file.
     """
+    # date_parser uses parse_dates of this module, so it's imported here
+    from paqc.connectors import date_parser
 
     general = config['general']
     date_cols_keys = ['date_cols',
@@ -62,23 +65,17 @@ def check_dates(config, df):
     # Check if there are any columns that should be datetime, but aren't
     dtype_date_cols = df.dtypes[date_cols]
     dtype_date_cols = dtype_date_cols[dtype_date_cols.apply(lambda x: not
-        np.issubdtype(x, np.datetime64))]
+        pd.api.types.is_datetime64_dtype(x))]
 
     # List of all date column names that are not in date format yet
     date_cols = dtype_date_cols.index.tolist()
 
-    # Large dataset, conversion done in parallel
-    if len(date_cols) > 50 or (df.shape[0] > 20000 and len(date_cols) > 1):
-        # make copy of dataframe to do conversion on
-        df = df.copy()
-        # we have to do this in parallel otherwise it takes forever
-        df[date_cols] = apply_parallel(df[date_cols], parse_dates,
-                                       format=general['date_format'])
-
-    # Small dataset, faster to convert in non-parallel fashion
-    elif len(date_cols) > 0:
-        # make copy of dataframe to do conversion on
-        df = df.copy()
-        df[date_cols] = df[date_cols].apply(pd.to_datetime,
-                                            format=general['date_format'])
+    if len(date_cols) > 0:
+        df_parsed = date_parser.parse_date_columns(df, date_cols,
+                                                   general['date_format'])
+        if not inplace:
+            # the other columns aren't copied
+            df = df.copy(deep=False)
+        for date_col in date_cols:
+            df[date_col] = df_parsed[date_col]
     return df
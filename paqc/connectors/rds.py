@@ -1,24 +1,46 @@
-import rpy2.robjects as robjects
-from rpy2.robjects import pandas2ri
 from paqc.connectors import parse_utils
+from paqc.connectors import rds_native
 
-# activate pandas - R bridge
-pandas2ri.activate()
-readRDS = robjects.r['readRDS']
-robjects.r('memory.limit(64000)')
+# the R session is only started once we actually read an .rds file
+_readRDS = None
+
+
+def get_readRDS():
+    """
+    Imports rpy2, activates the pandas - R bridge and starts the R session on
+    the first call, so paqc only needs rpy2 and R if the source is rds.
+
+    :return: The readRDS function of R.
+    """
+    global _readRDS
+    if _readRDS is None:
+        import rpy2.robjects as robjects
+        from rpy2.robjects import pandas2ri
+
+        # activate pandas - R bridge
+        pandas2ri.activate()
+        robjects.r('memory.limit(64000)')
+        _readRDS = robjects.r['readRDS']
+    return _readRDS
 
 
 def read_rds(config, input_file_path):
     """
-    Reads in .rds files directly into pandas. You need to have rpy2 installed
-    in python.
+    Reads in .rds files directly into pandas. By default, this needs rpy2 and
+    R installed. With rds_reader: native in the general section of the
+    config, data.frames are decoded in pure Python instead, see
+    :mod:`~connectors.rds_native`.
 
     :param config: Parsed YAML config file.
     :param input_file_path: Absolute path to the csv file.
     :return: Tuple: first is a Boolean whether loading and parsing was
              successful, second is the pandas DataFrame if Bool=True.
     """
+    if config['general'].get('rds_reader', 'rpy2') == 'native':
+        df = rds_native.read_rds_file(input_file_path)
+    else:
+        from rpy2.robjects import pandas2ri
 
-    # TODO: check why is this so slow on large files.
-    df = pandas2ri.ri2py(readRDS(input_file_path))
+        # TODO: check why is this so slow on large files.
+        df = pandas2ri.ri2py(get_readRDS()(input_file_path))
     return parse_utils.check_dates(config, df)
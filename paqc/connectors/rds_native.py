@@ -0,0 +1,544 @@
+"""
+Reads .rds files of R data.frames in pure Python, without rpy2 or an R
+installation.
+
+An .rds file is a (usually gzip, bzip2 or xz compressed) serialization of a
+single R object, in the XDR binary format of R's serialize: big-endian
+integers and doubles, with a header of flags before each object, see
+src/main/serialize.c of R. The reader decodes the subset of it data.frames are
+made of: numeric, integer, logical and character columns, Date and POSIXct
+columns, factors, and their attributes. Vectors of numbers are decoded with
+numpy in one go, only character vectors are decoded string by string.
+
+Columns become pandas columns as the csv connector would give them: integer
+and logical columns with missing values become floats and objects, Date and
+POSIXct columns datetimes, factors categoricals.
+
+:func:`write_rds_file` writes DataFrames in the same format, to generate
+test and benchmark files without R.
+"""
+import bz2
+import gzip
+import lzma
+import struct
+
+import numpy as np
+import pandas as pd
+
+# SEXP types
+NILSXP = 0
+SYMSXP = 1
+LISTSXP = 2
+CHARSXP = 9
+LGLSXP = 10
+INTSXP = 13
+REALSXP = 14
+CPLXSXP = 15
+STRSXP = 16
+VECSXP = 19
+EXPRSXP = 20
+RAWSXP = 24
+# pseudo SEXP types, which only exist in serialized objects
+ALTREP_SXP = 238
+ATTRLISTSXP = 239
+BASEENV_SXP = 241
+EMPTYENV_SXP = 242
+MISSINGARG_SXP = 251
+UNBOUNDVALUE_SXP = 252
+GLOBALENV_SXP = 253
+NILVALUE_SXP = 254
+REFSXP = 255
+
+# bits of the flags of an object
+IS_OBJECT_BIT = 1 << 8
+HAS_ATTR_BIT = 1 << 9
+HAS_TAG_BIT = 1 << 10
+# encoding bits of the levels of a CHARSXP
+LATIN1_MASK = 1 << 2
+UTF8_MASK = 1 << 3
+ASCII_MASK = 1 << 6
+
+# missing values of integer and logical vectors
+NA_INTEGER = -2 ** 31
+
+# versions written in the header by write_rds_file: R 4.2.0, readable from
+# R 3.5.0
+R_VERSION = 0x040200
+R_MIN_VERSION = 0x030500
+
+SECONDS_PER_DAY = 86400
+
+
+class RVector:
+    """
+    Decoded R vector with its attributes.
+    """
+
+    def __init__(self, sexptype, values, attrs=None):
+        """
+        :param sexptype: SEXP type of the vector, e.g. INTSXP.
+        :param values: numpy array for atomic vectors, list for character
+               vectors (None for NA) and lists (VECSXP).
+        :param attrs: Dict of attribute name: value.
+        """
+        self.sexptype = sexptype
+        self.values = values
+        self.attrs = attrs or dict()
+
+    def r_class(self):
+        """
+        :return: List of the class attribute of the vector.
+        """
+        r_class = self.attrs.get('class')
+        return r_class.values if r_class is not None else []
+
+
+class RSymbol(str):
+    """
+    Name of an R symbol, e.g. the tag of an attribute.
+    """
+
+
+def open_rds(input_file_path):
+    """
+    :param input_file_path: Path to the .rds file.
+    :return: Bytes of the decompressed serialization.
+    """
+    with open(input_file_path, 'rb') as f:
+        magic = f.read(6)
+    if magic[:2] == b'\x1f\x8b':
+        opener = gzip.open
+    elif magic[:3] == b'BZh':
+        opener = bz2.open
+    elif magic == b'\xfd7zXZ\x00':
+        opener = lzma.open
+    else:
+        opener = open
+    with opener(input_file_path, 'rb') as f:
+        return f.read()
+
+
+class RDSReader:
+    """
+    Decoder of a serialized R object.
+    """
+
+    def __init__(self, data):
+        """
+        :param data: Bytes of the decompressed serialization.
+        """
+        self.data = data
+        self.pos = 0
+        # symbols and environments, which later objects refer to by index
+        self.refs = []
+
+    def read_header(self):
+        """
+        Checks the format and reads the version of the serialization.
+
+        :return: Version of the serialization, 2 or 3.
+        """
+        if self.data[:2] != b'X\n':
+            raise ValueError("Only .rds files in R's XDR binary format are "
+                             "supported, not %r." % self.data[:2])
+        self.pos = 2
+        version = self.read_int()
+        # version of R that wrote the file, and the minimal one to read it
+        self.read_int()
+        self.read_int()
+        if version == 3:
+            # native encoding of the R session that wrote the file
+            n_bytes = self.read_int()
+            self.pos += n_bytes
+        elif version != 2:
+            raise ValueError("Unsupported version %d of the .rds file."
+                             % version)
+        return version
+
+    def read_int(self):
+        value = struct.unpack_from('>i', self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def read_length(self):
+        length = self.read_int()
+        # long vectors store their length in two more integers
+        if length == -1:
+            upper = self.read_int()
+            length = (upper << 32) + self.read_int()
+        return length
+
+    def read_array(self, dtype, length):
+        """
+        :return: numpy array of length values of the big-endian dtype.
+        """
+        dtype = np.dtype(dtype)
+        arr = np.frombuffer(self.data, dtype=dtype, count=length,
+                            offset=self.pos)
+        self.pos += length * dtype.itemsize
+        return arr.astype(dtype.newbyteorder('='))
+
+    def read_charsxp(self, flags):
+        """
+        :param flags: Flags of the CHARSXP.
+        :return: Decoded string, or None for NA.
+        """
+        length = self.read_int()
+        if length == -1:
+            return None
+        start = self.pos
+        self.pos += length
+        levels = flags >> 12
+        encoding = 'latin-1' if levels & LATIN1_MASK else 'utf-8'
+        return self.data[start:self.pos].decode(encoding)
+
+    def read_strings(self, length):
+        """
+        :return: List of the strings of a character vector, None for NA.
+        """
+        data = self.data
+        unpack_from = struct.unpack_from
+        pos = self.pos
+        ls_strings = [None] * length
+        for i in range(length):
+            flags, n_bytes = unpack_from('>ii', data, pos)
+            pos += 8
+            if n_bytes == -1:
+                continue
+            encoding = 'latin-1' if (flags >> 12) & LATIN1_MASK else 'utf-8'
+            ls_strings[i] = data[pos:pos + n_bytes].decode(encoding)
+            pos += n_bytes
+        self.pos = pos
+        return ls_strings
+
+    def read_attrs(self):
+        """
+        :return: Dict of the attributes of an object, from the pairlist that
+                 follows it.
+        """
+        return {tag: value for tag, value in self.read_item()}
+
+    def read_pairlist(self, flags):
+        """
+        Reads a pairlist, e.g. attributes, iteratively along its cdrs.
+
+        :return: List of (tag, value) tuples.
+        """
+        ls_items = []
+        while True:
+            sexptype = flags & 0xFF
+            if sexptype in (NILVALUE_SXP, NILSXP):
+                return ls_items
+            if sexptype not in (LISTSXP, ATTRLISTSXP):
+                # the cdr of the last cons cell can be any object, e.g. in
+                # the state of deferred strings
+                self.pos -= 4
+                ls_items.append((None, self.read_item()))
+                return ls_items
+            if flags & HAS_ATTR_BIT:
+                self.read_item()
+            tag = self.read_item() if flags & HAS_TAG_BIT else None
+            ls_items.append((tag, self.read_item()))
+            flags = self.read_int()
+
+    def read_item(self):
+        """
+        :return: The next object of the serialization: RVector, RSymbol,
+                 list of (tag, value) tuples for pairlists, or None for NULL
+                 and the objects that aren't needed for data.frames.
+        """
+        flags = self.read_int()
+        sexptype = flags & 0xFF
+
+        if sexptype in (NILVALUE_SXP, NILSXP):
+            return None
+        if sexptype in (GLOBALENV_SXP, EMPTYENV_SXP, BASEENV_SXP,
+                        UNBOUNDVALUE_SXP, MISSINGARG_SXP):
+            return None
+        if sexptype == REFSXP:
+            index = flags >> 8
+            if index == 0:
+                index = self.read_int()
+            return self.refs[index - 1]
+        if sexptype == SYMSXP:
+            symbol = RSymbol(self.read_charsxp(self.read_int()))
+            self.refs.append(symbol)
+            return symbol
+        if sexptype in (LISTSXP, ATTRLISTSXP):
+            return self.read_pairlist(flags)
+        if sexptype == CHARSXP:
+            return self.read_charsxp(flags)
+        if sexptype == ALTREP_SXP:
+            return self.read_altrep()
+
+        if sexptype in (LGLSXP, INTSXP):
+            values = self.read_array('>i4', self.read_length())
+        elif sexptype == REALSXP:
+            values = self.read_array('>f8', self.read_length())
+        elif sexptype == CPLXSXP:
+            values = self.read_array('>c16', self.read_length())
+        elif sexptype == RAWSXP:
+            values = self.read_array('u1', self.read_length())
+        elif sexptype == STRSXP:
+            values = self.read_strings(self.read_length())
+        elif sexptype in (VECSXP, EXPRSXP):
+            values = [self.read_item() for _ in range(self.read_length())]
+        else:
+            raise ValueError("Objects of SEXP type %d are not supported, "
+                             ".rds files have to contain a data.frame."
+                             % sexptype)
+        attrs = self.read_attrs() if flags & HAS_ATTR_BIT else None
+        return RVector(sexptype, values, attrs)
+
+    def read_altrep(self):
+        """
+        Reads an ALTREP object, R's compact representation of e.g. 1:n, and
+        expands it to a regular vector.
+
+        :return: RVector.
+        """
+        info = self.read_item()
+        state = self.read_item()
+        attrs = self.read_item()
+        altrep_class = info[0][1]
+        if altrep_class in ('compact_intseq', 'compact_realseq'):
+            length, start, step = state.values
+            values = start + step * np.arange(int(length))
+            if altrep_class == 'compact_intseq':
+                vector = RVector(INTSXP, values.astype(np.int32))
+            else:
+                vector = RVector(REALSXP, values.astype(np.float64))
+        elif altrep_class == 'deferred_string':
+            # numbers that R converts to strings when they're used
+            arg = state[0][1]
+            if arg.sexptype == REALSXP:
+                ls_strings = [None if np.isnan(value) else '%.15g' % value
+                              for value in arg.values]
+            else:
+                ls_strings = [None if value == NA_INTEGER else str(value)
+                              for value in arg.values]
+            vector = RVector(STRSXP, ls_strings)
+        elif altrep_class.startswith('wrap_'):
+            # pairlist of the wrapped vector and its metadata
+            vector = state[0][1]
+        else:
+            raise ValueError("ALTREP class %s is not supported."
+                             % altrep_class)
+        if attrs:
+            vector.attrs = {tag: value for tag, value in attrs}
+        return vector
+
+
+def column_to_series(vector):
+    """
+    :param vector: RVector of a column of a data.frame.
+    :return: pandas Series.
+    """
+    r_class = vector.r_class()
+    values = vector.values
+    if 'factor' in r_class:
+        return pd.Series(pd.Categorical.from_codes(
+            np.where(values == NA_INTEGER, -1, values - 1),
+            categories=vector.attrs['levels'].values))
+    if vector.sexptype in (LGLSXP, INTSXP):
+        is_na = values == NA_INTEGER
+        if 'Date' in r_class or 'POSIXct' in r_class:
+            values = np.where(is_na, np.nan, values)
+        elif vector.sexptype == LGLSXP:
+            if is_na.any():
+                arr = values.astype(bool).astype(object)
+                arr[is_na] = np.nan
+                return pd.Series(arr, dtype=object)
+            return pd.Series(values.astype(bool))
+        elif is_na.any():
+            return pd.Series(np.where(is_na, np.nan, values))
+        else:
+            return pd.Series(values.astype(np.int64))
+    if 'Date' in r_class:
+        return pd.Series(pd.to_datetime(values, unit='D'))
+    if 'POSIXct' in r_class:
+        return pd.Series(pd.to_datetime(values, unit='s'))
+    if vector.sexptype == STRSXP:
+        return pd.Series(values, dtype=object).infer_objects()
+    if vector.sexptype == VECSXP:
+        return pd.Series([item.values if isinstance(item, RVector) else item
+                          for item in values], dtype=object)
+    return pd.Series(values)
+
+
+def vector_to_dataframe(vector):
+    """
+    :param vector: RVector of a data.frame.
+    :return: pandas DataFrame.
+    """
+    if vector.sexptype != VECSXP or 'data.frame' not in vector.r_class():
+        raise ValueError("The .rds file doesn't contain a data.frame.")
+    names = vector.attrs['names'].values
+    row_names = vector.attrs.get('row.names')
+    # automatic row names are stored compactly as c(NA, -n)
+    if row_names is None or (row_names.sexptype == INTSXP and
+                             len(row_names.values) == 2 and
+                             row_names.values[0] == NA_INTEGER):
+        index = None
+    else:
+        index = pd.Index(row_names.values)
+    dict_cols = dict()
+    for name, column in zip(names, vector.values):
+        dict_cols[name] = column_to_series(column)
+    df = pd.DataFrame(dict_cols, columns=names)
+    if index is not None:
+        df.index = index
+    return df
+
+
+def read_rds_file(input_file_path):
+    """
+    :param input_file_path: Path to an .rds file of a data.frame.
+    :return: pandas DataFrame.
+    """
+    reader = RDSReader(open_rds(input_file_path))
+    reader.read_header()
+    return vector_to_dataframe(reader.read_item())
+
+
+class RDSWriter:
+    """
+    Encoder of DataFrames as serialized R data.frames.
+    """
+
+    def __init__(self, version=3):
+        """
+        :param version: Version of the serialization, 2 or 3.
+        """
+        self.version = version
+        self.parts = []
+        # symbol: index of its reference
+        self.refs = dict()
+
+    def write_int(self, value):
+        self.parts.append(struct.pack('>i', value))
+
+    def write_header(self):
+        self.parts.append(b'X\n')
+        self.write_int(self.version)
+        self.write_int(R_VERSION)
+        self.write_int(R_MIN_VERSION)
+        if self.version == 3:
+            self.write_int(5)
+            self.parts.append(b'UTF-8')
+
+    def write_charsxp(self, string):
+        if string is None:
+            self.write_int(CHARSXP)
+            self.write_int(-1)
+            return
+        encoded = string.encode('utf-8')
+        levels = ASCII_MASK if len(encoded) == len(string) else UTF8_MASK
+        self.write_int(CHARSXP | (levels << 12))
+        self.write_int(len(encoded))
+        self.parts.append(encoded)
+
+    def write_symbol(self, name):
+        if name in self.refs:
+            self.write_int((self.refs[name] << 8) | REFSXP)
+            return
+        self.refs[name] = len(self.refs) + 1
+        self.write_int(SYMSXP)
+        self.write_charsxp(name)
+
+    def write_attrs(self, attrs):
+        """
+        :param attrs: List of (name, (sexptype, values)) tuples.
+        """
+        for name, (sexptype, values) in attrs:
+            self.write_int(LISTSXP | HAS_TAG_BIT)
+            self.write_symbol(name)
+            self.write_vector(sexptype, values)
+        self.write_int(NILVALUE_SXP)
+
+    def write_vector(self, sexptype, values, attrs=()):
+        """
+        :param sexptype: SEXP type of the vector.
+        :param values: numpy array, or list of strings (None for NA).
+        :param attrs: List of (name, (sexptype, values)) tuples.
+        """
+        flags = sexptype
+        if attrs:
+            flags |= HAS_ATTR_BIT
+            if any(name == 'class' for name, value in attrs):
+                flags |= IS_OBJECT_BIT
+        self.write_int(flags)
+        self.write_int(len(values))
+        if sexptype == STRSXP:
+            for string in values:
+                self.write_charsxp(string)
+        elif sexptype in (LGLSXP, INTSXP):
+            self.parts.append(np.asarray(values, dtype='>i4').tobytes())
+        elif sexptype == REALSXP:
+            self.parts.append(np.asarray(values, dtype='>f8').tobytes())
+        if attrs:
+            self.write_attrs(attrs)
+
+    def write_column(self, ss):
+        """
+        :param ss: pandas Series.
+        """
+        is_na = ss.isnull().values
+        if isinstance(ss.dtype, pd.CategoricalDtype):
+            codes = np.where(is_na, NA_INTEGER, ss.cat.codes.values + 1)
+            self.write_vector(INTSXP, codes, [
+                ('levels', (STRSXP, [str(level) for level in
+                                     ss.cat.categories])),
+                ('class', (STRSXP, ['factor']))])
+        elif pd.api.types.is_datetime64_dtype(ss):
+            seconds = np.where(is_na, np.nan, ss.values.astype(
+                'datetime64[s]').astype(np.int64).astype(np.float64))
+            if (np.nan_to_num(seconds) % SECONDS_PER_DAY == 0).all():
+                self.write_vector(REALSXP, seconds / SECONDS_PER_DAY,
+                                  [('class', (STRSXP, ['Date']))])
+            else:
+                self.write_vector(REALSXP, seconds, [
+                    ('class', (STRSXP, ['POSIXct', 'POSIXt']))])
+        elif pd.api.types.is_bool_dtype(ss):
+            self.write_vector(LGLSXP, ss.values.astype(np.int32))
+        elif pd.api.types.is_integer_dtype(ss):
+            self.write_vector(INTSXP, ss.values)
+        elif pd.api.types.is_float_dtype(ss):
+            self.write_vector(REALSXP, ss.values)
+        else:
+            self.write_vector(STRSXP, [None if na else str(value) for value, na
+                                       in zip(ss.values, is_na)])
+
+    def write_dataframe(self, df):
+        """
+        :param df: pandas DataFrame, its index is left out.
+        :return: Bytes of the serialization.
+        """
+        self.write_header()
+        self.write_int(VECSXP | IS_OBJECT_BIT | HAS_ATTR_BIT)
+        self.write_int(df.shape[1])
+        for col in df.columns:
+            self.write_column(df[col])
+        self.write_attrs([
+            ('names', (STRSXP, [str(col) for col in df.columns])),
+            ('class', (STRSXP, ['data.frame'])),
+            ('row.names', (INTSXP, [NA_INTEGER, -len(df)]))])
+        return b''.join(self.parts)
+
+
+def write_rds_file(df, output_file_path, version=3, compress=True):
+    """
+    Writes a DataFrame as an .rds file of an R data.frame, as R's saveRDS
+    would.
+
+    :param df: pandas DataFrame with numeric, boolean, string, datetime and
+           categorical columns. Its index is left out.
+    :param output_file_path: Path to the .rds file.
+    :param version: Version of the serialization, 2 or 3.
+    :param compress: Boolean, whether to gzip the file.
+    :return: None
+    """
+    data = RDSWriter(version).write_dataframe(df)
+    opener = gzip.open if compress else open
+    with opener(output_file_path, 'wb') as f:
+        f.write(data)
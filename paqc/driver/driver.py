@@ -4,19 +4,30 @@ executes the QC scripts in the requested order and collates their findings in a
 report.
 """
 
+import os
 import time
 import traceback
 
 import pandas as pd
 
 import paqc.qc_functions as qcs_main
+from paqc.driver import executor
+from paqc.qc_functions import column_needs
+from paqc.qc_functions import streaming
 from paqc.connectors import csv
 from paqc.connectors import dataframe
 from paqc.connectors import feather
+from paqc.connectors import parquet
 from paqc.connectors import rds
 from paqc.report import report
+from paqc.utils import column_index
+from paqc.utils import column_profile
+from paqc.utils import null_mask
 from paqc.utils import config_utils
+from paqc.utils import hashing
+from paqc.utils import result_cache
 from paqc.utils import utils
+from paqc.utils import worker_pool
 
 
 class Driver:
@@ -27,7 +38,8 @@ class Driver:
     """
 
     def __init__(self, config_path, verbose=True, debug=False, to_hash=False,
-                 df_input=None):
+                 df_input=None, workers=None, df_input_inplace=False,
+                 use_cache=True):
         self.config_path = config_path
         self.config = None
         self.general = None
@@ -36,13 +48,32 @@ class Driver:
         self.debug = debug
         self.to_hash = to_hash
         self.df_input = df_input
-        # load the QC functions into a single dict
-        self.qc_functions = qcs_main.import_submodules(qcs_main)
+        # the caller agrees that the date columns of df_input are converted
+        # in place, instead of keeping both versions in memory
+        self.df_input_inplace = df_input_inplace
+        # size of the pool the QCs of an input file are fanned out to, if the
+        # executor in the general section of the config is threads/processes,
+        # and of the process pool below
+        self.workers = workers
+        # process pool of the connectors and QCs, started the first time it's
+        # used during the run
+        self.pool = worker_pool.WorkerPool(workers)
+        # ReportItems of earlier runs are reused for the QCs whose input file
+        # and config didn't change, see utils.result_cache
+        self.use_cache = use_cache
+        self.cache = None
+        # index the QC functions in a single dict, their collections are
+        # only imported once they are needed
+        self.qc_functions = qcs_main.QCRegistry(qcs_main)
         # load list of comparison qc functions
         self.qcs_compare = utils.get_qcs_compare()
         # list of dataframes we load in to run comparison type QCs on
         self.compare_dfs = dict()
         self.compare_dfs_hash = dict()
+        # fingerprints of the columns of the compare dataframes
+        self.compare_dfs_fingerprints = dict()
+        # ColumnProfiles of the compare dataframes
+        self.compare_dfs_profiles = dict()
 
     def run(self, generate_report=True):
         """
@@ -56,8 +87,18 @@ class Driver:
 
         # load, check, parse config
         self.config_loader()
-        # parsed config successfully, let's execute qc functions
-        self.main()
+        # parsed config successfully, let's execute qc functions, with the
+        # pool of the Driver active
+        with self.pool:
+            self.main()
+        if self.pool.stats['maps']:
+            self.printer(self.pool.report())
+        if self.cache is not None:
+            n_evicted = self.cache.evict()
+            if n_evicted:
+                self.printer("Deleted the %d least recently used results from "
+                             "the cache in %s" % (n_evicted,
+                                                  self.cache.cache_dir))
         # generate report
         if generate_report:
             self.printer("Generating HTML and CSV report...", True, True)
@@ -79,6 +120,8 @@ class Driver:
                 self.general = self.config['general']
                 # init the report object
                 self.report = report.Report(self.config)
+                if self.use_cache:
+                    self.cache = result_cache.cache_from_config(self.general)
                 self.printer("Config file checked and parsed. "
                              "Starting QC pipeline...")
             else:
@@ -106,10 +149,18 @@ class Driver:
         for input_n, ls_qcs in self.config['qcs_per_input'].items():
             # check if input data has multiple file paths
             if not isinstance(self.general[input_n], str):
-                for input_file_path in self.general[input_n]:
-                    self.printer("Starting QCs on %s, with file path: %s" %
-                                 (input_n, input_file_path), True)
-                    self.do_qc(input_n, input_file_path, ls_qcs)
+                # load and QC several chunk files of the input concurrently
+                if self.general.get('shard_workers', 1) > 1:
+                    self.printer("Starting QCs on %s, with %d file paths, "
+                                 "%d at a time" %
+                                 (input_n, len(self.general[input_n]),
+                                  self.general['shard_workers']), True)
+                    self.do_qc_shards(input_n, self.general[input_n], ls_qcs)
+                else:
+                    for input_file_path in self.general[input_n]:
+                        self.printer("Starting QCs on %s, with file path: %s"
+                                     % (input_n, input_file_path), True)
+                        self.do_qc(input_n, input_file_path, ls_qcs)
             else:
                 self.printer("Starting QCs on %s, file path: %s" %
                              (input_n, self.general[input_n]), True)
@@ -132,60 +183,337 @@ class Driver:
         :return: Nothing, updates Driver's internal report object.
         """
 
-        df = self.data_loader(input_file_path)
-        if self.to_hash:
-            df_hash = utils.generate_hash(df)
+        for rpi in self.qc_input_file(input_file, input_file_path, qcs):
+            self.report.add_item(rpi)
+
+    def do_qc_shards(self, input_file, input_file_paths, qcs):
+        """
+        Loads and QCs the chunk files of a multi-file input concurrently in a
+        process pool with shard_workers processes. Each process holds a
+        single chunk file in memory at a time, so at most shard_workers
+        DataFrames are loaded at once. The ReportItems are added to the report
+        grouped by chunk file, in the order of input_file_paths.
+
+        :param input_file: input1,...,input_n in general part of config
+        :param input_file_paths: list of file paths of the chunk files.
+        :param qcs: dictionary of qcs to execute on each chunk file.
+        :return: Nothing, updates Driver's internal report object.
+        """
+
+        ls_rpis = executor.run_shards(self, input_file, input_file_paths, qcs,
+                                      workers=self.general['shard_workers'])
+        for rpis in ls_rpis:
+            for rpi in rpis:
+                self.report.add_item(rpi)
+
+    def qc_input_file(self, input_file, input_file_path, qcs,
+                      executor_type=None):
+        """
+        Executes the required qc functions on an input data file, see
+        :func:`~driver.driver.Driver.execute_input_file`. The ReportItems of
+        QCs cached by an earlier run on the same data and config are reused
+        instead, see :mod:`~utils.result_cache`, and the file is only loaded
+        if any QC has to be executed.
+
+        :param input_file: input1,...,input_n in general part of config
+        :param input_file_path: actual file path to the data
+        :param qcs: dictionary of qcs to execute on a given data file.
+        :param executor_type: serial, threads or processes, if None, the
+               executor of the general section of the config is used.
+        :return: List of ReportItems, in the order of qcs.
+        """
+
+        keys = self.cache_keys(input_file_path, qcs)
+        if keys is None:
+            return self.execute_input_file(input_file, input_file_path, qcs,
+                                           executor_type)
+
+        rpis = [self.cache.get(key) for key in keys]
+        ls_cached = [i for i, rpi in enumerate(rpis) if rpi is not None]
+        if ls_cached:
+            self.printer("Reusing the cached results of %s on %s" %
+                         (', '.join(qcs[i]['qc_num'] for i in ls_cached),
+                          input_file_path))
+        for i in ls_cached:
+            rpis[i].input_file = input_file
+            rpis[i].input_file_path = input_file_path
+            rpis[i].exec_time = 0
+
+        ls_execute = [i for i, rpi in enumerate(rpis) if rpi is None]
+        if ls_execute:
+            ls_rpis = self.execute_input_file(
+                input_file, input_file_path, [qcs[i] for i in ls_execute],
+                executor_type)
+            for i, rpi in zip(ls_execute, ls_rpis):
+                rpis[i] = rpi
+                # the error may be transient, the QC is executed again in
+                # the next run
+                if isinstance(rpi, report.ErrorItem):
+                    continue
+                try:
+                    self.cache.put(keys[i], rpi)
+                except OSError as e:
+                    self.printer("Couldn't cache the result of %s: %s" %
+                                 (qcs[i]['qc_num'], e))
+        return rpis
+
+    def cache_keys(self, input_file_path, qcs):
+        """
+        :param input_file_path: actual file path to the data
+        :param qcs: dictionary of qcs to execute on a given data file.
+        :return: List of the keys the ReportItems of the qcs are cached
+                 under, see :func:`~utils.result_cache.qc_key`, or None if
+                 the cache is off or the input can't be fingerprinted
+                 without loading it.
+        """
+        if self.cache is None:
+            return None
+        if self.general['source'] == 'dataframe':
+            if not isinstance(self.df_input, pd.DataFrame):
+                return None
+            input_fingerprint = hashing.hash_frame(self.df_input)
+        elif os.path.isfile(input_file_path):
+            input_fingerprint = hashing.file_hash(input_file_path)
         else:
-            df_hash = 'None'
-        for qc in qcs:
-            # generate mini config object for the QC function
-            qc_config = {'general': self.general, 'qc': qc}
-            qc_config['qc']['input_file_path'] = input_file_path
-            qc_config['qc']['data_hash'] = df_hash
-            qc_config['qc']['input_file'] = input_file
-
-            # extract the specific QC object from the qc_functions module
-            qc_function = self.qc_functions[qc['qc_num']]
-
-            # execute and time it on the data file
-            self.printer("Executing test %s on %s: %s" %
-                         (qc['qc_num'], input_file, input_file_path))
-            ts = time.time()
-
-            # check if we have params for this qc function
-            if "qc_params" in qc_config['qc']:
-                if qc_config['qc']['qc_params'] is None:
-                    qc_params = dict()
-                else:
-                    qc_params = qc_config['qc']['qc_params']
+            return None
+        return [result_cache.qc_key(input_fingerprint, qc, self.general,
+                                    self.to_hash)
+                for qc in qcs]
+
+    def execute_input_file(self, input_file, input_file_path, qcs,
+                           executor_type=None):
+        """
+        Loads an input data file and executes the required qc functions on it
+        with the executor of the general section of the config.
+
+        :param input_file: input1,...,input_n in general part of config
+        :param input_file_path: actual file path to the data
+        :param qcs: dictionary of qcs to execute on a given data file.
+        :param executor_type: serial, threads or processes, if None, the
+               executor of the general section of the config is used.
+        :return: List of ReportItems, in the order of qcs.
+        """
+
+        if executor_type is None:
+            executor_type = self.general.get('executor', 'serial')
+
+        # only load the columns the QCs read, if the source supports it
+        columns = self.needed_columns(input_file_path, qcs)
+
+        # stream the input file chunk by chunk, if all QCs support it
+        if self.general.get('chunksize') and self.general['source'] in \
+                ['csv', 'parquet']:
+            ls_not_streamable = [qc['qc_num'] for qc in qcs if not
+                                 streaming.is_streamable(qc['qc_num'])]
+            if not ls_not_streamable:
+                return self.stream_input_file(input_file, input_file_path, qcs,
+                                              columns)
+            self.printer("Loading the full input file, as these QCs can't be "
+                         "streamed: %s" % ', '.join(ls_not_streamable))
+
+        df = self.data_loader(input_file_path, columns)
+        df_hash = self.input_hash(input_file_path, df)
+        frame_context = self.build_frame_context(df, qcs, executor_type)
+        tasks = [self.make_qc_task(input_file, input_file_path, qc, df_hash,
+                                   frame_context)
+                 for qc in qcs]
+
+        # execute and time them on the data file, each QC is timed within
+        # the worker that executes it
+        return executor.run_qcs(tasks, df, executor=executor_type,
+                                workers=self.workers, debug=self.debug)
+
+    def stream_input_file(self, input_file, input_file_path, qcs,
+                          columns=None):
+        """
+        Reads the input file in chunks of chunksize rows (general section of
+        the config) and streams them through the QCs, so the input file is
+        never fully loaded into memory. All qcs have to be streamable, see
+        :mod:`~qc_functions.streaming`.
+
+        :param input_file: input1,...,input_n in general part of config
+        :param input_file_path: actual file path to the data
+        :param qcs: dictionary of qcs to execute on a given data file.
+        :param columns: list of the columns to read, all columns if None.
+        :return: List of ReportItems, in the order of qcs.
+        """
+
+        # the hash of the chunks is the same as the one of the loaded file
+        hasher = hashing.FrameHasher()
+        hash_chunks = self.to_hash and not self.hash_file(input_file_path)
+
+        def chunk_loader():
+            if self.general['source'] == 'parquet':
+                chunks = parquet.read_parquet_chunks(
+                    self.config, input_file_path, self.general['chunksize'],
+                    columns)
             else:
-                qc_params = dict()
+                chunks = csv.read_csv_chunks(self.config, input_file_path,
+                                             self.general['chunksize'],
+                                             columns)
+            for df_chunk in chunks:
+                if hash_chunks:
+                    hasher.update(df_chunk)
+                yield df_chunk
+
+        tasks = [self.make_qc_task(input_file, input_file_path, qc, 'None')
+                 for qc in qcs]
+        if self.debug:
+            rpis = executor.run_streaming_qcs(tasks, chunk_loader(),
+                                              debug=self.debug)
+        # the QCs themselves log their bugs, but we also have to catch the
+        # errors of reading and parsing the chunks
+        else:
+            try:
+                rpis = executor.run_streaming_qcs(tasks, chunk_loader(),
+                                                  debug=self.debug)
+            except:
+                text = ("We couldn't stream the following file: %s."
+                        "\n\nTRACEBACK:\n\n%s"
+                        % (input_file_path, traceback.format_exc()))
+                self.printer(text)
+                rpis = [report.ErrorItem(passed=False, level="error",
+                                         qc_num=qc['qc_num'],
+                                         input_file=input_file, text=text,
+                                         input_file_path=input_file_path)
+                        for qc in qcs]
+        if self.to_hash:
+            if hash_chunks:
+                df_hash = hasher.hexdigest()
+            else:
+                df_hash = self.input_hash(input_file_path)
+            for rpi in rpis:
+                rpi.data_hash = df_hash
+        return rpis
 
-            if self.debug:
-                rpi = qc_function(df, qc_config, **qc_params)
-            # if we're not in debug mode, don't stop at bugs, log them as errors
+    def hash_file(self, input_file_path):
+        """
+        :param input_file_path: actual file path to the data
+        :return: Boolean, whether the data hash of the input file is the hash
+                 of the file's bytes (hash_files in the general section of the
+                 config), instead of the hash of the loaded DataFrame.
+        """
+        return bool(self.general.get('hash_files')) and \
+            self.general['source'] != 'dataframe' and \
+            os.path.isfile(input_file_path)
+
+    def input_hash(self, input_file_path, df=None):
+        """
+        Hashes an input data file, if the Driver was created with
+        to_hash=True, see :mod:`~utils.hashing`.
+
+        :param input_file_path: actual file path to the data
+        :param df: pandas DataFrame of the loaded data file.
+        :return: Hex string of the hash, or 'None'.
+        """
+        if not self.to_hash:
+            return 'None'
+        if self.hash_file(input_file_path):
+            return hashing.file_hash(input_file_path)
+        return utils.generate_hash(df)
+
+    def needed_columns(self, input_file_path, qcs):
+        """
+        Finds the columns of an input file the QCs read, see
+        :mod:`~qc_functions.column_needs`, for the sources that can read a
+        subset of the columns of a file.
+
+        :param input_file_path: actual file path to the data
+        :param qcs: dictionary of qcs to execute on a given data file.
+        :return: List of column names, or None if the whole file is loaded.
+        """
+
+        # source: function reading the column names of an input file
+        dict_column_readers = {
+            'csv': lambda path: csv.read_csv_header(path).columns.tolist(),
+            'feather': feather.read_feather_columns,
+            'parquet': parquet.read_parquet_columns,
+        }
+        if self.general['source'] not in dict_column_readers:
+            return None
+        try:
+            columns = dict_column_readers[self.general['source']](
+                input_file_path)
+        # the error is reported when the file is loaded
+        except:
+            return None
+        # the columns of the file are unknown, e.g. in Feather V1 files
+        if not columns:
+            return None
+        ls_cols = column_needs.needed_columns(qcs, self.qc_functions, columns,
+                                              self.general)
+        if ls_cols is not None:
+            self.printer("Loading %d of the %d columns of %s" %
+                         (len(ls_cols), len(columns), input_file_path))
+        return ls_cols
+
+    def build_frame_context(self, df, qcs=(), executor_type='serial'):
+        """
+        Computes the objects describing a loaded DataFrame that are shared
+        by all QCs executed on it, so they are computed once instead of in
+        every QC. They are added to the mini config object of each QC.
+
+        :param df: pandas DataFrame of the loaded data file.
+        :param qcs: dictionary of qcs to execute on the data file.
+        :param executor_type: serial, threads or processes.
+        :return: Dict, with the following keys: column_index,
+                 null_mask, column_profile.
+        """
+        frame_context = dict()
+        if isinstance(df, pd.DataFrame):
+            frame_context['column_index'] = column_index.ColumnIndex(
+                df.columns, self.general)
+            frame_context['null_mask'] = null_mask.NullMask(df)
+            profile = column_profile.ColumnProfile(
+                df, frame_context['null_mask'])
+            # the worker processes get a copy of the profile each, so it is
+            # filled in before they are started
+            if executor_type == 'processes' and len(qcs) > 1 and \
+                    self.workers != 1 and \
+                    any(qc['qc_num'] in column_profile.PROFILE_QCS
+                        for qc in qcs):
+                profile.profile_all(df, column_profile.COUNTS)
+            frame_context['column_profile'] = profile
+        return frame_context
+
+    def make_qc_task(self, input_file, input_file_path, qc, df_hash,
+                     frame_context=None):
+        """
+        Generates the mini config object of a QC and looks up its function
+        and parameters.
+
+        :param input_file: input1,...,input_n in general part of config
+        :param input_file_path: actual file path to the data
+        :param qc: dictionary of the qc in the config.
+        :param df_hash: hash of the data file.
+        :param frame_context: output of
+               :func:`~driver.driver.Driver.build_frame_context`.
+        :return: Tuple of (qc_function, qc_config, qc_params).
+        """
+
+        # generate mini config object for the QC function
+        qc_config = {'general': self.general, 'qc': qc}
+        if frame_context is not None:
+            qc_config.update(frame_context)
+        qc_config['qc']['input_file_path'] = input_file_path
+        qc_config['qc']['data_hash'] = df_hash
+        qc_config['qc']['input_file'] = input_file
+
+        # extract the specific QC object from the qc_functions module
+        qc_function = self.qc_functions[qc['qc_num']]
+
+        self.printer("Executing test %s on %s: %s" %
+                     (qc['qc_num'], input_file, input_file_path))
+
+        # check if we have params for this qc function
+        if "qc_params" in qc_config['qc']:
+            if qc_config['qc']['qc_params'] is None:
+                qc_params = dict()
             else:
-                try:
-                    rpi = qc_function(df, qc_config, **qc_params)
-                # Some qcs need to load an extra csv with path given in config,
-                # this error is raised when the file does not exist.
-                except FileNotFoundError as e:
-                    text = str(e)
-                    rpi = report.ReportItem(passed=False, level="error",
-                                            qc_num=qc,
-                                            input_file=input_file, text=text,
-                                            input_file_path=input_file_path)
-                except:
-                    text = ("QC failed due to internal bug, report it to "
-                            "admins with this error:\n%s"
-                            % traceback.format_exc())
-                    rpi = report.ReportItem(passed=False, level="error",
-                                            qc_num=qc,
-                                            input_file=input_file, text=text,
-                                            input_file_path=input_file_path)
-            te = time.time()
-            rpi.exec_time = te - ts
-            self.report.add_item(rpi)
+                qc_params = qc_config['qc']['qc_params']
+        else:
+            qc_params = dict()
+        return qc_function, qc_config, qc_params
 
     def do_compare_qc(self, input_file1, input_file2, qc):
         """
@@ -194,21 +522,14 @@ class Driver:
 
         :param input_file1: input1,...,input_n in general part of config
         :param input_file2: input1,...,input_n in general part of config
-        :param qc: string, name of qc to execute on the two dataframes.
+        :param qc: dictionary of the qc to execute on the two dataframes.
         :return: Nothing, updates Driver's internal report object.
         """
 
         # check if dataset is already loaded, if not load it, hash it
-        if input_file1 not in self.compare_dfs:
-            input_file_path = self.config['general'][input_file1]
-            self.compare_dfs[input_file1] = self.data_loader(input_file_path)
-            self.compare_dfs_hash[input_file1] = utils.generate_hash(
-                self.compare_dfs[input_file1])
-        if input_file2 not in self.compare_dfs:
-            input_file_path = self.config['general'][input_file2]
-            self.compare_dfs[input_file2] = self.data_loader(input_file_path)
-            self.compare_dfs_hash[input_file2] = utils.generate_hash(
-                self.compare_dfs[input_file2])
+        for input_file in [input_file1, input_file2]:
+            if input_file not in self.compare_dfs:
+                self.load_compare_input(input_file)
 
         # variables to shorten lines hereafter
         df1 = self.compare_dfs[input_file1]
@@ -219,27 +540,38 @@ class Driver:
         input_file_paths = ("%s and %s" % (input_file_path1, input_file_path2))
         hash1 = self.compare_dfs_hash[input_file1]
         hash2 = self.compare_dfs_hash[input_file2]
+        qc_num = qc['qc_num']
 
         # generate mini config object for the QC function
         qc_config = {'general': self.general, 'qc': qc}
         qc_config['qc']['input_file_path'] = input_file_paths
-        qc_config['qc']['data_hash'] = ("%s: %d\n%s: %d" % (input_file1, hash1,
+        qc_config['qc']['data_hash'] = ("%s: %s\n%s: %s" % (input_file1, hash1,
                                                             input_file2, hash2))
+        if self.compare_dfs_fingerprints[input_file1] is not None and \
+                self.compare_dfs_fingerprints[input_file2] is not None:
+            qc_config['column_fingerprints'] = [
+                self.compare_dfs_fingerprints[input_file1],
+                self.compare_dfs_fingerprints[input_file2]]
+        if self.compare_dfs_profiles[input_file1] is not None and \
+                self.compare_dfs_profiles[input_file2] is not None:
+            qc_config['column_profiles'] = [
+                self.compare_dfs_profiles[input_file1],
+                self.compare_dfs_profiles[input_file2]]
 
         # extract the specific QC object from the qc_functions module
-        qc_function = self.qc_functions[qc]
+        qc_function = self.qc_functions[qc_num]
 
         # execute and time it on the data file
         self.printer("Executing test %s on %s: %s \nand %s: %s" %
-                     (qc, input_file1, input_file_path1,
+                     (qc_num, input_file1, input_file_path1,
                       input_file2, input_file_path2))
         ts = time.time()
 
         # check if we have params for this qc function
-        if "qc_params" in qc_config:
-            qc_params = qc_config["qc_params"]
-        else:
+        if qc_config['qc'].get('qc_params') is None:
             qc_params = dict()
+        else:
+            qc_params = qc_config['qc']['qc_params']
 
         if self.debug:
             rpi = qc_function(df1, df2, qc_config, **qc_params)
@@ -251,28 +583,56 @@ class Driver:
             # this error is raised when the file does not exist.
             except FileNotFoundError as e:
                 text = str(e)
-                rpi = report.ReportItem(passed=False, level="error",
-                                        qc_num=qc,
-                                        input_file=input_files, text=text,
-                                        input_file_path=input_file_paths)
+                rpi = report.ErrorItem(passed=False, level="error",
+                                       qc_num=qc_num,
+                                       input_file=input_files, text=text,
+                                       input_file_path=input_file_paths)
             except:
                 text = ("QC failed due to internal bug, report it to "
                         "admins with this error:\n%s"
                         % traceback.format_exc())
-                rpi = report.ReportItem(passed=False, level="error",
-                                        qc_num=qc,
-                                        input_file=input_files, text=text,
-                                        input_file_path=input_file_paths)
+                rpi = report.ErrorItem(passed=False, level="error",
+                                       qc_num=qc_num,
+                                       input_file=input_files, text=text,
+                                       input_file_path=input_file_paths)
         te = time.time()
         rpi.exec_time = te - ts
         self.report.add_item(rpi)
 
-    def data_loader(self, input_file_path):
+    def load_compare_input(self, input_file):
+        """
+        Loads an input data file of the comparison QCs, and fingerprints its
+        columns, see :func:`~utils.hashing.column_fingerprints`. The
+        comparison QCs only compare the values of the columns whose
+        fingerprints differ between their two inputs.
+
+        :param input_file: input1,...,input_n in general part of config
+        :return: Nothing, updates the compare_dfs, compare_dfs_hash,
+                 compare_dfs_fingerprints and compare_dfs_profiles of the
+                 Driver.
+        """
+        input_file_path = self.config['general'][input_file]
+        df = self.data_loader(input_file_path)
+        self.compare_dfs[input_file] = df
+        self.compare_dfs_hash[input_file] = self.input_hash(input_file_path,
+                                                            df)
+        self.compare_dfs_fingerprints[input_file] = None
+        self.compare_dfs_profiles[input_file] = None
+        if isinstance(df, pd.DataFrame):
+            self.compare_dfs_fingerprints[input_file] = pd.Series(
+                hashing.column_fingerprints(df), index=df.columns,
+                dtype=object)
+            self.compare_dfs_profiles[input_file] = \
+                column_profile.ColumnProfile(df)
+
+    def data_loader(self, input_file_path, columns=None):
         """
         Loads an input data file using its path and the source argument of
         the config file.
 
         :param input_file_path: path to the data.
+        :param columns: list of the columns to load, all columns if None. Only
+               used by the csv, feather and parquet sources.
         :return: pandas DataFrame object of the fully loaded datafile.
         """
 
@@ -285,7 +645,8 @@ class Driver:
         if source == 'dataframe':
             if isinstance(self.df_input, pd.core.frame.DataFrame):
                 try:
-                    return dataframe.parse_dataframe(self.config, self.df_input)
+                    return dataframe.parse_dataframe(self.config, self.df_input,
+                                                     self.df_input_inplace)
                 except:
                     self.printer("We couldn't transform the dataframe. %s"
                                  "\n\nTRACEBACK:\n\n%s"
@@ -296,7 +657,7 @@ class Driver:
                              "DataFrame object as df_input of the driver.")
         elif source == 'csv':
             try:
-                return csv.read_csv(self.config, input_file_path)
+                return csv.read_csv(self.config, input_file_path, columns)
             except:
                 self.printer("We couldn't load the following file: %s. %s"
                              "\n\nTRACEBACK:\n\n%s"
@@ -312,15 +673,40 @@ class Driver:
                                 traceback.format_exc()))
         elif source == 'feather':
             try:
-                return feather.read_feather(self.config, input_file_path)
+                return feather.read_feather(self.config, input_file_path,
+                                            columns)
+            except:
+                self.printer("We couldn't load the following file: %s. %s"
+                             "\n\nTRACEBACK:\n\n%s"
+                             % (input_file_path, format_error_str,
+                                traceback.format_exc()))
+        elif source == 'parquet':
+            try:
+                return parquet.read_parquet(self.config, input_file_path,
+                                            columns)
             except:
                 self.printer("We couldn't load the following file: %s. %s"
                              "\n\nTRACEBACK:\n\n%s"
                              % (input_file_path, format_error_str,
                                 traceback.format_exc()))
         else:
-            raise ValueError("We only support .csv, .rds, .feather input files "
-                             "or pandas DataFrame objects currently.")
+            raise ValueError("We only support .csv, .rds, .feather, .parquet "
+                             "input files or pandas DataFrame objects "
+                             "currently.")
+
+    def __getstate__(self):
+        """
+        The Driver is pickled when it's sent to the processes of
+        :func:`~driver.driver.Driver.do_qc_shards`. These only need the config,
+        so we leave out the report and the loaded comparison DataFrames.
+        """
+        state = self.__dict__.copy()
+        state['report'] = None
+        state['compare_dfs'] = dict()
+        state['compare_dfs_hash'] = dict()
+        state['compare_dfs_fingerprints'] = dict()
+        state['compare_dfs_profiles'] = dict()
+        return state
 
     def printer(self, to_print, hline_before=False, hline_after=False):
         """
@@ -0,0 +1,234 @@
+"""
+This submodule contains the executors of the Driver. They take the QC
+functions that need to run on a single loaded input file, and execute them
+either one after another, or fan them out to a pool of threads or processes.
+The chunk files of multi-file inputs can also be loaded and QC-ed in a pool of
+processes. The ReportItems are always returned in the order of the config file.
+"""
+
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from paqc.qc_functions import streaming
+from paqc.report import report
+from paqc.utils import shared_frame
+
+EXECUTORS = ('serial', 'threads', 'processes')
+
+# The DataFrame the worker processes run their QCs on. It is set once per
+# worker by the initializer of the pool, so it is not pickled for every QC.
+_shared_df = None
+
+
+def _error_item(qc, text):
+    """
+    :param qc: The qc part of the mini config object of the QC.
+    :param text: Error message for the report.
+    :return: ReportItem of a QC that failed with an error.
+    """
+    return report.ErrorItem(passed=False, level="error", qc_num=qc['qc_num'],
+                            input_file=qc['input_file'], text=text,
+                            input_file_path=qc['input_file_path'])
+
+
+def execute_qc(qc_function, df, qc_config, qc_params, debug=False):
+    """
+    Executes a single QC function on a DataFrame and times it. If we're not in
+    debug mode, bugs of the QC function are caught and logged as errors in the
+    returned ReportItem, so the rest of the pipeline can carry on.
+
+    :param qc_function: The QC function to execute.
+    :param df: pandas DataFrame the QC is executed on.
+    :param qc_config: Mini config object of the QC, with general and qc keys.
+    :param qc_params: Dict of extra parameters of the QC function.
+    :param debug: Boolean, if True, exceptions are not caught.
+    :return: :obj:`~report.report.ReportItem` with its exec_time set.
+    """
+    qc = qc_config['qc']
+    ts = time.time()
+    if debug:
+        rpi = qc_function(df, qc_config, **qc_params)
+    # if we're not in debug mode, don't stop at bugs, log them as errors
+    else:
+        try:
+            rpi = qc_function(df, qc_config, **qc_params)
+        # Some qcs need to load an extra csv with path given in config,
+        # this error is raised when the file does not exist.
+        except FileNotFoundError as e:
+            rpi = _error_item(qc, str(e))
+        except:
+            rpi = _error_item(qc, "QC failed due to internal bug, report it "
+                                  "to admins with this error:\n%s"
+                                  % traceback.format_exc())
+    te = time.time()
+    rpi.exec_time = te - ts
+    return rpi
+
+
+def run_streaming_qcs(tasks, chunks, debug=False):
+    """
+    Executes a list of streamable QCs on an input file that is read in chunk
+    by chunk, see :mod:`~qc_functions.streaming`. The time each QC spends on
+    the chunks is added up in its exec_time.
+
+    :param tasks: List of (qc_function, qc_config, qc_params) tuples.
+    :param chunks: Iterable of pandas DataFrames, the chunks of the input.
+    :param debug: Boolean, if True, exceptions of QC functions are raised.
+    :return: List of ReportItems, in the same order as tasks.
+    """
+    ls_streaming_qcs = [streaming.init_streaming_qc(*task) for task in tasks]
+    exec_times = [0] * len(tasks)
+    # ReportItems of the QCs that failed on a chunk are filled in early
+    rpis = [None] * len(tasks)
+
+    def run_step(i, method, *args):
+        ts = time.time()
+        if debug:
+            result = method(*args)
+        else:
+            try:
+                result = method(*args)
+            except:
+                result = None
+                rpis[i] = _error_item(tasks[i][1]['qc'],
+                                      "QC failed due to internal bug, report "
+                                      "it to admins with this error:\n%s"
+                                      % traceback.format_exc())
+        exec_times[i] += time.time() - ts
+        return result
+
+    for df_chunk in chunks:
+        for i, streaming_qc in enumerate(ls_streaming_qcs):
+            if rpis[i] is None:
+                run_step(i, streaming_qc.accumulate, df_chunk)
+    for i, streaming_qc in enumerate(ls_streaming_qcs):
+        if rpis[i] is None:
+            rpi = run_step(i, streaming_qc.finalize)
+            if rpis[i] is None:
+                rpis[i] = rpi
+        rpis[i].exec_time = exec_times[i]
+    return rpis
+
+
+def _init_worker(df):
+    """
+    Initializer of the worker processes, stores the DataFrame they share.
+
+    :param df: pandas DataFrame the QCs are executed on, or the
+           :class:`~utils.shared_frame.SharedFrameHandle` of it.
+    :return: None
+    """
+    global _shared_df
+    if isinstance(df, shared_frame.SharedFrameHandle):
+        df = df.attach()
+    _shared_df = df
+
+
+def _execute_qc_shared(qc_function, qc_config, qc_params, debug):
+    """
+    Same as :func:`~driver.executor.execute_qc`, but executed in a worker
+    process on the DataFrame it received at initialisation.
+    """
+    return execute_qc(qc_function, _shared_df, qc_config, qc_params, debug)
+
+
+def _get_mp_context():
+    """
+    Forking lets the worker processes share the loaded DataFrame copy-on-write
+    instead of pickling it, so we use it wherever the platform supports it.
+
+    :return: multiprocessing context.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def run_qcs(tasks, df, executor='serial', workers=None, debug=False):
+    """
+    Executes a list of QCs on the same DataFrame with the chosen executor.
+
+    :param tasks: List of (qc_function, qc_config, qc_params) tuples.
+    :param df: pandas DataFrame the QCs are executed on. It is shared
+           read-only between the workers, QC functions must not modify it.
+    :param executor: One of serial, threads or processes.
+    :param workers: Number of threads/processes in the pool, if None, the
+           number of CPUs is used.
+    :param debug: Boolean, if True, exceptions of QC functions are raised.
+    :return: List of ReportItems, in the same order as tasks.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError("Executor must be one of: %s." % ', '.join(EXECUTORS))
+
+    # nothing to gain from a pool with a single worker or a single task
+    if executor == 'serial' or len(tasks) < 2 or workers == 1:
+        return [execute_qc(qc_function, df, qc_config, qc_params, debug)
+                for qc_function, qc_config, qc_params in tasks]
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = min(workers, len(tasks))
+
+    if executor == 'threads':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(execute_qc, qc_function, df, qc_config,
+                                   qc_params, debug)
+                       for qc_function, qc_config, qc_params in tasks]
+            return [future.result() for future in futures]
+    else:
+        mp_context = _get_mp_context()
+        # without fork the DataFrame would be pickled to every worker, its
+        # numeric and datetime columns go through shared memory instead
+        frame = None
+        if mp_context.get_start_method() != 'fork':
+            frame = shared_frame.SharedFrame(df)
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=mp_context,
+                    initializer=_init_worker,
+                    initargs=(df if frame is None else frame.handle,)) as pool:
+                futures = [pool.submit(_execute_qc_shared, qc_function,
+                                       qc_config, qc_params, debug)
+                           for qc_function, qc_config, qc_params in tasks]
+                return [future.result() for future in futures]
+        finally:
+            if frame is not None:
+                frame.close()
+
+
+def _qc_shard(driver, input_file, input_file_path, qcs):
+    """
+    Loads a single chunk file in a worker process and executes the QCs on it
+    one after another, as the chunk files themselves are already executed in
+    parallel.
+    """
+    driver.printer("Starting QCs on %s, with file path: %s" %
+                   (input_file, input_file_path), True)
+    return driver.qc_input_file(input_file, input_file_path, qcs,
+                                executor_type='serial')
+
+
+def run_shards(driver, input_file, input_file_paths, qcs, workers):
+    """
+    Loads and QCs the chunk files of a multi-file input in a pool of
+    processes. Each process loads one chunk file at a time, so at most
+    workers DataFrames are in memory at once.
+
+    :param driver: :obj:`~driver.driver.Driver` with a parsed config.
+    :param input_file: input1,...,input_n in general part of config
+    :param input_file_paths: List of file paths of the chunk files.
+    :param qcs: dictionary of qcs to execute on each chunk file.
+    :param workers: Number of processes in the pool.
+    :return: List with a list of ReportItems for each chunk file, in the
+             order of input_file_paths.
+    """
+    if len(input_file_paths) == 0:
+        return []
+    with ProcessPoolExecutor(max_workers=min(workers, len(input_file_paths)),
+                             mp_context=_get_mp_context()) as pool:
+        futures = [pool.submit(_qc_shard, driver, input_file, input_file_path,
+                               qcs)
+                   for input_file_path in input_file_paths]
+        return [future.result() for future in futures]
@@ -2,8 +2,10 @@
 # dynamically to the __all__ list.
 
 import importlib
+import os
 import pkgutil
 import re
+from collections.abc import Mapping
 
 
 def import_submodules(package):
@@ -24,3 +26,56 @@ def import_submodules(package):
             if bool(re.match(r"^qc\d{1,3}$", qc_attribute)):
                 qcs[qc_attribute] = getattr(qc_collection, qc_attribute)
     return qcs
+
+
+def build_qc_index(package):
+    """
+    Builds a static index of the QC functions by scanning the source code of
+    the QC collections for their definitions, without importing any of them.
+
+    :param package: package (name or actual module)
+    :return: Dictionary of qc_num: full name of the module defining it.
+    """
+    if isinstance(package, str):
+        package = importlib.import_module(package)
+    prog = re.compile(r"^def (qc\d{1,3})\(", re.MULTILINE)
+    qc_index = {}
+    for path in package.__path__:
+        for loader, name, is_pkg in pkgutil.iter_modules([path]):
+            if is_pkg:
+                continue
+            with open(os.path.join(path, name + '.py')) as f:
+                for qc_num in prog.findall(f.read()):
+                    qc_index[qc_num] = package.__name__ + '.' + name
+    return qc_index
+
+
+class QCRegistry(Mapping):
+    """
+    Dictionary of qc_num: QC function, just like the output of
+    :func:`~qc_functions.import_submodules`, but a QC collection is only
+    imported once one of its QC functions is looked up. This way we don't
+    import all QC collections if the config only uses a few QCs.
+    """
+
+    def __init__(self, package):
+        """
+        :param package: package (name or actual module)
+        """
+        if not isinstance(package, str):
+            package = package.__name__
+        self.package = package
+        self.qc_index = build_qc_index(package)
+        self.qc_functions = {}
+
+    def __getitem__(self, qc_num):
+        if qc_num not in self.qc_functions:
+            qc_collection = importlib.import_module(self.qc_index[qc_num])
+            self.qc_functions[qc_num] = getattr(qc_collection, qc_num)
+        return self.qc_functions[qc_num]
+
+    def __iter__(self):
+        return iter(self.qc_index)
+
+    def __len__(self):
+        return len(self.qc_index)
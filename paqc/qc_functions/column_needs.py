@@ -0,0 +1,149 @@
+"""
+The columns of an input file each QC reads, so connectors that can read a
+subset of the columns only load the ones the QCs of an input need.
+
+Each QC listed in COLUMN_NEEDS declares the keys of the general section of the
+config whose columns it reads, and which of its qc_params name columns or
+keys. QCs that look at every column (e.g. qc6 for empty columns), or at the
+names of all columns (e.g. qc1), are listed as None, as are QCs that aren't
+listed at all, and a single one of them forces the whole input file to be
+loaded.
+"""
+import inspect
+import re
+
+from paqc.utils import column_index
+
+
+class ColumnNeeds:
+    """
+    Declaration of the columns a QC reads.
+    """
+
+    def __init__(self, keys=(), key_params=(), col_params=(),
+                 suffix_params=()):
+        """
+        :param keys: Keys of the general section of the config whose columns
+               the QC reads.
+        :param key_params: Names of the qc_params that hold (lists of) keys of
+               the general section.
+        :param col_params: Names of the qc_params that hold (lists of) column
+               names.
+        :param suffix_params: Names of the qc_params that hold (lists of)
+               column name suffixes.
+        """
+        self.keys = keys
+        self.key_params = key_params
+        self.col_params = col_params
+        self.suffix_params = suffix_params
+
+    def resolve(self, qc_function, qc_params, index):
+        """
+        :param qc_function: The QC function, for the defaults of its params.
+        :param qc_params: Dict of extra parameters of the QC function.
+        :param index: :class:`~utils.column_index.ColumnIndex` of the columns
+               of the input file.
+        :return: Set of the column names of the input file the QC reads.
+        """
+        signature = inspect.signature(qc_function)
+
+        def param_values(param):
+            if param in qc_params:
+                value = qc_params[param]
+            else:
+                value = signature.parameters[param].default
+            if isinstance(value, str):
+                return [value]
+            return list(value)
+
+        keys = list(self.keys)
+        for param in self.key_params:
+            keys.extend(param_values(param))
+        set_cols = set(index.list_columns(keys))
+        set_columns = set(index.columns)
+        for param in self.col_params:
+            set_cols.update(col for col in param_values(param) if col in
+                            set_columns)
+        for param in self.suffix_params:
+            ls_regex = ["%s$" % suffix for suffix in param_values(param)]
+            if ls_regex:
+                prog = re.compile("(" + ")|(".join(ls_regex) + ")")
+                set_cols.update(col for col in index.columns if
+                                prog.search(col))
+        return set_cols
+
+
+# qc_num: ColumnNeeds of the QC, or None if it needs the whole DataFrame
+COLUMN_NEEDS = {
+    'qc1': None,
+    'qc3': ColumnNeeds(keys=('flag_cols', 'freq_cols', 'count_cols')),
+    'qc4': ColumnNeeds(keys=('patient_id_col',)),
+    'qc6': None,
+    'qc7': None,
+    'qc8': None,
+    'qc9': ColumnNeeds(key_params=('keys_columns_a', 'key_column_b')),
+    'qc10': ColumnNeeds(keys=('first_exp_date_cols', 'last_exp_date_cols'),
+                        key_params=('key_column_b',)),
+    'qc11': ColumnNeeds(keys=('first_exp_date_cols', 'last_exp_date_cols',
+                              'count_cols')),
+    'qc12': ColumnNeeds(keys=('first_exp_date_cols', 'last_exp_date_cols',
+                              'count_cols', 'freq_cols', 'flag_cols')),
+    'qc13': ColumnNeeds(keys=('first_exp_date_cols', 'last_exp_date_cols',
+                              'count_cols')),
+    'qc14': ColumnNeeds(keys=('patient_id_col',)),
+    'qc15': ColumnNeeds(key_params=('keys_num_cols',)),
+    'qc16': None,
+    'qc17': ColumnNeeds(keys=('gender_col',)),
+    'qc18': ColumnNeeds(keys=('age_col',)),
+    'qc19': ColumnNeeds(keys=('index_date_col',)),
+    'qc20': ColumnNeeds(keys=('freq_cols', 'count_cols'),
+                        col_params=('lookback_days_col',)),
+    'qc21': ColumnNeeds(col_params=('lookback_days_col',),
+                        suffix_params=('ls_dd_columns',)),
+    'qc22': ColumnNeeds(keys=('flag_cols',)),
+    'qc23': ColumnNeeds(keys=('index_date_col',),
+                        col_params=('diseasefirstexp_col',)),
+    'qc24': ColumnNeeds(keys=('index_date_col', 'lookback_date_col',
+                              'first_exp_date_cols', 'last_exp_date_cols')),
+    'qc25': ColumnNeeds(keys=('patient_id_col',)),
+    'qc26': ColumnNeeds(col_params=('diseasefirstexp_col',)),
+    # only counts the rows
+    'qc27': ColumnNeeds(),
+    'qc28': ColumnNeeds(col_params=('lookback_col_cn01',)),
+    'qc29': ColumnNeeds(keys=('matched_patient_id_col',),
+                        col_params=('lookback_col_cn01',)),
+    'qc30': ColumnNeeds(keys=('flag_cols',)),
+    'qc35': ColumnNeeds(keys=('patient_id_col',)),
+    'qc40': ColumnNeeds(keys=('code_col', 'category_col')),
+    'qc41': None,
+    'qc42': ColumnNeeds(keys=('description_col',)),
+}
+
+
+def needed_columns(qcs, qc_functions, columns, general):
+    """
+    :param qcs: List of the dictionaries of the QCs in the config, executed
+           on the same input file.
+    :param qc_functions: Dict-like of qc_num: QC function, e.g. the
+           QCRegistry of the Driver.
+    :param columns: Column names of the input file, in order.
+    :param general: General section of the config.
+    :return: List of the column names the QCs read, in the order of columns,
+             or None if the whole input file has to be loaded.
+    """
+    # the columns of the file are unknown
+    if not columns:
+        return None
+    index = column_index.ColumnIndex(list(columns), general)
+    set_cols = set()
+    for qc in qcs:
+        needs = COLUMN_NEEDS.get(qc['qc_num'])
+        if needs is None:
+            return None
+        set_cols.update(needs.resolve(qc_functions[qc['qc_num']],
+                                      qc.get('qc_params') or dict(), index))
+    ls_cols = [col for col in columns if col in set_cols]
+    # keep a column, so the QCs still see all the rows
+    if not ls_cols:
+        ls_cols = [columns[0]]
+    return ls_cols
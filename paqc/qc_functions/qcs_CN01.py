@@ -1,5 +1,4 @@
 import pandas as pd
-import re
 
 from paqc.report import report as rp
 from paqc.utils import utils
@@ -127,12 +126,11 @@ def qc30(df, dict_config):
                 -self.extra=ls_idx_faulty, a list of indices of rows of
                 patients that do not meet any of the stratification criteria
     """
-    ls_cc01_cs = utils.generate_list_cc0x_feats(dict_config, lvl1_desc=3)
-    prog = re.compile("(" + ")|(".join(ls_cc01_cs) + ")")
+    matcher = utils.generate_cc0x_matcher(dict_config, lvl1_desc=3)
     dict_features = utils.generate_dict_grouped_columns(df, dict_config,
                                                         ['flag_cols'])
     ls_cc01_cs_flag_cols = [dict_feat['flag'] for key, dict_feat in
-                            dict_features.items() if prog.search(key)]
+                            dict_features.items() if matcher.search(key)]
     ls_idx_faulty = df[~df[ls_cc01_cs_flag_cols].any(axis=1)].index.tolist()
 
     return rp.ReportItem.init_conditional(ls_idx_faulty, dict_config['qc'])
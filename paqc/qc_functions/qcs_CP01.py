@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import re
 
 from paqc.report import report as rp
 from paqc.utils import utils
@@ -17,13 +16,12 @@ def qc22(df, dict_config):
                 - self.extra=ls_idx_faulty, the indices of the rows that do
                 not meet any of the criteria listed in CC01_CP
     """
-    ls_cc01_cp = utils.generate_list_cc0x_feats(dict_config, lvl1_desc=1)
-    prog = re.compile("(" + ")|(".join(ls_cc01_cp) + ")")
+    matcher = utils.generate_cc0x_matcher(dict_config, lvl1_desc=1)
 
     dict_features = utils.generate_dict_grouped_columns(df, dict_config,
                                                         ['flag_cols'])
     ls_cc01_cp_flag_cols = [dict_feat['flag'] for key, dict_feat in
-                            dict_features.items() if prog.search(key)]
+                            dict_features.items() if matcher.search(key)]
     ls_idx_faulty = df[~df[ls_cc01_cp_flag_cols].any(axis=1)].index.tolist()
 
     return rp.ReportItem.init_conditional(ls_idx_faulty, dict_config['qc'])
@@ -66,12 +64,11 @@ def qc24(df, dict_config):
     dict_features = utils.generate_dict_grouped_columns(df, dict_config,
                                                         ['first_exp_date_cols',
                                                          'last_exp_date_cols'])
-    ls_cc03_cp = utils.generate_list_cc0x_feats(dict_config, lvl1_desc=3)
+    matcher = utils.generate_cc0x_matcher(dict_config, lvl1_desc=3)
 
     # Take the date columns of all features part of cc03_cp
-    prog = re.compile("(" + ")|(".join(ls_cc03_cp) + ")")
     ls_cc03_cp_dt_cols = [dict_feat.values() for key, dict_feat in
-                          dict_features.items() if prog.search(key)]
+                          dict_features.items() if matcher.search(key)]
     # flatten the list
     ls_cc03_cp_dt_cols = [item for sublist in ls_cc03_cp_dt_cols for
                           item in sublist]
@@ -3,6 +3,7 @@ import numpy as np
 import re
 
 from paqc.report import report as rp
+from paqc.utils import null_mask
 from paqc.utils import utils
 
 
@@ -44,6 +45,7 @@ def qc26(df, dict_config, diseasefirstexp_col='diseasefirstexp_dt'):
                 - self.extra=ls_idx_faulty: the indices of rows that have a
                 non-zero value for disease_first_exp_date
     """
-    ls_idx_faulty = df[~df[diseasefirstexp_col].isnull()].index.tolist()
+    mask = null_mask.get_null_mask(df, dict_config.get('null_mask'))
+    ls_idx_faulty = df.index[~mask.column(df, diseasefirstexp_col)].tolist()
 
     return rp.ReportItem.init_conditional(ls_idx_faulty, dict_config['qc'])
@@ -1,8 +1,11 @@
+from collections import defaultdict
 import pandas as pd
 import numpy as np
 import re
 
 from paqc.report import report as rp
+from paqc.utils import column_profile
+from paqc.utils import null_mask
 from paqc.utils import utils
 
 
@@ -40,19 +43,16 @@ def qc3(df, dict_config, missing_is_ok=False):
     ls_colnames = utils.generate_list_columns(df, dict_config,
                                               ['flag_cols', 'freq_cols',
                                                'count_cols'])
+    profile = column_profile.get_profile(df,
+                                         dict_config.get('column_profile'))
     ls_cols_faulty = []
     for colname in ls_colnames:
-        if pd.api.types.is_numeric_dtype(df[colname]):
-            if missing_is_ok:
-                if (df[colname] < 0).any():
-                    ls_cols_faulty.append(colname)
-                else:
-                    pass
-            else:
-                if (~(df[colname] >= 0)).any():
-                    ls_cols_faulty.append(colname)
-                else:
-                    pass
+        if profile.value(df, colname, 'numeric'):
+            dict_profile = profile.get(df, colname, ('n_null', 'n_negative'))
+            if dict_profile['n_negative'] > 0:
+                ls_cols_faulty.append(colname)
+            elif not missing_is_ok and dict_profile['n_null'] > 0:
+                ls_cols_faulty.append(colname)
         else:
             ls_cols_faulty.append(colname)
 
@@ -92,7 +92,8 @@ def qc6(df, dict_config):
                 that are completely empty.
     """
     # List with names of all empty columns
-    ls_cols_empty = df.columns[df.isnull().all(axis=0)].tolist()
+    mask = null_mask.get_null_mask(df, dict_config.get('null_mask'))
+    ls_cols_empty = df.columns[mask.column_all(df)].tolist()
 
     return rp.ReportItem.init_conditional(ls_cols_empty, dict_config['qc'])
 
@@ -108,7 +109,8 @@ def qc7(df, dict_config):
                 are completely empty.
     """
     # List with index of each empty row
-    ls_idx_empty = df.index[df.isnull().all(axis=1)].tolist()
+    mask = null_mask.get_null_mask(df, dict_config.get('null_mask'))
+    ls_idx_empty = df.index[mask.row_all(df)].tolist()
 
     return rp.ReportItem.init_conditional(ls_idx_empty, dict_config['qc'])
 
@@ -319,13 +321,45 @@ def qc12(df, dict_config):
                                                          'count_cols',
                                                          'freq_cols',
                                                          'flag_cols'])
-    ls_features_faulty = []
+    # Features with the same number of columns are checked together: their
+    # columns are laid out side by side, feature after feature, so the
+    # zero-or-null matrix can be summed per feature with a single reshape.
+    # Features with one column can't be partially missing.
+    dict_feats_by_size = defaultdict(list)
     for feat, dict_feat in dict_grouped_cols.items():
-        df_feat = df[list(dict_feat.values())].copy()
-        df_feat = df_feat.apply(utils.is_zero_or_null, reduce=False)
-        if df_feat.sum(axis=1).between(0, len(dict_feat),
-                                       inclusive=False).any():
-            ls_features_faulty.append(feat)
+        if len(dict_feat) > 1:
+            dict_feats_by_size[len(dict_feat)].append(feat)
+
+    # the nulls are read from the mask the Driver shares between the QCs,
+    # packing them only for this QC would take longer than computing them
+    mask = dict_config.get('null_mask')
+    if mask is not None and not mask.matches(df):
+        mask = None
+
+    set_features_faulty = set()
+    for size, ls_feats in dict_feats_by_size.items():
+        ls_cols = [colname for feat in ls_feats for colname in
+                   dict_grouped_cols[feat].values()]
+        arr_faulty = np.zeros(len(ls_feats), dtype=bool)
+        # rows are processed in blocks to bound the memory of the matrix
+        n_block_rows = max(1, 2 ** 24 // len(ls_cols))
+        for start in range(0, len(df), n_block_rows):
+            arr_null = None
+            if mask is not None:
+                arr_null = mask.block(df, ls_cols, start,
+                                      start + n_block_rows)
+            arr_zero_null = utils.zero_or_null_matrix(
+                df.iloc[start:start + n_block_rows], ls_cols, arr_null)
+            # number of zero or null columns of each feature on each row, the
+            # matrix is column-major so its transpose is (column, row)
+            arr_counts = arr_zero_null.T.view(np.uint8).reshape(
+                len(ls_feats), size, -1).sum(axis=1, dtype=np.uint8)
+            arr_faulty |= ((arr_counts > 0) & (arr_counts < size)).any(axis=1)
+        set_features_faulty.update(feat for feat, faulty in
+                                   zip(ls_feats, arr_faulty) if faulty)
+    # in the order of the features
+    ls_features_faulty = [feat for feat in dict_grouped_cols if feat in
+                          set_features_faulty]
 
     return rp.ReportItem.init_conditional(ls_features_faulty, dict_config['qc'])
 
@@ -2,6 +2,8 @@ import pandas as pd
 import re
 
 from paqc.report import report as rp
+from paqc.utils import column_profile
+from paqc.utils import null_mask
 from paqc.utils import utils
 
 
@@ -17,7 +19,8 @@ def qc14(df, dict_config):
     """
 
     patient_id_col = dict_config['general']['patient_id_col']
-    ls_idx_missing_id = df[df[patient_id_col].isnull()].index.tolist()
+    mask = null_mask.get_null_mask(df, dict_config.get('null_mask'))
+    ls_idx_missing_id = df.index[mask.column(df, patient_id_col)].tolist()
 
     return rp.ReportItem.init_conditional(ls_idx_missing_id, dict_config['qc'])
 
@@ -37,8 +40,10 @@ def qc15(df, dict_config, keys_num_cols=('count_cols', 'freq_cols',
                 should be numeric, but aren't.
     """
     ls_colnames = utils.generate_list_columns(df, dict_config, keys_num_cols)
-    ls_cols_not_numeric = [colname for colname in ls_colnames if
-                           not pd.api.types.is_numeric_dtype(df[colname])]
+    profile = column_profile.get_profile(df,
+                                         dict_config.get('column_profile'))
+    ss_numeric = profile.stat(df, 'numeric', ls_colnames)
+    ls_cols_not_numeric = ss_numeric[~ss_numeric].index.tolist()
 
     return rp.ReportItem.init_conditional(ls_cols_not_numeric, dict_config['qc'])
 
@@ -63,14 +68,16 @@ def qc16(df, dict_config, max_fraction_diff=0.1):
     colname_target = dict_config['general']['target_col']
 
     # Some cohorts do not have a target column, let the qc go as passed=False
+    profile = column_profile.get_profile(df,
+                                         dict_config.get('column_profile'))
     try:
-        df_grouped = df.groupby(colname_target)
+        df_fract = utils.grouped_fraction_zeroes_or_null(
+            df, colname_target, profile=profile)
     except KeyError:
         return rp.ReportItem(passed=False,
                              text='No matching target_col in the dataset',
                              **dict_config['qc'])
 
-    df_fract = df_grouped.agg(utils.fraction_zeroes_or_null)
     ss_dif_high = abs(df_fract.iloc[0] - df_fract.iloc[1]) > max_fraction_diff
     ls_cols_high_dif = ss_dif_high[ss_dif_high].index.tolist()
 
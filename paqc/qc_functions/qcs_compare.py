@@ -8,9 +8,53 @@ import pandas as pd
 import numpy as np
 
 from paqc.report import report as rp
+from paqc.utils import column_profile
+from paqc.utils import column_stats
 from paqc.utils import utils
 
 
+def changed_columns(df_old, df_new, dict_config, ls_colnames=None):
+    """
+    Finds the columns that changed between df_old and df_new: a value changed,
+    or a missing value was filled in or deleted. The Driver adds the
+    fingerprints of the columns of both inputs to dict_config (see
+    :func:`~utils.hashing.column_fingerprints`), so only the columns whose
+    fingerprints differ are compared value by value.
+
+    :param df_old:
+    :param df_new:
+    :param dict_config:
+    :param ls_colnames: list of the columns to compare, all columns of the
+           identically-labeled df_old and df_new if None.
+    :return: List of the changed columns, in the order of ls_colnames.
+    """
+    fingerprints = dict_config.get('column_fingerprints')
+    df1 = df2 = None
+    if ls_colnames is None:
+        # df_old and df_new are compared as a whole, which fails if they
+        # aren't identically-labeled
+        if not df_old.columns.equals(df_new.columns):
+            fingerprints = None
+        ls_colnames = df_old.columns.tolist()
+        df1, df2 = df_old, df_new
+
+    # the fingerprints don't depend on the row labels the values are compared
+    # by, and are looked up by column name
+    if fingerprints is not None and df_old.index.equals(df_new.index) and \
+            fingerprints[0].index.is_unique and \
+            fingerprints[1].index.is_unique:
+        ss_old, ss_new = fingerprints
+        ls_colnames = [col for col in ls_colnames
+                       if col not in ss_old or col not in ss_new or
+                       ss_old[col] != ss_new[col]]
+        df1 = df2 = None
+    if df1 is None:
+        df1, df2 = df_old[ls_colnames], df_new[ls_colnames]
+
+    ss_boolean = ((df1 != df2) & (~df1.isnull() | ~df2.isnull())).any()
+    return ss_boolean[ss_boolean].index.tolist()
+
+
 def qc46(df_old, df_new, dict_config):
     """
     Tests if two dataframes have the same columns and if they are in the same
@@ -101,14 +145,8 @@ def qc48(df_old, df_new, dict_config, ls_colnames=()):
                 -self.extra=ls_cols_faulty, list of columns of list_columns
                 that are not identical over the two dataframes.
     """
-    # Part of the dataframes to be tested
-    df1 = df_old[ls_colnames]
-    df2 = df_new[ls_colnames]
-
-    df_boolean = (df1[ls_colnames] != df2[ls_colnames]) & \
-                 (~df1[ls_colnames].isnull() | ~df2[ls_colnames].isnull())
-    ss_boolean = df_boolean.any()
-    ls_cols_faulty = ss_boolean[ss_boolean].index.tolist()
+    ls_cols_faulty = changed_columns(df_old, df_new, dict_config,
+                                     list(ls_colnames))
 
     return rp.ReportItem.init_conditional(ls_cols_faulty, dict_config['qc'])
 
@@ -139,21 +177,19 @@ def qc49(df_old, df_new, dict_config):
                 previously described statistics.
     """
 
-    ss_cols_diff = ((df_old != df_new) & (~df_old.isnull() |
-                                          ~df_new.isnull())).any()
+    ls_cols_diff = changed_columns(df_old, df_new, dict_config)
 
     # Calculate the descriptive stats for both dataframes, only for columns
     # that are difference between the two and are datetime or np.number
     dict_dfs = {'old': df_old, 'new': df_new}
+    dict_profiles = dict(zip(dict_dfs, dict_config.get('column_profiles',
+                                                       [None, None])))
     dict_summ_dfs = {}
     for name, df in dict_dfs.items():
-        df_diff = df.iloc[:, ss_cols_diff.values].select_dtypes(
+        df_diff = df[ls_cols_diff].select_dtypes(
                                             include=['datetime', np.number])
-        df_summary = df_diff.apply([np.min, np.max, utils.mean_all_types,
-                                    utils.median_all_types,
-                                    utils.fraction_zeroes_or_null]).transpose()
-        df_summary.columns = ['min', 'max', 'mean', 'median', 'null']
-        dict_summ_dfs[name] = df_summary
+        profile = column_profile.get_profile(df_diff, dict_profiles[name])
+        dict_summ_dfs[name] = column_stats.describe_columns(df_diff, profile)
 
     # Create the difference columns
     ss_diff_null = dict_summ_dfs['new']['null'] - dict_summ_dfs['old']['null']
@@ -184,9 +220,12 @@ def qc50(df_old, df_new, dict_config, max_fraction_diff=0.1):
     colname_target = dict_config['general']['target_col']
     dict_summary_dfs = {}
     dict_dfs = {'orig': df_old, 'new': df_new}
+    dict_profiles = dict(zip(dict_dfs, dict_config.get('column_profiles',
+                                                       [None, None])))
     for name, df in dict_dfs.items():
-        df_grouped = df.groupby(colname_target)
-        dict_summary_dfs[name] = df_grouped.agg(utils.fraction_zeroes_or_null)
+        profile = column_profile.get_profile(df, dict_profiles[name])
+        dict_summary_dfs[name] = utils.grouped_fraction_zeroes_or_null(
+            df, colname_target, profile=profile)
 
     df_diff = np.abs(dict_summary_dfs['new'] - dict_summary_dfs['orig'])
     ss_bool = (df_diff > max_fraction_diff).any(axis=0)
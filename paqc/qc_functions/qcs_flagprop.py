@@ -1,7 +1,7 @@
 import pandas as pd
-import re
 
 from paqc.report import report as rp
+from paqc.utils import null_mask
 from paqc.utils import utils
 
 
@@ -32,17 +32,14 @@ def qc40(df, dict_config, ls_metrictypes=('FLAG', 'FREQ', 'COUNT')):
                    'HCPC': 'H', 'Specialty': 'S', 'ICD10': 'D'}
     set_metrictypes = set(ls_metrictypes)
 
-    ss_code_split = df[code_col].apply(lambda x: re.split('_', x, maxsplit=2))
-
-    def is_not_wellnamed(code, cat):
-        is_not = (not (len(code) == 3) or
-                  not (code[2] in set_metrictypes) or
-                  not (dict_prefix[cat] == code[0]))
-        return is_not
-
-    ss_bool = pd.concat([ss_code_split, df[category_col]], axis=1)\
-                                .apply(lambda x: is_not_wellnamed(*x), axis=1)
-    ls_codes_faulty = df.loc[ss_bool, 'code'].tolist()
+    # [prefix, code, metrictype], missing parts are None
+    df_code_split = df[code_col].str.split('_', n=2, expand=True).reindex(
+        columns=range(3))
+    # codes that aren't strings and unknown categories don't follow the
+    # convention either
+    ss_wellnamed = (df_code_split[2].isin(set_metrictypes) &
+                    (df_code_split[0] == df[category_col].map(dict_prefix)))
+    ls_codes_faulty = df.loc[~ss_wellnamed, code_col].tolist()
 
     return rp.ReportItem.init_conditional(ls_codes_faulty, dict_config['qc'])
 
@@ -57,8 +54,8 @@ def qc41(df, dict_config):
                 - self.extra=ls_idx_faulty: The list of indices of
                 rows that have missing values.
     """
-    ss_rows_with_nulls = df.isnull().any(axis=1)
-    ls_idx_faulty = ss_rows_with_nulls[ss_rows_with_nulls].index.tolist()
+    mask = null_mask.get_null_mask(df, dict_config.get('null_mask'))
+    ls_idx_faulty = df.index[mask.row_any(df)].tolist()
 
     return rp.ReportItem.init_conditional(ls_idx_faulty, dict_config['qc'])
 
@@ -0,0 +1,171 @@
+"""
+Streaming versions of the QCs that can be evaluated on an input file chunk by
+chunk, without ever loading the whole file into memory. Each streaming QC
+consumes the chunks through its accumulate method, and its finalize method
+returns exactly the same ReportItem as the QC function would on the fully
+loaded DataFrame.
+
+Only the QCs listed in STREAMING_QCS can be streamed, all the others need the
+fully loaded DataFrame, so the Driver falls back to loading the input file
+for them.
+"""
+from functools import partial
+
+import pandas as pd
+
+from paqc.report import report as rp
+
+
+class StreamingQC:
+    """
+    Base class of the streaming QCs. The chunks have to keep the row index of
+    the full DataFrame, as pandas.read_csv does with its chunksize argument.
+    """
+
+    def __init__(self, qc_function, dict_config, qc_params):
+        self.qc_function = qc_function
+        self.dict_config = dict_config
+        self.qc_params = qc_params
+
+    def accumulate(self, df_chunk):
+        """
+        Updates the state of the QC with the next chunk of the input file.
+
+        :param df_chunk: pandas DataFrame, a chunk of rows of the input file.
+        :return: None
+        """
+        raise NotImplementedError
+
+    def finalize(self):
+        """
+        :return: ReportItem of the QC over all the chunks it has seen.
+        """
+        raise NotImplementedError
+
+
+class FirstChunkQC(StreamingQC):
+    """
+    For QCs that only look at the column names, so the first chunk is all
+    they need.
+    """
+
+    def __init__(self, qc_function, dict_config, qc_params):
+        super().__init__(qc_function, dict_config, qc_params)
+        self.rpi = None
+
+    def accumulate(self, df_chunk):
+        if self.rpi is None:
+            self.rpi = self.qc_function(df_chunk, self.dict_config,
+                                        **self.qc_params)
+
+    def finalize(self):
+        return self.rpi
+
+
+class RowIndexQC(StreamingQC):
+    """
+    For QCs that check each row independently of the others, and report the
+    indices of the faulty rows. The QC function is executed on each chunk and
+    the faulty indices of the chunks are concatenated.
+    """
+
+    def __init__(self, qc_function, dict_config, qc_params):
+        super().__init__(qc_function, dict_config, qc_params)
+        self.ls_idx_faulty = []
+        # ReportItem of a QC that failed without checking any rows, e.g.
+        # because of a misformatted parameter
+        self.rpi_failed = None
+
+    def accumulate(self, df_chunk):
+        if self.rpi_failed is not None:
+            return
+        rpi = self.qc_function(df_chunk, self.dict_config, **self.qc_params)
+        if isinstance(rpi.extra, list):
+            self.ls_idx_faulty.extend(rpi.extra)
+        elif not rpi.passed:
+            self.rpi_failed = rpi
+
+    def finalize(self):
+        if self.rpi_failed is not None:
+            return self.rpi_failed
+        return rp.ReportItem.init_conditional(self.ls_idx_faulty,
+                                              self.dict_config['qc'])
+
+
+class ColumnsQC(StreamingQC):
+    """
+    For QCs that need to see all the rows, but only of a few columns (e.g.
+    to find duplicates). Only these columns are kept from each chunk, and the
+    QC function is executed on them once all chunks are seen.
+    """
+
+    def __init__(self, qc_function, dict_config, qc_params, keys=()):
+        super().__init__(qc_function, dict_config, qc_params)
+        self.columns = [dict_config['general'][key] for key in keys]
+        self.ls_chunks = []
+
+    def accumulate(self, df_chunk):
+        self.ls_chunks.append(df_chunk[self.columns])
+
+    def finalize(self):
+        df = pd.concat(self.ls_chunks)
+        self.ls_chunks = []
+        return self.qc_function(df, self.dict_config, **self.qc_params)
+
+
+class EmptyColumnsQC(StreamingQC):
+    """
+    Streaming version of qc6, a column is empty if it's empty in all chunks.
+    """
+
+    def __init__(self, qc_function, dict_config, qc_params):
+        super().__init__(qc_function, dict_config, qc_params)
+        self.ss_empty = None
+
+    def accumulate(self, df_chunk):
+        ss_empty = df_chunk.isnull().all(axis=0)
+        if self.ss_empty is None:
+            self.ss_empty = ss_empty
+        else:
+            self.ss_empty = self.ss_empty & ss_empty
+
+    def finalize(self):
+        ls_cols_empty = self.ss_empty[self.ss_empty].index.tolist()
+        return rp.ReportItem.init_conditional(ls_cols_empty,
+                                              self.dict_config['qc'])
+
+
+# qc_num: class of the streaming version of the QC
+STREAMING_QCS = {
+    'qc1': FirstChunkQC,
+    'qc4': partial(ColumnsQC, keys=['patient_id_col']),
+    'qc6': EmptyColumnsQC,
+    'qc7': RowIndexQC,
+    'qc8': FirstChunkQC,
+    'qc14': RowIndexQC,
+    'qc17': RowIndexQC,
+    'qc18': RowIndexQC,
+    'qc19': RowIndexQC,
+    'qc23': RowIndexQC,
+    'qc26': RowIndexQC,
+    'qc41': RowIndexQC,
+}
+
+
+def is_streamable(qc_num):
+    """
+    :param qc_num: Name of the QC, e.g. qc4.
+    :return: Boolean, whether the QC can be evaluated chunk by chunk.
+    """
+    return qc_num in STREAMING_QCS
+
+
+def init_streaming_qc(qc_function, dict_config, qc_params):
+    """
+    :param qc_function: The QC function to stream.
+    :param dict_config: Mini config object of the QC.
+    :param qc_params: Dict of extra parameters of the QC function.
+    :return: StreamingQC object of the QC.
+    """
+    qc_num = dict_config['qc']['qc_num']
+    return STREAMING_QCS[qc_num](qc_function, dict_config, qc_params)
@@ -57,6 +57,15 @@ class ReportItem:
         self.exec_time = exec_time
 
 
+class ErrorItem(ReportItem):
+    """
+    ReportItem of a QC that couldn't be executed, because of a bug or an
+    input file that couldn't be loaded, instead of a QC that failed its
+    check. The error may be transient, so these aren't cached, see
+    :mod:`~utils.result_cache`.
+    """
+
+
 class Report:
     """
     Class for building up, storing, ordering and managing the report items of
@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from paqc.utils import catalog
+
+
+@pytest.fixture
+def status_qc_path(tmp_path):
+    path = str(tmp_path / 'Status_QC.xlsx')
+    shutil.copy(catalog.STATUS_QC_PATH, path)
+    return path
+
+
+def test_shipped_catalog_is_up_to_date():
+    with open(catalog.CATALOG_PATH) as f:
+        sidecar = json.load(f)
+    assert sidecar['hash'] == catalog.hash_file(catalog.STATUS_QC_PATH)
+    assert sidecar['qcs'] == catalog.compile_catalog()
+
+
+def test_load_catalog_writes_sidecar(status_qc_path, tmp_path):
+    catalog_path = str(tmp_path / 'Status_QC.json')
+    qc_catalog = catalog.load_catalog(status_qc_path, catalog_path)
+    assert os.path.exists(catalog_path)
+    assert qc_catalog.get_compare()['qc46']
+    assert not qc_catalog.get_compare()['qc4']
+    assert catalog.load_catalog(status_qc_path, catalog_path).qcs == \
+           qc_catalog.qcs
+
+
+def test_load_catalog_touched_workbook(status_qc_path, tmp_path):
+    catalog_path = str(tmp_path / 'Status_QC.json')
+    catalog.load_catalog(status_qc_path, catalog_path)
+    # same content, new mtime: the sidecar is still valid
+    os.utime(status_qc_path, (0, 0))
+    with open(catalog_path) as f:
+        sidecar = json.load(f)
+    sidecar['qcs']['qc4']['desc'] = 'from sidecar'
+    with open(catalog_path, 'w') as f:
+        json.dump(sidecar, f)
+    qc_catalog = catalog.load_catalog(status_qc_path, catalog_path)
+    assert qc_catalog.get_descriptions()['qc4'] == 'from sidecar'
+
+
+def test_load_catalog_stale_sidecar(status_qc_path, tmp_path):
+    catalog_path = str(tmp_path / 'Status_QC.json')
+    with open(catalog_path, 'w') as f:
+        json.dump({'hash': 'outdated', 'size': 0, 'mtime': 0,
+                   'qcs': {'qc4': {'desc': 'outdated', 'compare': True}}}, f)
+    qc_catalog = catalog.load_catalog(status_qc_path, catalog_path)
+    assert qc_catalog.qcs == catalog.compile_catalog(status_qc_path)
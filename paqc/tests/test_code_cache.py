@@ -0,0 +1,45 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from paqc.utils import code_cache, utils
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_CN01 = config_open("paqc/tests/data/driver_dict_output_CN01.yml")[1]
+DICT_CONFIG_CP01 = config_open("paqc/tests/data/driver_dict_output_CP01.yml")[1]
+
+
+def read_lvl2_descs(dict_config, lvl1_desc):
+    # reads the code files on every call, as generate_list_cc0x_feats did
+    set_lvl2_desc = set()
+    for file in code_cache.CODE_FILES:
+        df = pd.read_csv(dict_config['general'][file])
+        set_lvl2_desc.update(df[df[code_cache.CODE_LVL1_COL] ==
+                                lvl1_desc][code_cache.CODE_LVL2_COL])
+    return [utils.clean_string(desc) for desc in set_lvl2_desc]
+
+
+@pytest.mark.parametrize("lvl1_desc", [1, 2, 3, 4])
+@pytest.mark.parametrize("dict_config", [DICT_CONFIG_CN01, DICT_CONFIG_CP01])
+def test_generate_list_cc0x_feats(dict_config, lvl1_desc):
+    code_cache.clear()
+    expected = sorted(read_lvl2_descs(dict_config, lvl1_desc))
+    assert sorted(utils.generate_list_cc0x_feats(dict_config,
+                                                 lvl1_desc)) == expected
+    # second call comes from the cache
+    assert sorted(utils.generate_list_cc0x_feats(dict_config,
+                                                 lvl1_desc)) == expected
+
+
+def test_code_file_changed(tmp_path):
+    path = str(tmp_path / 'speciality.csv')
+    shutil.copy(DICT_CONFIG_CN01['general']['speciality_file'], path)
+    dict_groups = code_cache.get_code_file(path)
+    assert code_cache.get_code_file(path) is dict_groups
+    with open(path, 'a') as f:
+        f.write("NEW SPECIALITY,9,New Speciality\n")
+    os.utime(path, (0, 0))
+    assert code_cache.get_code_file(path)[9] == {
+        'New Speciality': 'new_speciality'}
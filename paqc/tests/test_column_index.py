@@ -0,0 +1,57 @@
+import pytest
+
+from paqc.connectors import csv
+from paqc.utils import utils
+from paqc.utils.column_index import ColumnIndex
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_9TO13 = config_open(
+    "paqc/tests/data/qc9to13_driver_dict_output.yml")[1]
+DICT_CONFIG_CN01 = config_open("paqc/tests/data/driver_dict_output_CN01.yml")[1]
+
+LIST_KEYS = [
+    ['flag_cols'],
+    ['first_exp_date_cols', 'last_exp_date_cols'],
+    ['first_exp_date_cols', 'last_exp_date_cols', 'count_cols'],
+    ['count_cols', 'first_exp_date_cols', 'flag_cols', 'freq_cols',
+     'last_exp_date_cols'],
+    ['date_cols', 'index_date_col', 'lookback_date_col'],
+    ['special_cols'],
+    ['unknown_cols'],
+    []
+]
+
+
+@pytest.mark.parametrize("list_keys", LIST_KEYS)
+@pytest.mark.parametrize("df, dict_config", [
+    (csv.read_csv(DICT_CONFIG_9TO13, "paqc/tests/data/qc12_check2.csv"),
+     DICT_CONFIG_9TO13),
+    (csv.read_csv(DICT_CONFIG_CN01, "paqc/tests/data/qc30_check2.csv"),
+     DICT_CONFIG_CN01)
+])
+def test_column_index(df, dict_config, list_keys):
+    column_index = ColumnIndex(df.columns, dict_config['general'])
+    dict_config_index = dict(dict_config, column_index=column_index)
+    ls_cols = utils.generate_list_columns(df, dict_config, list_keys)
+    dict_grouped = utils.generate_dict_grouped_columns(df, dict_config,
+                                                       list_keys)
+    assert utils.generate_list_columns(df, dict_config_index,
+                                       list_keys) == ls_cols
+    grouped_index = utils.generate_dict_grouped_columns(df, dict_config_index,
+                                                        list_keys)
+    # same features, in the same order
+    assert list(grouped_index.items()) == list(dict_grouped.items())
+
+
+@pytest.mark.parametrize("dict_config", [DICT_CONFIG_9TO13])
+@pytest.mark.parametrize("df", [
+    csv.read_csv(DICT_CONFIG_9TO13, "paqc/tests/data/qc12_check2.csv")
+])
+def test_column_index_other_columns(df, dict_config):
+    column_index = ColumnIndex(df.columns, dict_config['general'])
+    dict_config_index = dict(dict_config, column_index=column_index)
+    # a different DataFrame doesn't use the index
+    df_sub = df.iloc[:, :3]
+    assert not column_index.matches(df_sub)
+    assert utils.generate_list_columns(df_sub, dict_config_index,
+                                       ['flag_cols']) == ['predictorA_flag']
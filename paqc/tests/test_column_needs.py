@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+import paqc.qc_functions as qcs_main
+from paqc.connectors import csv
+from paqc.driver import driver
+from paqc.connectors import feather
+from paqc.qc_functions import column_needs
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG = config_open(
+    "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+QC_FUNCTIONS = qcs_main.QCRegistry(qcs_main)
+COLUMNS = ['patient_id', 'pat_gender_cd', 'pat_age', 'index_dt',
+           'lookback_dt', 'disease_frst_exp_dt', 'asthma_first_exp_dt',
+           'asthma_last_exp_dt', 'asthma_count', 'asthma_flag', 'LABEL']
+
+
+@pytest.mark.parametrize("qcs, expected", [
+    ([{'qc_num': 'qc17'}], ['pat_gender_cd']),
+    ([{'qc_num': 'qc14'}, {'qc_num': 'qc17'}, {'qc_num': 'qc18'}],
+     ['patient_id', 'pat_gender_cd', 'pat_age']),
+    # default and configured qc_params
+    ([{'qc_num': 'qc9'}], ['lookback_dt', 'asthma_first_exp_dt',
+                           'asthma_last_exp_dt']),
+    ([{'qc_num': 'qc9', 'qc_params': {'keys_columns_a': ['count_cols'],
+                                      'key_column_b': 'index_date_col'}}],
+     ['index_dt', 'asthma_count']),
+    ([{'qc_num': 'qc26', 'qc_params': {
+        'diseasefirstexp_col': 'disease_frst_exp_dt'}}],
+     ['disease_frst_exp_dt']),
+    # the default column isn't in the file, the first column is kept so the
+    # rows are still counted
+    ([{'qc_num': 'qc26', 'qc_params': None}], ['patient_id']),
+    ([{'qc_num': 'qc13'}], ['asthma_first_exp_dt', 'asthma_last_exp_dt',
+                            'asthma_count']),
+    # only counts the rows
+    ([{'qc_num': 'qc27'}], ['patient_id']),
+    # whole frame QCs
+    ([{'qc_num': 'qc17'}, {'qc_num': 'qc6'}], None),
+    ([{'qc_num': 'qc1'}], None),
+])
+def test_needed_columns(qcs, expected):
+    ls_cols = column_needs.needed_columns(qcs, QC_FUNCTIONS, COLUMNS,
+                                          DICT_CONFIG['general'])
+    assert ls_cols == expected
+
+
+@pytest.mark.parametrize("qcs", [[{'qc_num': 'qc17'}], [{'qc_num': 'qc27'}]])
+def test_needed_columns_unknown(qcs):
+    # the columns of the file are unknown, the whole file is loaded
+    assert column_needs.needed_columns(qcs, QC_FUNCTIONS, [],
+                                       DICT_CONFIG['general']) is None
+
+
+@pytest.mark.parametrize("columns", [["pat_gender_cd"],
+                                     ["patient_id", "index_dt"]])
+def test_read_csv_columns(columns):
+    path = "paqc/tests/data/qc19_check2.csv"
+    df = csv.read_csv(DICT_CONFIG, path)
+    pd.testing.assert_frame_equal(csv.read_csv(DICT_CONFIG, path, columns),
+                                  df[columns])
+    pd.testing.assert_frame_equal(
+        pd.concat(csv.read_csv_chunks(DICT_CONFIG, path, 2, columns)),
+        df[columns])
+
+
+@pytest.mark.parametrize("columns", [["pat_gender_cd"],
+                                     ["patient_id", "index_dt"]])
+def test_read_feather_columns(columns, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "qc19_check2.feather")
+    pd.read_csv("paqc/tests/data/qc19_check2.csv").to_feather(path)
+    df = feather.read_feather(DICT_CONFIG, path)
+    assert feather.read_feather_columns(path) == df.columns.tolist()
+    pd.testing.assert_frame_equal(
+        feather.read_feather(DICT_CONFIG, path, columns), df[columns])
+
+
+@pytest.mark.parametrize("qcs", [[{'qc_num': 'qc17'}], [{'qc_num': 'qc27'}]])
+def test_read_feather_v1_columns(qcs, tmp_path):
+    # Feather V1 files have no schema to read on its own, they are loaded
+    # whole
+    pyarrow_feather = pytest.importorskip("pyarrow.feather")
+    path = str(tmp_path / "qc19_check2.feather")
+    df_csv = pd.read_csv("paqc/tests/data/qc19_check2.csv")
+    pyarrow_feather.write_feather(df_csv, path, version=1)
+    assert feather.read_feather_columns(path) is None
+    d = driver.Driver(None, verbose=False)
+    d.general = dict(DICT_CONFIG['general'], source='feather')
+    assert d.needed_columns(path, qcs) is None
+    df = feather.read_feather(DICT_CONFIG, path)
+    assert df.columns.tolist() == df_csv.columns.tolist()
+    assert len(df) == len(df_csv)
@@ -0,0 +1,111 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.qc_functions.qcs_all_data_1to13 import qc3, qc6
+from paqc.qc_functions.qcs_all_data_others import qc15, qc16
+from paqc.qc_functions.qcs_flagprop import qc41
+from paqc.utils import column_profile
+from paqc.utils import null_mask
+from paqc.utils import utils
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_1TO8 = config_open("paqc/tests/data/driver_dict_output.yml")[1]
+
+
+def generate_df(n_rows, seed):
+    rnd = np.random.RandomState(seed)
+    ss_float = rnd.randn(n_rows)
+    ss_float[rnd.rand(n_rows) < 0.2] = np.nan
+    ss_float[rnd.rand(n_rows) < 0.2] = 0
+    ss_dt = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+        rnd.randint(0, 3000, n_rows), unit='h'))
+    ss_dt[rnd.rand(n_rows) < 0.2] = pd.NaT
+    ss_nullable = pd.Series(rnd.randint(-1, 3, n_rows), dtype='Int64')
+    ss_nullable[rnd.rand(n_rows) < 0.2] = pd.NA
+    return pd.DataFrame({
+        'count': rnd.randint(-1, 4, n_rows),
+        'flag': rnd.randint(0, 2, n_rows).astype(np.uint8),
+        'bool': rnd.rand(n_rows) < 0.5,
+        'score': ss_float,
+        'no_score': np.nan,
+        'index_dt': ss_dt.astype('datetime64[us]'),
+        'no_dt': pd.Series(pd.NaT, index=range(n_rows),
+                           dtype='datetime64[ns]'),
+        'nullable': ss_nullable,
+        'name': pd.Series(rnd.choice(['a', None], n_rows), dtype=object)})
+
+
+@pytest.mark.parametrize("df", [generate_df(0, 0), generate_df(1, 1),
+                                generate_df(200, 2)])
+def test_profile(df):
+    profile = column_profile.ColumnProfile(df)
+    for colname in df.columns:
+        ss = df[colname]
+        numeric = pd.api.types.is_numeric_dtype(ss)
+        dict_profile = profile.get(df, colname)
+        assert profile.value(df, colname, 'numeric') == numeric
+        assert dict_profile['n_null'] == ss.isnull().sum()
+        assert dict_profile['n_zero'] == ((ss == 0).sum() if numeric else 0)
+        assert dict_profile['n_negative'] == \
+            ((ss < 0).sum() if numeric else 0)
+        assert profile.value(df, colname, 'all_null') == ss.isnull().all()
+        if numeric or pd.api.types.is_datetime64_any_dtype(ss):
+            for stat, func in [('min', np.min), ('max', np.max)]:
+                value = func(ss)
+                if pd.isnull(value):
+                    assert pd.isnull(dict_profile[stat])
+                else:
+                    assert dict_profile[stat] == value
+        else:
+            assert dict_profile['min'] is None
+
+
+def test_profile_shared(monkeypatch):
+    # the stats of a column are computed once for all QCs, and the nulls are
+    # counted on the null mask
+    df = csv.read_csv(DICT_CONFIG_1TO8, "paqc/tests/data/qc4_check2.csv")
+    df['target'] = np.arange(len(df)) % 2
+    dict_config = copy.deepcopy(DICT_CONFIG_1TO8)
+    dict_config['general']['target_col'] = 'target'
+    ls_qcs = [qc3, qc6, qc15, qc16, qc41, qc3]
+    ls_expected = [(qc(df, dict_config).passed, qc(df, dict_config).extra)
+                   for qc in ls_qcs]
+
+    profiled = []
+
+    def counting(function):
+        def counting_function(ss):
+            profiled.append((function.__name__, ss.name))
+            return function(ss)
+        return counting_function
+
+    monkeypatch.setattr(column_profile, 'STAT_GROUPS', [
+        (group_stats, counting(function))
+        for group_stats, function in column_profile.STAT_GROUPS])
+    mask = null_mask.NullMask(df)
+    dict_config['null_mask'] = mask
+    dict_config['column_profile'] = column_profile.ColumnProfile(df, mask)
+    ls_rpis = [qc(df, dict_config) for qc in ls_qcs]
+    assert [(rpi.passed, rpi.extra) for rpi in ls_rpis] == ls_expected
+    assert len(profiled) == len(set(profiled))
+    ls_cols = utils.generate_list_columns(df, dict_config, [
+        'flag_cols', 'freq_cols', 'count_cols'])
+    assert sorted(profiled) == sorted(('count_negative', colname)
+                                      for colname in ls_cols)
+    assert dict_config['column_profile'].stat(df, 'n_null').tolist() == \
+        df.isnull().sum().tolist()
+
+
+def test_matches():
+    df = generate_df(10, 0)
+    profile = column_profile.ColumnProfile(df)
+    assert profile.matches(df)
+    assert profile.matches(df[['score', 'count']])
+    assert not profile.matches(df.iloc[:5])
+    assert column_profile.get_profile(df.iloc[:5], profile) is not profile
+    df_other = df.assign(other=1)
+    assert not profile.matches(df_other)
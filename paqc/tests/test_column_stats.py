@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.utils import column_profile
+from paqc.utils import column_stats
+from paqc.utils import utils
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_48 = config_open(
+    "paqc/tests/data/qc48_driver_dict_output.yml")[1]
+
+
+def describe_apply(df):
+    # the statistics qc49 computed with DataFrame.apply
+    df_summary = df.apply([np.min, np.max, utils.mean_all_types,
+                           utils.median_all_types,
+                           utils.fraction_zeroes_or_null]).transpose()
+    df_summary.columns = column_stats.STATS
+    return df_summary
+
+
+def generate_df(n_rows, seed):
+    rnd = np.random.RandomState(seed)
+    ss_float = rnd.rand(n_rows)
+    ss_float[rnd.rand(n_rows) < 0.2] = np.nan
+    ss_dt = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+        rnd.randint(0, 3000, n_rows), unit='h'))
+    ss_dt[rnd.rand(n_rows) < 0.2] = pd.NaT
+    return pd.DataFrame({
+        'count': rnd.randint(0, 4, n_rows),
+        'flag': rnd.randint(0, 2, n_rows).astype(np.uint8),
+        'score': ss_float,
+        'no_score': np.nan,
+        'index_dt': ss_dt.astype('datetime64[us]'),
+        'exp_dt': ss_dt.astype('datetime64[s]'),
+        'no_dt': pd.Series(pd.NaT, index=range(n_rows),
+                           dtype='datetime64[ns]'),
+        'nullable': pd.Series(rnd.randint(0, 3, n_rows), dtype='Int64')})
+
+
+@pytest.mark.parametrize("use_profile", [False, True])
+@pytest.mark.parametrize("batch_cells", [1, 100, 10000000])
+@pytest.mark.parametrize("df", [
+    generate_df(101, 0),
+    generate_df(101, 0)[['count', 'flag', 'score', 'no_score']],
+    generate_df(5, 1)[['index_dt', 'exp_dt']],
+    csv.read_csv(DICT_CONFIG_48, "paqc/tests/data/suite2_df_old.csv"
+                 ).select_dtypes(include=['datetime', np.number]),
+])
+def test_describe_columns(df, batch_cells, use_profile, monkeypatch):
+    monkeypatch.setattr(column_stats, 'BATCH_CELLS', batch_cells)
+    profile = column_profile.ColumnProfile(df) if use_profile else None
+    pd.testing.assert_frame_equal(column_stats.describe_columns(df, profile),
+                                  describe_apply(df))
+
+
+def test_datetime_units():
+    # the mean and median are in the unit of the column
+    ss = pd.Series(pd.to_datetime(['2010-01-01', '2012-01-01'])).astype(
+        'datetime64[s]')
+    dict_stats = column_stats.describe_datetime(ss)
+    assert dict_stats['mean'] == pd.Timestamp('2011-01-01')
+    assert utils.median_all_types(ss) == pd.Timestamp('2011-01-01')
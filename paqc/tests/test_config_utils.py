@@ -47,7 +47,21 @@ def test_config_open(path_to_file, expected):
     # compare qc doesn't have multi-input files with * in their path
     ("paqc/tests/data/config_test_check18.yml", False),
     # properly formatted config YAML
-    ("paqc/tests/data/config_test_check19.yml", True)
+    ("paqc/tests/data/config_test_check19.yml", True),
+    # unknown executor in general section
+    ("paqc/tests/data/config_test_check20.yml", False),
+    # shard_workers in general section is not a positive integer
+    ("paqc/tests/data/config_test_check21.yml", False),
+    # chunksize in general section is not a positive integer
+    ("paqc/tests/data/config_test_check22.yml", False),
+    # memory_map in general section is not a boolean
+    ("paqc/tests/data/config_test_check23.yml", False),
+    # unknown rds_reader in general section
+    ("paqc/tests/data/config_test_check24.yml", False),
+    # hash_files in general section is not a boolean
+    ("paqc/tests/data/config_test_check25.yml", False),
+    # cache_max_mb in general section is not a positive number
+    ("paqc/tests/data/config_test_check26.yml", False)
 ])
 def test_config_checker(path_to_file, expected):
     assert config_checker(config_open(path_to_file)[1]) == expected
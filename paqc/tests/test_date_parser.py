@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import date_parser
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def generate_dates_df(n_rows, n_cols, seed):
+    # string dates, repeated within and across columns, with missing values
+    # and a column without any dates
+    rnd = np.random.RandomState(seed)
+    ss_dates = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+        rnd.randint(0, 3000, 50), unit='D')).dt.strftime(DATE_FORMAT)
+    dict_cols = dict()
+    for i in range(n_cols):
+        values = ss_dates.sample(n_rows, replace=True, random_state=rnd)
+        values[rnd.rand(n_rows) < 0.2] = None
+        dict_cols['col%d_dt' % i] = values.values
+    dict_cols['empty_dt'] = None
+    return pd.DataFrame(dict_cols, index=range(10, 10 + n_rows)).astype(str)
+
+
+@pytest.mark.parametrize("parallel_min_uniques", [
+    date_parser.PARALLEL_MIN_UNIQUES, 10])
+@pytest.mark.parametrize("n_rows, n_cols, seed", [(1, 1, 0), (100, 3, 1),
+                                                  (1000, 30, 2)])
+def test_parse_columns(n_rows, n_cols, seed, parallel_min_uniques,
+                       monkeypatch):
+    monkeypatch.setattr(date_parser, 'PARALLEL_MIN_UNIQUES',
+                        parallel_min_uniques)
+    df = generate_dates_df(n_rows, n_cols, seed)
+    df_expected = df.apply(pd.to_datetime, format=DATE_FORMAT)
+    parser = date_parser.DateParser(DATE_FORMAT)
+    pd.testing.assert_frame_equal(parser.parse_columns(df, list(df.columns)),
+                                  df_expected)
+    # the second time, all dates come from the cache
+    df_half = df.iloc[:n_rows // 2 + 1]
+    pd.testing.assert_frame_equal(
+        parser.parse_columns(df_half, list(df.columns)),
+        df_expected.iloc[:n_rows // 2 + 1])
+
+
+def test_parse_columns_wrong_format():
+    df = pd.DataFrame({'a_dt': ['2010-01-01 00:00:00', '01/01/2010']})
+    with pytest.raises(ValueError):
+        date_parser.DateParser(DATE_FORMAT).parse_columns(df, ['a_dt'])
+
+
+def test_parse_columns_cache_max(monkeypatch):
+    # past CACHE_MAX_STRINGS, the cache only keeps the strings of the
+    # columns being parsed
+    monkeypatch.setattr(date_parser, 'CACHE_MAX_STRINGS', 60)
+    parser = date_parser.DateParser(DATE_FORMAT)
+    for seed in range(4):
+        df = generate_dates_df(200, 3, seed)
+        pd.testing.assert_frame_equal(
+            parser.parse_columns(df, list(df.columns)),
+            df.apply(pd.to_datetime, format=DATE_FORMAT))
+        arr_uniques = pd.unique(df.values.ravel())
+        assert set(arr_uniques[pd.notnull(arr_uniques)]) <= \
+            set(parser.ss_cache.index)
+        assert len(parser.ss_cache) <= 60
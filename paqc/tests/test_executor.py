@@ -0,0 +1,112 @@
+import copy
+import os
+
+import pandas as pd
+import pytest
+import yaml
+
+from paqc.connectors import csv
+from paqc.driver import driver
+from paqc.driver import executor
+from paqc.qc_functions.qcs_all_data_1to13 import qc1, qc3, qc4, qc7, qc8
+from paqc.report import report
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_1TO8 = config_open("paqc/tests/data/driver_dict_output.yml")[1]
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+
+
+def make_tasks(dict_config, qc_functions):
+    tasks = []
+    for qc_function in qc_functions:
+        qc_config = copy.deepcopy(dict_config)
+        qc_config['qc']['qc_num'] = qc_function.__name__
+        tasks.append((qc_function, qc_config, dict()))
+    return tasks
+
+
+def qc_buggy(df, dict_config):
+    raise ZeroDivisionError()
+
+
+@pytest.mark.parametrize("dict_config", [DICT_CONFIG_1TO8])
+@pytest.mark.parametrize("df", [
+    csv.read_csv(DICT_CONFIG_1TO8, "paqc/tests/data/qc4_check2.csv")
+])
+@pytest.mark.parametrize("executor_type, workers", [
+    ('threads', 2),
+    ('processes', 2),
+    ('processes', None)
+])
+def test_run_qcs(df, dict_config, executor_type, workers):
+    tasks = make_tasks(dict_config, [qc1, qc3, qc4, qc7, qc8])
+    rpis_serial = executor.run_qcs(tasks, df)
+    rpis = executor.run_qcs(tasks, df, executor=executor_type,
+                            workers=workers)
+    # same ReportItems, in the order of the tasks
+    assert [rpi.qc_num for rpi in rpis] == ['qc1', 'qc3', 'qc4', 'qc7', 'qc8']
+    assert [(rpi.passed, rpi.extra) for rpi in rpis] == \
+           [(rpi.passed, rpi.extra) for rpi in rpis_serial]
+
+
+@pytest.mark.parametrize("dict_config", [DICT_CONFIG_1TO8])
+@pytest.mark.parametrize("df", [
+    csv.read_csv(DICT_CONFIG_1TO8, "paqc/tests/data/qc4_check1.csv")
+])
+@pytest.mark.parametrize("executor_type", ['serial', 'threads'])
+def test_run_qcs_bug_logged(df, dict_config, executor_type):
+    tasks = make_tasks(dict_config, [qc_buggy, qc4])
+    rpis = executor.run_qcs(tasks, df, executor=executor_type, workers=2)
+    assert (not rpis[0].passed) & (rpis[0].level == 'error')
+    assert rpis[0].qc_num == 'qc_buggy'
+    assert rpis[1].passed
+
+
+def write_shards_config(tmp_path, shard_workers):
+    """
+    Writes the rows of qc17_check2.csv in 3 chunk files of a multi-file
+    input, and a config with QCs on them.
+    """
+    df = pd.read_csv("paqc/tests/data/qc17_check2.csv", dtype=str)
+    os.makedirs(tmp_path / 'shards', exist_ok=True)
+    for i, rows in enumerate([[0, 1, 2], [3, 4], [5, 6, 7]]):
+        df.iloc[rows].to_csv(tmp_path / 'shards' / ('qc17_%d.csv' % i),
+                             index=False)
+    general = copy.deepcopy(DICT_CONFIG_17TO19['general'])
+    general['input1'] = str(tmp_path / 'shards' / 'qc17_*.csv')
+    del general['input2']
+    general['output_dir'] = str(tmp_path / 'output')
+    general['cache_dir'] = str(tmp_path / ('cache%d' % shard_workers))
+    general['shard_workers'] = shard_workers
+    qcs = [{'qc_num': qc_num, 'input_file': 'input1', 'level': 'error'}
+           for qc_num in ['qc17', 'qc18', 'qc19']]
+    config_path = tmp_path / ('config%d.yml' % shard_workers)
+    with open(config_path, 'w') as f:
+        yaml.safe_dump({'general': general, 'qcs': qcs}, f)
+    return str(config_path)
+
+
+def test_run_shards(tmp_path):
+    # the chunk files QC-ed in processes give the same report as one after
+    # another, grouped by chunk file in the order of their paths
+    ls_summaries = []
+    for shard_workers in [1, 2, 2]:
+        d = driver.Driver(write_shards_config(tmp_path, shard_workers),
+                          verbose=False)
+        d.run(generate_report=False)
+        ls_paths = d.general['input1']
+        assert [(rpi.input_file_path, rpi.qc_num) for rpi in
+                d.report.items] == [(path, qc_num) for path in ls_paths
+                                    for qc_num in ['qc17', 'qc18', 'qc19']]
+        assert not any(isinstance(rpi, report.ErrorItem)
+                       for rpi in d.report.items)
+        # the workers cache the results of their chunk files
+        assert len(d.cache.entries()) == 3 * len(ls_paths)
+        ls_summaries.append([(rpi.input_file_path, rpi.qc_num, rpi.passed,
+                              str(rpi.extra), rpi.text)
+                             for rpi in d.report.items])
+    assert len(ls_paths) == 3
+    assert ls_summaries[0] == ls_summaries[1] == ls_summaries[2]
+    # the last run reused the results the workers cached
+    assert all(rpi.exec_time == 0 for rpi in d.report.items)
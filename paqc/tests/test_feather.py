@@ -0,0 +1,46 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.connectors import feather
+from paqc.utils.config_utils import config_open
+
+pytest.importorskip("pyarrow")
+
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+PATH_CSV = "paqc/tests/data/qc19_check2.csv"
+
+
+@pytest.mark.parametrize("columns", [None, ["index_dt", "pat_age"]])
+@pytest.mark.parametrize("compression", ["uncompressed", "lz4"])
+def test_read_feather_memory_map(tmp_path, compression, columns):
+    path = str(tmp_path / "qc19_check2.feather")
+    pd.read_csv(PATH_CSV).to_feather(path, compression=compression)
+    dict_config = copy.deepcopy(DICT_CONFIG_17TO19)
+    df = feather.read_feather(dict_config, path, columns)
+    dict_config['general']['memory_map'] = True
+    df_mapped = feather.read_feather(dict_config, path, columns)
+    pd.testing.assert_frame_equal(df_mapped, df)
+    pd.testing.assert_frame_equal(
+        df, csv.read_csv(DICT_CONFIG_17TO19, PATH_CSV, columns))
+
+
+def test_read_feather_memory_map_zero_copy(tmp_path):
+    import pyarrow as pa
+
+    path = str(tmp_path / "numeric.feather")
+    df = pd.DataFrame({'pat_age': np.arange(10 ** 6),
+                       'asthma_count': np.arange(10 ** 6) / 2})
+    # a single record batch, so the columns don't have to be concatenated
+    df.to_feather(path, compression="uncompressed", chunksize=len(df))
+    dict_config = copy.deepcopy(DICT_CONFIG_17TO19)
+    dict_config['general']['memory_map'] = True
+    allocated = pa.total_allocated_bytes()
+    df_mapped = feather.read_feather(dict_config, path)
+    pd.testing.assert_frame_equal(df_mapped, df)
+    # the columns are views on the file, nothing was read into memory
+    assert pa.total_allocated_bytes() - allocated < 1000
@@ -0,0 +1,34 @@
+import re
+
+import pytest
+
+from paqc.utils.feature_matcher import FeatureMatcher
+
+FEATURES = ['muscle_weakness_custom', 'ppp_diagnoses', 'mv_stroke',
+            'hypokalemic_periodic_paralysis', 'a', '', 'c_code']
+
+
+@pytest.mark.parametrize("patterns", [
+    ['muscle_weakness_custom', 'ppp'],
+    ['stroke', 'paralysis', 'weakness_custom', 'not_there'],
+    ['periodic_paralysis_long_pattern_longer_than_features'],
+    ['a'],
+    ['code', 'c_code', 'x'],
+])
+def test_feature_matcher(patterns):
+    # same features as the regex alternation for patterns without special
+    # characters
+    prog = re.compile("(" + ")|(".join(patterns) + ")")
+    assert FeatureMatcher(patterns).filter(FEATURES) == \
+        [feature for feature in FEATURES if prog.search(feature)]
+
+
+@pytest.mark.parametrize("patterns, features, expected", [
+    # patterns are literal, not regexes
+    (['a.c', 'd+'], ['abc', 'a.c', 'dd', 'd+'], ['a.c', 'd+']),
+    (['b(c)'], ['b_c_', 'b(c)x'], ['b(c)x']),
+    # no patterns match nothing
+    ([], ['abc'], []),
+])
+def test_feature_matcher_literal(patterns, features, expected):
+    assert FeatureMatcher(patterns).filter(features) == expected
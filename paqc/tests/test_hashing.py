@@ -0,0 +1,135 @@
+import hashlib
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.utils import hashing
+from paqc.utils import worker_pool
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG = config_open("paqc/tests/data/driver_dict_output.yml")[1]
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+
+
+def generate_mixed_df(n_rows, seed):
+    rnd = np.random.RandomState(seed)
+    return pd.DataFrame({
+        'patient_id': np.arange(n_rows),
+        'score': rnd.rand(n_rows),
+        'name': rnd.choice(['a', 'b', None], n_rows),
+        'index_dt': pd.Timestamp('2010-01-01') + pd.to_timedelta(
+            rnd.randint(0, 3000, n_rows), unit='D'),
+        'is_matched': rnd.rand(n_rows) < 0.5})
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 1000])
+@pytest.mark.parametrize("dict_config, path", [
+    (DICT_CONFIG_17TO19, "paqc/tests/data/qc17_check2.csv"),
+    (DICT_CONFIG_17TO19, "paqc/tests/data/qc19_check2.csv"),
+    (DICT_CONFIG, "paqc/tests/data/qc6_check2.csv"),
+])
+def test_hash_chunks(dict_config, path, chunksize):
+    # the dtypes of the chunks can differ from the ones of the whole file
+    hasher = hashing.FrameHasher()
+    for df_chunk in csv.read_csv_chunks(dict_config, path, chunksize):
+        hasher.update(df_chunk)
+    assert hasher.hexdigest() == hashing.hash_frame(
+        csv.read_csv(dict_config, path))
+
+
+def test_hash_frame(monkeypatch):
+    df = generate_mixed_df(100, 0)
+    df_hash = hashing.hash_frame(df)
+    monkeypatch.setattr(hashing, 'HASH_BLOCK_ROWS', 7)
+    assert hashing.hash_frame(df) == df_hash
+    with worker_pool.WorkerPool(2):
+        assert hashing.hash_frame(df, parallel=True) == df_hash
+    # the index isn't part of the data
+    assert hashing.hash_frame(df.set_index(df.index + 10)) == df_hash
+    assert hashing.hash_frame(df.rename(columns={'name': 'NAME'})) != df_hash
+    df.loc[50, 'score'] = np.nan
+    assert hashing.hash_frame(df) != df_hash
+
+
+def test_hash_frame_stable():
+    # the hash doesn't depend on the hash randomisation of the process
+    code = ("from paqc.tests.test_hashing import generate_mixed_df; "
+            "from paqc.utils import hashing; "
+            "print(hashing.hash_frame(generate_mixed_df(100, 0)))")
+    ls_hashes = []
+    for seed in ['1', '2']:
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        ls_hashes.append(subprocess.check_output(
+            [sys.executable, '-c', code], env=env).decode().strip())
+    assert ls_hashes == [hashing.hash_frame(generate_mixed_df(100, 0))] * 2
+
+
+@pytest.mark.parametrize("values, other_values", [
+    ([2 ** 53], [2 ** 53 + 1]),
+    ([2 ** 53 + 0.5, 1.5], [2 ** 53 + 0.5, 1.25]),
+    ([0.5], [np.float64(0.5).view(np.int64)]),
+    (pd.to_datetime(['2010-01-01']),
+     pd.to_datetime(['2010-01-01']) + pd.Timedelta(1, 'ns')),
+    (pd.to_datetime(['1960-01-01 00:00:00.5']).astype('datetime64[ms]'),
+     pd.to_datetime(['1960-01-01 00:00:00.25']).astype('datetime64[ms]')),
+])
+def test_hash_frame_lossless(values, other_values):
+    assert hashing.hash_frame(pd.DataFrame({'x': values})) != \
+        hashing.hash_frame(pd.DataFrame({'x': other_values}))
+
+
+@pytest.mark.parametrize("values, same_values", [
+    ([1, -2, 3], [1.0, -2.0, 3.0]),
+    (pd.array([1, None, 3], dtype='Int64'), [1.0, np.nan, 3.0]),
+    ([True, False], np.array([1, 0], dtype=np.int8)),
+    (pd.to_datetime(['2010-01-01 00:00:01', None]),
+     pd.to_datetime(['2010-01-01 00:00:01', None]).astype('datetime64[s]')),
+])
+def test_hash_frame_dtypes(values, same_values):
+    # equal values of different dtypes, e.g. in two chunks of a file
+    assert hashing.hash_frame(pd.DataFrame({'x': values})) == \
+        hashing.hash_frame(pd.DataFrame({'x': same_values}))
+
+
+@pytest.mark.parametrize("col, changed_value", [
+    ('patient_id', 1),
+    ('score', np.nan),
+    ('name', 'c'),
+    ('index_dt', pd.NaT),
+    ('is_matched', None),
+])
+def test_column_fingerprints(col, changed_value):
+    df = generate_mixed_df(100, 0)
+    ls_fingerprints = hashing.column_fingerprints(df)
+    assert hashing.column_fingerprints(df.copy()) == ls_fingerprints
+    with worker_pool.WorkerPool(2):
+        assert hashing.column_fingerprints(df, parallel=True) == \
+            ls_fingerprints
+
+    # only the fingerprint of the changed column changes
+    df_changed = df.copy()
+    if changed_value is None:
+        df_changed[col] = ~df_changed[col]
+    else:
+        df_changed.loc[10, col] = changed_value
+    changed = [fp != fp_changed for fp, fp_changed in
+               zip(ls_fingerprints, hashing.column_fingerprints(df_changed))]
+    assert changed == [c == col for c in df.columns]
+
+
+def test_file_hash(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, 'wb') as f:
+        f.write(b'a,b\n1,2\n')
+    assert hashing.file_hash(path) == hashlib.blake2b(
+        b'a,b\n1,2\n', digest_size=hashing.DIGEST_SIZE).hexdigest()
+    with open(path, 'ab') as f:
+        f.write(b'3,4\n')
+    assert hashing.file_hash(path) == hashlib.blake2b(
+        b'a,b\n1,2\n3,4\n', digest_size=hashing.DIGEST_SIZE).hexdigest()
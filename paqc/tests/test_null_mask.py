@@ -0,0 +1,62 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.utils import null_mask
+
+
+def generate_df(n_rows, seed):
+    rnd = np.random.RandomState(seed)
+    ss_float = rnd.rand(n_rows)
+    ss_float[rnd.rand(n_rows) < 0.3] = np.nan
+    ss_dt = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+        rnd.randint(0, 3000, n_rows), unit='h'))
+    ss_dt[rnd.rand(n_rows) < 0.3] = pd.NaT
+    ss_nullable = pd.Series(rnd.randint(0, 3, n_rows), dtype='Int64')
+    ss_nullable[rnd.rand(n_rows) < 0.3] = pd.NA
+    return pd.DataFrame({
+        'count': rnd.randint(0, 4, n_rows),
+        'flag': rnd.rand(n_rows) < 0.5,
+        'score': ss_float,
+        'no_score': np.nan,
+        'index_dt': ss_dt.astype('datetime64[us]'),
+        'nullable': ss_nullable,
+        'name': pd.Series(rnd.choice(['a', None], n_rows), dtype=object)})
+
+
+@pytest.mark.parametrize("ls_cols", [None, ['score', 'index_dt'], []])
+@pytest.mark.parametrize("df", [generate_df(0, 0), generate_df(1, 1),
+                                generate_df(13, 2), generate_df(200, 3)])
+def test_null_mask(df, ls_cols):
+    mask = null_mask.NullMask(df)
+    df_null = df.isnull() if ls_cols is None else df[ls_cols].isnull()
+    for colname in df_null.columns:
+        np.testing.assert_array_equal(mask.column(df, colname),
+                                      df_null[colname].to_numpy())
+    np.testing.assert_array_equal(mask.count(df, ls_cols),
+                                  df_null.sum().to_numpy())
+    np.testing.assert_array_equal(mask.column_all(df, ls_cols),
+                                  df_null.all(axis=0).to_numpy())
+    np.testing.assert_array_equal(mask.row_any(df, ls_cols),
+                                  df_null.any(axis=1).to_numpy())
+    np.testing.assert_array_equal(mask.row_all(df, ls_cols),
+                                  df_null.all(axis=1).to_numpy())
+    for start, stop in [(0, len(df)), (3, 11), (8, 200), (5, 6)]:
+        arr_block = mask.block(df, list(df_null.columns), start, stop)
+        assert arr_block.flags['F_CONTIGUOUS']
+        np.testing.assert_array_equal(arr_block,
+                                      df_null.iloc[start:stop].to_numpy())
+
+
+def test_pickle():
+    # the packed columns are left out, and packed again in the workers
+    df = generate_df(20, 0)
+    mask = null_mask.NullMask(df)
+    mask.row_any(df)
+    assert len(mask.packed_columns) == df.shape[1]
+    mask_pickled = pickle.loads(pickle.dumps(mask))
+    assert mask_pickled.packed_columns == dict()
+    np.testing.assert_array_equal(mask_pickled.row_any(df),
+                                  df.isnull().any(axis=1).to_numpy())
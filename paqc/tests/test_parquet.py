@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.utils.config_utils import config_open
+
+parquet = pytest.importorskip("paqc.connectors.parquet")
+pytest.importorskip("pyarrow")
+
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+
+
+@pytest.fixture
+def path_parquet(tmp_path):
+    # same data as the csv file, with the dates as strings, in row groups of
+    # two rows
+    path = str(tmp_path / "qc19_check2.parquet")
+    pd.read_csv("paqc/tests/data/qc19_check2.csv").to_parquet(
+        path, row_group_size=2)
+    return path
+
+
+def test_read_parquet(path_parquet):
+    df_csv = csv.read_csv(DICT_CONFIG_17TO19,
+                          "paqc/tests/data/qc19_check2.csv")
+    assert parquet.read_parquet_columns(path_parquet) == df_csv.columns.tolist()
+    pd.testing.assert_frame_equal(
+        parquet.read_parquet(DICT_CONFIG_17TO19, path_parquet), df_csv)
+
+
+@pytest.mark.parametrize("columns", [["pat_gender_cd"],
+                                     ["index_dt", "patient_id"]])
+def test_read_parquet_columns(path_parquet, columns):
+    df = parquet.read_parquet(DICT_CONFIG_17TO19, path_parquet)
+    pd.testing.assert_frame_equal(
+        parquet.read_parquet(DICT_CONFIG_17TO19, path_parquet, columns),
+        df[columns])
+
+
+@pytest.mark.parametrize("columns", [None, ["index_dt"]])
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 1000])
+def test_read_parquet_chunks(path_parquet, chunksize, columns):
+    df = parquet.read_parquet(DICT_CONFIG_17TO19, path_parquet, columns)
+    ls_chunks = list(parquet.read_parquet_chunks(
+        DICT_CONFIG_17TO19, path_parquet, chunksize, columns))
+    assert all(len(df_chunk) <= chunksize for df_chunk in ls_chunks)
+    pd.testing.assert_frame_equal(pd.concat(ls_chunks), df,
+                                  check_index_type=False)
@@ -0,0 +1,65 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import parse_utils
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+DATE_FORMAT = DICT_CONFIG_17TO19['general']['date_format']
+
+
+def generate_wide_df(n_rows, n_numeric_cols):
+    # many numeric columns and two string date columns
+    rnd = np.random.RandomState(0)
+    df = pd.DataFrame(rnd.rand(n_rows, n_numeric_cols),
+                      columns=['x%d_count' % i for i in range(n_numeric_cols)])
+    df['patient_id'] = np.arange(n_rows)
+    ss_dates = pd.Series(pd.Timestamp('2010-01-01') + pd.to_timedelta(
+        rnd.randint(0, 3000, n_rows), unit='D')).dt.strftime(DATE_FORMAT)
+    df['index_dt'] = ss_dates.astype(object)
+    df['lookback_dt'] = ss_dates.astype(object)
+    return df
+
+
+@pytest.mark.parametrize("inplace", [False, True])
+def test_check_dates(inplace):
+    df = generate_wide_df(100, 5)
+    df_original = df.copy()
+    df_expected = df.copy()
+    for date_col in ['index_dt', 'lookback_dt']:
+        df_expected[date_col] = pd.to_datetime(df[date_col],
+                                               format=DATE_FORMAT)
+    df_checked = parse_utils.check_dates(DICT_CONFIG_17TO19, df)
+    pd.testing.assert_frame_equal(df_checked, df_expected)
+    df_checked = parse_utils.check_dates(DICT_CONFIG_17TO19, df, inplace)
+    pd.testing.assert_frame_equal(df_checked, df_expected)
+    if inplace:
+        assert df_checked is df
+    else:
+        pd.testing.assert_frame_equal(df, df_original)
+    # nothing to convert anymore
+    assert parse_utils.check_dates(DICT_CONFIG_17TO19, df_checked) is \
+        df_checked
+
+
+@pytest.mark.parametrize("inplace", [False, True])
+def test_check_dates_memory(inplace):
+    df = generate_wide_df(100000, 50)
+    nbytes_numeric = df.select_dtypes('number').memory_usage(
+        index=False).sum()
+    tracemalloc.start()
+    try:
+        df_checked = parse_utils.check_dates(DICT_CONFIG_17TO19, df, inplace)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # only the two datetime columns and temporary arrays of the size of a
+    # column are allocated, the numeric columns aren't copied
+    nbytes_date_cols = df_checked[['index_dt', 'lookback_dt']].memory_usage(
+        index=False).sum()
+    assert peak < nbytes_numeric / 5
+    assert current < 2 * nbytes_date_cols
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+import paqc.qc_functions as qcs_main
+
+
+def test_qc_index_matches_import_submodules():
+    qc_functions = qcs_main.import_submodules(qcs_main)
+    registry = qcs_main.QCRegistry(qcs_main)
+    assert set(registry) == set(qc_functions)
+    for qc_num, qc_function in qc_functions.items():
+        assert registry[qc_num] is qc_function
+
+
+def test_qc_registry_is_lazy():
+    # fresh interpreter, so no QC collection is imported yet
+    snippet = ("import sys\n"
+               "import paqc.qc_functions as qcs_main\n"
+               "qcs_main.QCRegistry(qcs_main)['qc4']\n"
+               "print(sorted(name for name in sys.modules\n"
+               "             if name.startswith('paqc.qc_functions.')))\n")
+    output = subprocess.run([sys.executable, '-c', snippet],
+                            stdout=subprocess.PIPE, check=True).stdout
+    assert output.decode().strip() == \
+           "['paqc.qc_functions.qcs_all_data_1to13']"
@@ -1,6 +1,13 @@
+import copy
+import re
+
+import pandas as pd
 import pytest
+import yaml
 
 from paqc.connectors import csv
+from paqc.driver import driver
+from paqc.utils import hashing
 from paqc.utils.config_utils import config_open
 
 DICT_CONFIG_9TO13 = config_open(
@@ -95,3 +102,70 @@ def test_qc50(df_old, df_new, expected, ls_faults, dict_config):
     rpi = qc50(df_old, df_new, dict_config, dict_config['qc']['qc_params'][
         'max_fraction_diff'])
     assert (rpi.passed == expected) & (rpi.extra == ls_faults)
+
+
+def add_fingerprints(dict_config, df_old, df_new):
+    # the fingerprints the Driver adds to the config of the comparison QCs
+    dict_config = dict(dict_config)
+    dict_config['column_fingerprints'] = [
+        pd.Series(hashing.column_fingerprints(df), index=df.columns, dtype=object)
+        for df in (df_old, df_new)]
+    return dict_config
+
+
+# 48 and 49 on the columns whose fingerprints differ
+@pytest.mark.parametrize("dict_config", [DICT_CONFIG_48])
+@pytest.mark.parametrize("df_old", [csv.read_csv(DICT_CONFIG_48,
+                                    "paqc/tests/data/suite2_df_old.csv")])
+@pytest.mark.parametrize("df_new", [
+    csv.read_csv(DICT_CONFIG_48, "paqc/tests/data/qc48_check1.csv"),
+    csv.read_csv(DICT_CONFIG_48, "paqc/tests/data/qc48_check2.csv"),
+    csv.read_csv(DICT_CONFIG_48, "paqc/tests/data/qc48_check3.csv"),
+    csv.read_csv(DICT_CONFIG_48, "paqc/tests/data/qc50_check3.csv"),
+])
+def test_compare_fingerprints(df_old, df_new, dict_config):
+    ls_colnames = dict_config['qc']['qc_params']['ls_colnames']
+    dict_config_fp = add_fingerprints(dict_config, df_old, df_new)
+    rpi = qc48(df_old, df_new, dict_config, ls_colnames)
+    rpi_fp = qc48(df_old, df_new, dict_config_fp, ls_colnames)
+    assert (rpi_fp.passed, rpi_fp.extra) == (rpi.passed, rpi.extra)
+    try:
+        df_summary = qc49(df_old, df_new, dict_config).extra
+    # frames without changes, or not identically-labeled
+    except ValueError as e:
+        with pytest.raises(ValueError, match=re.escape(str(e))):
+            qc49(df_old, df_new, dict_config_fp)
+    else:
+        pd.testing.assert_frame_equal(
+            qc49(df_old, df_new, dict_config_fp).extra, df_summary)
+
+    # columns with the same fingerprints aren't compared value by value
+    dict_config_fp['column_fingerprints'][1] = \
+        dict_config_fp['column_fingerprints'][0]
+    assert qc48(df_old, df_new, dict_config_fp, ls_colnames).passed
+
+
+def test_compare_driver(tmp_path):
+    general = copy.deepcopy(DICT_CONFIG_48['general'])
+    general['input1'] = "paqc/tests/data/suite2_df_old.csv"
+    general['input2'] = "paqc/tests/data/qc48_check2.csv"
+    general['output_dir'] = str(tmp_path)
+    qcs = [dict(DICT_CONFIG_48['qc'], input_file=['input1', 'input2']),
+           {'qc_num': 'qc49', 'input_file': ['input1', 'input2'],
+            'level': 'info'}]
+    for qc in qcs:
+        qc.pop('input_file_path', None)
+    config_path = str(tmp_path / 'config.yml')
+    with open(config_path, 'w') as f:
+        yaml.safe_dump({'general': general, 'qcs': qcs}, f)
+
+    d = driver.Driver(config_path, verbose=False, to_hash=True,
+                      use_cache=False)
+    d.run(generate_report=False)
+    rpi48, rpi49 = d.report.items
+    assert (rpi48.passed, rpi48.extra) == (False, ['A_first_exp_dt',
+                                                   'A_count'])
+    assert rpi49.passed and 'A_count' in rpi49.extra.index
+    df_old = csv.read_csv(d.config, general['input1'])
+    assert rpi48.data_hash.startswith("input1: %s\n" %
+                                      hashing.hash_frame(df_old))
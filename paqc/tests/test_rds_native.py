@@ -0,0 +1,176 @@
+import copy
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.connectors import rds
+from paqc.connectors import rds_native
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+
+
+def generate_columns_df():
+    return pd.DataFrame({
+        'pat_age': [0, 76, 56],
+        'score': [1.5, np.nan, 3.],
+        'is_matched': [True, False, True],
+        'pat_gender_cd': ['F', None, 'Grüße'],
+        'index_dt': pd.to_datetime(['2010-01-01', None,
+                                    '2012-03-04']).as_unit('s'),
+        'lookback_dt': pd.to_datetime(['2010-01-01 05:00', None,
+                                       '2012-03-04 00:00']).as_unit('s'),
+        'region': pd.Categorical(['north', None, 'south'])})
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("version", [2, 3])
+def test_write_read_rds_file(tmp_path, version, compress):
+    path = str(tmp_path / "df.rds")
+    df = generate_columns_df()
+    rds_native.write_rds_file(df, path, version, compress)
+    pd.testing.assert_frame_equal(rds_native.read_rds_file(path), df,
+                                  check_dtype=False)
+
+
+def test_read_rds_file_missing_values(tmp_path):
+    # R has missing values for integers and logicals, they become floats
+    # and objects as with read_csv
+    writer = rds_native.RDSWriter()
+    writer.write_header()
+    writer.write_int(rds_native.VECSXP | rds_native.IS_OBJECT_BIT |
+                     rds_native.HAS_ATTR_BIT)
+    writer.write_int(2)
+    writer.write_vector(rds_native.INTSXP, [1, rds_native.NA_INTEGER])
+    writer.write_vector(rds_native.LGLSXP, [rds_native.NA_INTEGER, 0])
+    writer.write_attrs([
+        ('names', (rds_native.STRSXP, ['count', 'flag'])),
+        ('class', (rds_native.STRSXP, ['data.frame'])),
+        ('row.names', (rds_native.STRSXP, ['a', 'b']))])
+    path = str(tmp_path / "df.rds")
+    with gzip.open(path, 'wb') as f:
+        f.write(b''.join(writer.parts))
+    df = rds_native.read_rds_file(path)
+    pd.testing.assert_frame_equal(df, pd.DataFrame(
+        {'count': [1., np.nan], 'flag': [np.nan, False]},
+        index=['a', 'b']), check_index_type=False)
+
+
+def write_altrep(writer, altrep_class, sexptype, write_state, attrs=()):
+    """
+    Writes an ALTREP object as R's serialize does: its class, package and
+    type, its state and its attributes.
+    """
+    writer.write_int(rds_native.ALTREP_SXP)
+    # info: pairlist of the class, package and type
+    writer.write_int(rds_native.LISTSXP)
+    writer.write_symbol(altrep_class)
+    writer.write_int(rds_native.LISTSXP)
+    writer.write_symbol('base')
+    writer.write_int(rds_native.LISTSXP)
+    writer.write_vector(rds_native.INTSXP, [sexptype])
+    writer.write_int(rds_native.NILVALUE_SXP)
+    write_state()
+    if attrs:
+        writer.write_attrs(attrs)
+    else:
+        writer.write_int(rds_native.NILVALUE_SXP)
+
+
+def write_wrapper_state(writer, write_wrapped):
+    # CONS(wrapped vector, metadata), the metadata is the cdr: whether the
+    # vector is sorted and has no NAs
+    writer.write_int(rds_native.LISTSXP)
+    write_wrapped()
+    writer.write_vector(rds_native.INTSXP, [rds_native.NA_INTEGER, 0])
+
+
+def test_read_rds_file_altrep(tmp_path):
+    # data.frame(id=1:4, code=as.character(c(10L, NA, 30L, 40L)), ...) as
+    # R 3.5+ serializes it: compact sequence, deferred strings, and the
+    # wrappers of vectors that R knows are sorted or without NAs, e.g. the
+    # outputs of sort(), one around a compact sequence and one around the
+    # codes of a factor, which keeps its attributes
+    writer = rds_native.RDSWriter()
+    writer.write_header()
+    writer.write_int(rds_native.VECSXP | rds_native.IS_OBJECT_BIT |
+                     rds_native.HAS_ATTR_BIT)
+    writer.write_int(7)
+    write_altrep(writer, 'compact_intseq', rds_native.INTSXP,
+                 lambda: writer.write_vector(rds_native.REALSXP,
+                                             [4., 1., 1.]))
+
+    def write_deferred_state():
+        writer.write_int(rds_native.LISTSXP)
+        writer.write_vector(rds_native.INTSXP,
+                            [10, rds_native.NA_INTEGER, 30, 40])
+        writer.write_vector(rds_native.INTSXP, [1])
+
+    write_altrep(writer, 'deferred_string', rds_native.STRSXP,
+                 write_deferred_state)
+    write_altrep(writer, 'wrap_real', rds_native.REALSXP,
+                 lambda: write_wrapper_state(writer, lambda: (
+                     writer.write_vector(rds_native.REALSXP,
+                                         [0.5, 1.5, np.nan, 3.]))))
+    write_altrep(writer, 'wrap_string', rds_native.STRSXP,
+                 lambda: write_wrapper_state(writer, lambda: (
+                     writer.write_vector(rds_native.STRSXP,
+                                         ['a', 'b', None, 'd']))))
+    write_altrep(writer, 'wrap_integer', rds_native.INTSXP,
+                 lambda: write_wrapper_state(writer, lambda: (
+                     writer.write_vector(rds_native.INTSXP,
+                                         [1, 2, 3, rds_native.NA_INTEGER]))))
+    write_altrep(writer, 'wrap_integer', rds_native.INTSXP,
+                 lambda: write_wrapper_state(writer, lambda: write_altrep(
+                     writer, 'compact_intseq', rds_native.INTSXP,
+                     lambda: writer.write_vector(rds_native.REALSXP,
+                                                 [4., 5., 1.]))))
+    write_altrep(writer, 'wrap_integer', rds_native.INTSXP,
+                 lambda: write_wrapper_state(writer, lambda: (
+                     writer.write_vector(rds_native.INTSXP,
+                                         [1, 1, 2, rds_native.NA_INTEGER]))),
+                 [('levels', (rds_native.STRSXP, ['north', 'south'])),
+                  ('class', (rds_native.STRSXP, ['factor']))])
+    writer.write_attrs([
+        ('names', (rds_native.STRSXP, ['id', 'code', 'score', 'name',
+                                       'count', 'seq', 'region'])),
+        ('class', (rds_native.STRSXP, ['data.frame'])),
+        ('row.names', (rds_native.INTSXP, [rds_native.NA_INTEGER, -4]))])
+    path = str(tmp_path / "df.rds")
+    with open(path, 'wb') as f:
+        f.write(b''.join(writer.parts))
+    pd.testing.assert_frame_equal(
+        rds_native.read_rds_file(path),
+        pd.DataFrame({'id': [1, 2, 3, 4], 'code': ['10', None, '30', '40'],
+                      'score': [0.5, 1.5, np.nan, 3.],
+                      'name': ['a', 'b', None, 'd'],
+                      'count': [1., 2., 3., np.nan], 'seq': [5, 6, 7, 8],
+                      'region': pd.Categorical(['north', 'north', 'south',
+                                                None])}),
+        check_dtype=False)
+
+
+def test_read_rds_file_not_dataframe(tmp_path):
+    writer = rds_native.RDSWriter()
+    writer.write_header()
+    writer.write_vector(rds_native.REALSXP, [1., 2.])
+    path = str(tmp_path / "vector.rds")
+    with open(path, 'wb') as f:
+        f.write(b''.join(writer.parts))
+    with pytest.raises(ValueError):
+        rds_native.read_rds_file(path)
+
+
+def test_read_rds_native(tmp_path):
+    # same as the csv connector, the dates are parsed with the date format
+    path_csv = "paqc/tests/data/qc19_check2.csv"
+    path = str(tmp_path / "qc19_check2.rds")
+    rds_native.write_rds_file(pd.read_csv(path_csv), path)
+    dict_config = copy.deepcopy(DICT_CONFIG_17TO19)
+    dict_config['general']['rds_reader'] = 'native'
+    pd.testing.assert_frame_equal(rds.read_rds(dict_config, path),
+                                  csv.read_csv(dict_config, path_csv))
@@ -0,0 +1,158 @@
+import copy
+import os
+import shutil
+
+import pytest
+import yaml
+
+from paqc.driver import driver
+from paqc.driver import executor
+from paqc.report import report
+from paqc.utils import result_cache
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+
+
+def write_config(tmp_path, input_path, date_limit="01/02/2009 05:00"):
+    general = copy.deepcopy(DICT_CONFIG_17TO19['general'])
+    general['input1'] = str(input_path)
+    del general['input2']
+    general['output_dir'] = str(tmp_path / 'output')
+    qcs = [{'qc_num': 'qc17', 'input_file': 'input1', 'level': 'error'},
+           {'qc_num': 'qc19', 'input_file': 'input1', 'level': 'error',
+            'qc_params': {'date_limit': date_limit}}]
+    config_path = tmp_path / 'config.yml'
+    with open(config_path, 'w') as f:
+        yaml.safe_dump({'general': general, 'qcs': qcs}, f)
+    return str(config_path)
+
+
+def run_driver(config_path, monkeypatch, use_cache=True):
+    """
+    :return: The report items of the run and the qc_nums it executed.
+    """
+    executed = []
+    run_qcs = executor.run_qcs
+
+    def counting_run_qcs(tasks, *args, **kwargs):
+        executed.extend(task[1]['qc']['qc_num'] for task in tasks)
+        return run_qcs(tasks, *args, **kwargs)
+
+    monkeypatch.setattr(executor, 'run_qcs', counting_run_qcs)
+    d = driver.Driver(config_path, verbose=False, use_cache=use_cache)
+    d.run(generate_report=False)
+    return d.report.items, executed
+
+
+def summarise(rpis):
+    return [(rpi.qc_num, rpi.passed, rpi.level, str(rpi.extra), rpi.text)
+            for rpi in rpis]
+
+
+def test_driver_cache(tmp_path, monkeypatch):
+    input_path = tmp_path / 'qc17_check2.csv'
+    shutil.copy("paqc/tests/data/qc17_check2.csv", input_path)
+    config_path = write_config(tmp_path, input_path)
+
+    rpis, executed = run_driver(config_path, monkeypatch)
+    assert executed == ['qc17', 'qc19']
+    rpis_cached, executed = run_driver(config_path, monkeypatch)
+    assert executed == []
+    assert not any(isinstance(rpi, report.ErrorItem) for rpi in rpis)
+    assert summarise(rpis_cached) == summarise(rpis)
+    assert [rpi.input_file_path for rpi in rpis_cached] == \
+        [str(input_path)] * 2
+    _, executed = run_driver(config_path, monkeypatch, use_cache=False)
+    assert executed == ['qc17', 'qc19']
+
+    # only the QC whose params changed is executed again
+    config_path = write_config(tmp_path, input_path, "01/02/2010 05:00")
+    _, executed = run_driver(config_path, monkeypatch)
+    assert executed == ['qc19']
+
+    # all QCs are executed again once the input file changed
+    with open(input_path, 'a') as f:
+        f.write(open(input_path).readlines()[-1])
+    _, executed = run_driver(config_path, monkeypatch)
+    assert executed == ['qc17', 'qc19']
+
+
+def test_driver_cache_errors(tmp_path, monkeypatch):
+    # the QCs that errored, e.g. because their input couldn't be loaded, are
+    # executed again in the next run
+    input_path = tmp_path / 'qc17_check2.csv'
+    shutil.copy("paqc/tests/data/qc17_check2.csv", input_path)
+    config_path = write_config(tmp_path, input_path)
+
+    with monkeypatch.context() as m:
+        m.setattr(driver.Driver, 'data_loader',
+                  lambda self, input_file_path, columns=None: None)
+        rpis, executed = run_driver(config_path, m)
+    assert executed == ['qc17', 'qc19']
+    assert all(isinstance(rpi, report.ErrorItem) for rpi in rpis)
+    rpis, executed = run_driver(config_path, monkeypatch)
+    assert executed == ['qc17', 'qc19']
+    assert not any(isinstance(rpi, report.ErrorItem) for rpi in rpis)
+    _, executed = run_driver(config_path, monkeypatch)
+    assert executed == []
+
+
+@pytest.mark.parametrize("argument, change", [
+    ('qc', {'qc_params': {'date_limit': "01/02/2010 05:00"}}),
+    ('qc', {'level': 'warning'}),
+    ('general', {'date_format': "%d/%m/%Y"}),
+    ('input_fingerprint', 'other'),
+    ('to_hash', True),
+])
+def test_qc_key(argument, change):
+    qc = {'qc_num': 'qc17', 'input_file': 'input1', 'level': 'error',
+          'qc_params': {'date_limit': "01/02/2009 05:00"}}
+    general = copy.deepcopy(DICT_CONFIG_17TO19['general'])
+    key = result_cache.qc_key('fingerprint', qc, general)
+
+    # the options of the execution and the paths of the input don't matter
+    general_run = dict(general, input1='other.csv', executor='processes',
+                       chunksize=10, output_dir='other')
+    qc_run = dict(qc, input_file_path='other.csv', data_hash='None')
+    assert result_cache.qc_key('fingerprint', qc_run, general_run) == key
+
+    kwargs = {'input_fingerprint': 'fingerprint', 'qc': qc,
+              'general': general, 'to_hash': False}
+    if isinstance(change, dict):
+        change = dict(kwargs[argument], **change)
+    kwargs[argument] = change
+    assert result_cache.qc_key(**kwargs) != key
+
+
+def test_qc_key_files(tmp_path):
+    # the clinical code files are fingerprinted by their contents
+    code_path = tmp_path / 'ICD.csv'
+    shutil.copy(DICT_CONFIG_17TO19['general']['ICD_file'], code_path)
+    general = dict(DICT_CONFIG_17TO19['general'], ICD_file=str(code_path))
+    qc = {'qc_num': 'qc17', 'level': 'error'}
+    key = result_cache.qc_key('fingerprint', qc, general)
+    with open(code_path, 'a') as f:
+        f.write("\n")
+    assert result_cache.qc_key('fingerprint', qc, general) != key
+
+
+def test_evict(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path), max_mb=1)
+    rpi = report.ReportItem(passed=False, level='error', qc_num='qc1',
+                            input_file='input1', input_file_path='a.csv',
+                            extra=['x' * 2 ** 17])
+    for i in range(12):
+        cache.put('key%d' % i, rpi)
+        os.utime(cache.entry_path('key%d' % i), (i, i))
+    # reading an entry marks it as recently used
+    assert vars(cache.get('key0')) == vars(rpi)
+
+    assert cache.evict() > 0
+    assert sum(size for _, size, _ in cache.entries()) <= 2 ** 20
+    assert cache.get('key0') is not None
+    assert cache.get('key1') is None
+    assert cache.get('key11') is not None
+    cache.clear()
+    assert cache.entries() == []
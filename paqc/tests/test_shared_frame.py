@@ -0,0 +1,93 @@
+import copy
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import csv
+from paqc.driver import executor
+from paqc.qc_functions.qcs_all_data_1to13 import qc1, qc3, qc4, qc7, qc8
+from paqc.utils import shared_frame, worker_pool
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_1TO8 = config_open("paqc/tests/data/driver_dict_output.yml")[1]
+
+DF_MIXED = pd.DataFrame({
+    'patient_id': np.arange(5, dtype=np.int64),
+    'score': [0.5, np.nan, 1.5, 2., 0.],
+    'flag': [True, False, True, True, False],
+    'index_dt': pd.to_datetime(['2015-01-01', None, '2016-02-03',
+                                '2017-04-05', '2018-06-07']),
+    'GENDER': ['M', 'F', None, 'M', 'F'],
+}, index=[10, 11, 12, 13, 14])
+
+
+def test_shared_frame():
+    with shared_frame.SharedFrame(DF_MIXED) as frame:
+        handle = frame.handle
+        assert [placement is not None for placement in handle.layout] == \
+            [True, True, True, True, False]
+        df = handle.attach()
+        pd.testing.assert_frame_equal(df, DF_MIXED)
+        # read-only views
+        with pytest.raises(ValueError):
+            df['score'].values[0] = 1.
+        df_subset = handle.subset([4, 3]).attach()
+        pd.testing.assert_frame_equal(df_subset,
+                                      DF_MIXED[['GENDER', 'index_dt']])
+        del df, df_subset
+        handle.detach()
+
+
+def is_null(ss):
+    return ss.isnull()
+
+
+def test_shared_frame_duplicates():
+    # the columns are placed by position, duplicate names don't lose columns
+    df_dup = DF_MIXED.copy()
+    df_dup.columns = ['score', 'score', 'GENDER', 'index_dt', 'GENDER']
+    with shared_frame.SharedFrame(df_dup) as frame:
+        df = frame.handle.attach()
+        pd.testing.assert_frame_equal(df, df_dup)
+        df_subset = frame.handle.subset([4, 0, 2]).attach()
+        pd.testing.assert_frame_equal(df_subset, df_dup.iloc[:, [4, 0, 2]])
+        del df, df_subset
+        frame.handle.detach()
+    with worker_pool.WorkerPool(2, 1) as pool:
+        pd.testing.assert_frame_equal(
+            pool.map_columns(is_null, df_dup),
+            df_dup.isnull())
+
+
+def date_diff_days(ss):
+    return (ss - pd.Timestamp('2015-01-01')).dt.days
+
+
+@pytest.mark.parametrize("batch_cells", [1, 1000])
+def test_map_columns_shared(batch_cells):
+    df = pd.DataFrame({'index_dt': DF_MIXED['index_dt'],
+                       'lookback_dt': DF_MIXED['index_dt'] -
+                       pd.Timedelta(days=3)})
+    with worker_pool.WorkerPool(2, batch_cells) as pool:
+        pd.testing.assert_frame_equal(pool.map_columns(date_diff_days, df),
+                                      df.apply(date_diff_days))
+
+
+@pytest.mark.parametrize("df", [
+    csv.read_csv(DICT_CONFIG_1TO8, "paqc/tests/data/qc4_check2.csv")
+])
+def test_run_qcs_spawn(df, monkeypatch):
+    # without fork, the workers get the DataFrame through shared memory
+    monkeypatch.setattr(executor, '_get_mp_context',
+                        lambda: multiprocessing.get_context('spawn'))
+    tasks = []
+    for qc_function in [qc1, qc3, qc4, qc7, qc8]:
+        qc_config = copy.deepcopy(DICT_CONFIG_1TO8)
+        qc_config['qc']['qc_num'] = qc_function.__name__
+        tasks.append((qc_function, qc_config, dict()))
+    rpis_serial = executor.run_qcs(tasks, df)
+    rpis = executor.run_qcs(tasks, df, executor='processes', workers=2)
+    assert [(rpi.qc_num, rpi.passed, rpi.extra) for rpi in rpis] == \
+        [(rpi.qc_num, rpi.passed, rpi.extra) for rpi in rpis_serial]
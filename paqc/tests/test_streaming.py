@@ -0,0 +1,52 @@
+import copy
+
+import pytest
+
+from paqc.connectors import csv
+from paqc.driver import executor
+from paqc.qc_functions.qcs_all_data_1to13 import qc1, qc4, qc6, qc7, qc8
+from paqc.qc_functions.qcs_all_data_others import qc14, qc17, qc18, qc19
+from paqc.qc_functions.qcs_CS02 import qc26
+from paqc.qc_functions.qcs_flagprop import qc41
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG = config_open("paqc/tests/data/driver_dict_output.yml")[1]
+DICT_CONFIG_17TO19 = config_open(
+                        "paqc/tests/data/qc17to19_driver_dict_output.yml")[1]
+DICT_CONFIG_CS02 = config_open("paqc/tests/data/driver_dict_output_CS02.yml")[1]
+DICT_CONFIG_FLAGPROP = config_open(
+    "paqc/tests/data/driver_dict_output_flagprop.yml")[1]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 1000])
+@pytest.mark.parametrize("qc_function, dict_config, path, qc_params", [
+    (qc1, DICT_CONFIG, "paqc/tests/data/qc1_check2.csv", {}),
+    (qc4, DICT_CONFIG, "paqc/tests/data/qc4_check2.csv", {}),
+    (qc4, DICT_CONFIG, "paqc/tests/data/qc4_check3.csv", {}),
+    (qc4, DICT_CONFIG, "paqc/tests/data/qc4_check4.csv", {}),
+    (qc6, DICT_CONFIG, "paqc/tests/data/qc6_check2.csv", {}),
+    (qc6, DICT_CONFIG, "paqc/tests/data/qc6_check3.csv", {}),
+    (qc7, DICT_CONFIG, "paqc/tests/data/qc7_check2.csv", {}),
+    (qc8, DICT_CONFIG, "paqc/tests/data/qc8_check2.csv", {}),
+    (qc14, DICT_CONFIG, "paqc/tests/data/qc14_check2.csv", {}),
+    (qc17, DICT_CONFIG_17TO19, "paqc/tests/data/qc17_check2.csv", {}),
+    (qc18, DICT_CONFIG_17TO19, "paqc/tests/data/qc18_check2.csv", {}),
+    (qc19, DICT_CONFIG_17TO19, "paqc/tests/data/qc19_check2.csv",
+     {'date_limit': '01/02/2009 05:00'}),
+    # misformatted date_limit, fails without checking rows
+    (qc19, DICT_CONFIG_17TO19, "paqc/tests/data/qc19_check2.csv",
+     {'date_limit': '2009-01-01'}),
+    (qc26, DICT_CONFIG_CS02, "paqc/tests/data/qc26_check2.csv",
+     {'diseasefirstexp_col': 'disease_frst_exp_dt'}),
+    (qc41, DICT_CONFIG_FLAGPROP, "paqc/tests/data/qc41_check2.csv", {}),
+])
+def test_streaming_qc(qc_function, dict_config, path, qc_params, chunksize):
+    dict_config = copy.deepcopy(dict_config)
+    dict_config['qc']['qc_num'] = qc_function.__name__
+    rpi = qc_function(csv.read_csv(dict_config, path), dict_config,
+                      **qc_params)
+    rpi_streamed = executor.run_streaming_qcs(
+        [(qc_function, dict_config, qc_params)],
+        csv.read_csv_chunks(dict_config, path, chunksize))[0]
+    assert (rpi_streamed.passed == rpi.passed) & \
+           (rpi_streamed.extra == rpi.extra) & (rpi_streamed.text == rpi.text)
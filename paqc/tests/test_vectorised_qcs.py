@@ -0,0 +1,170 @@
+"""
+Compares the vectorised QCs against the per-feature implementations they
+replaced, on generated data.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.qc_functions.qcs_all_data_1to13 import qc12
+from paqc.qc_functions.qcs_flagprop import qc40
+from paqc.utils import column_profile
+from paqc.utils import null_mask
+from paqc.utils import utils
+from paqc.utils.config_utils import config_open
+
+DICT_CONFIG_9TO13 = config_open(
+    "paqc/tests/data/qc9to13_driver_dict_output.yml")[1]
+DICT_CONFIG_FLAGPROP = config_open(
+    "paqc/tests/data/driver_dict_output_flagprop.yml")[1]
+DICT_PREFIX = {'CPT': 'C', 'GPI6': 'G', 'GPI-10': 'G', 'ICD9': 'D',
+               'HCPC': 'H', 'Specialty': 'S', 'ICD10': 'D'}
+
+
+def generate_features_df(n_rows, n_feats, p_missing, seed):
+    # the flag, count, first and last exp date columns of n_feats features,
+    # each feature is missing or zero on a fraction of the rows and a few
+    # single values are missing on top of that
+    rnd = np.random.RandomState(seed)
+    dict_cols = dict()
+    for i in range(n_feats):
+        missing = rnd.rand(n_rows) < 0.5
+        count = rnd.randint(1, 5, n_rows).astype(float)
+        dates = pd.Series(pd.Timestamp('2015-01-01') + pd.to_timedelta(
+            rnd.randint(0, 1000, n_rows), unit='D'))
+        # features have 1 to 4 columns
+        dict_cols['pred%d_flag' % i] = np.where(missing, 0, 1)
+        if i % 4 > 0:
+            dict_cols['pred%d_count' % i] = np.where(missing, np.nan, count)
+        if i % 4 > 1:
+            dict_cols['pred%d_first_exp_dt' % i] = dates.where(~missing)
+        if i % 4 > 2:
+            dict_cols['pred%d_last_exp_dt' % i] = dates.where(~missing)
+    df = pd.DataFrame(dict_cols)
+    for colname in df.columns:
+        df.loc[rnd.rand(n_rows) < p_missing, colname] = np.nan
+    return df
+
+
+def qc12_per_feature(df, dict_config):
+    dict_grouped_cols = utils.generate_dict_grouped_columns(
+        df, dict_config, ['first_exp_date_cols', 'last_exp_date_cols',
+                          'count_cols', 'freq_cols', 'flag_cols'])
+    ls_features_faulty = []
+    for feat, dict_feat in dict_grouped_cols.items():
+        df_feat = df[list(dict_feat.values())].apply(utils.is_zero_or_null)
+        if df_feat.sum(axis=1).between(0, len(dict_feat),
+                                       inclusive='neither').any():
+            ls_features_faulty.append(feat)
+    return ls_features_faulty
+
+
+@pytest.mark.parametrize("use_mask", [False, True])
+@pytest.mark.parametrize("n_rows, n_feats, p_missing, seed", [
+    (50, 20, 0, 1),
+    (50, 20, 0.005, 2),
+    (500, 40, 0.001, 3),
+])
+def test_qc12_vectorised(n_rows, n_feats, p_missing, seed, use_mask):
+    df = generate_features_df(n_rows, n_feats, p_missing, seed)
+    ls_expected = qc12_per_feature(df, DICT_CONFIG_9TO13)
+    dict_config = DICT_CONFIG_9TO13
+    if use_mask:
+        dict_config = dict(DICT_CONFIG_9TO13,
+                           null_mask=null_mask.NullMask(df))
+    rpi = qc12(df, dict_config)
+    assert rpi.passed == (not ls_expected)
+    assert (rpi.extra or []) == ls_expected
+
+
+def test_qc12_no_rows():
+    df = generate_features_df(0, 3, 0, 0)
+    assert qc12(df, DICT_CONFIG_9TO13).passed
+
+
+def generate_codes_df(n_rows, seed):
+    # codes with the right or a wrong prefix, a known or unknown metric type,
+    # and too few or too many underscores
+    rnd = np.random.RandomState(seed)
+    ls_categories = list(DICT_PREFIX.keys())
+    ls_prefixes = list(DICT_PREFIX.values()) + ['J', '']
+    ls_metrictypes = ['FLAG', 'FREQ', 'COUNT', 'DATE', 'COUNT_X', '']
+    ls_codes = []
+    ls_cats = []
+    for _ in range(n_rows):
+        cat = ls_categories[rnd.randint(len(ls_categories))]
+        prefix = DICT_PREFIX[cat] if rnd.rand() < 0.8 else \
+            ls_prefixes[rnd.randint(len(ls_prefixes))]
+        code = str(rnd.randint(100000))
+        metrictype = ls_metrictypes[rnd.randint(len(ls_metrictypes))]
+        sep = '_' if rnd.rand() < 0.9 else ''
+        ls_codes.append(prefix + '_' + code + sep + metrictype)
+        ls_cats.append(cat)
+    return pd.DataFrame({'code': ls_codes, 'category': ls_cats})
+
+
+def qc40_per_row(df, ls_metrictypes):
+    set_metrictypes = set(ls_metrictypes)
+    ss_code_split = df['code'].apply(lambda x: re.split('_', x, maxsplit=2))
+
+    def is_not_wellnamed(code, cat):
+        return (not (len(code) == 3) or
+                not (code[2] in set_metrictypes) or
+                not (DICT_PREFIX[cat] == code[0]))
+
+    ss_bool = pd.concat([ss_code_split, df['category']], axis=1)\
+        .apply(lambda x: is_not_wellnamed(*x), axis=1)
+    return df.loc[ss_bool, 'code'].tolist()
+
+
+@pytest.mark.parametrize("ls_metrictypes", [('FLAG', 'FREQ', 'COUNT'),
+                                            ('COUNT',)])
+@pytest.mark.parametrize("n_rows, seed", [(1, 0), (200, 1), (2000, 2)])
+def test_qc40_vectorised(n_rows, seed, ls_metrictypes):
+    df = generate_codes_df(n_rows, seed)
+    ls_expected = qc40_per_row(df, ls_metrictypes)
+    rpi = qc40(df, DICT_CONFIG_FLAGPROP, ls_metrictypes)
+    assert rpi.passed == (not ls_expected)
+    assert (rpi.extra or []) == ls_expected
+
+
+def generate_classes_df(n_rows, target, seed):
+    # columns of the dtypes of a cohort with a target column of two classes,
+    # or of many groups, and a few rows without a target
+    rnd = np.random.RandomState(seed)
+    df = generate_features_df(n_rows, 4, 0.1, seed)
+    df['score'] = np.where(rnd.rand(n_rows) < 0.3, 0, rnd.rand(n_rows))
+    df['name'] = pd.Series(rnd.choice(['a', 'b', None], n_rows), dtype=object)
+    df['nullable'] = pd.array(rnd.randint(0, 3, n_rows), dtype='Int64')
+    if target == 'binary':
+        df['target'] = rnd.randint(0, 2, n_rows).astype(float)
+    else:
+        df['target'] = rnd.choice(['x%d' % i for i in range(20)], n_rows)
+    df.loc[rnd.rand(n_rows) < 0.05, 'target'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("use_profile", [False, True])
+@pytest.mark.parametrize("batch_cells, max_onehot_groups", [
+    (10000000, 64), (1, 64), (100, 1)])
+@pytest.mark.parametrize("n_rows, target, seed", [
+    (1, 'binary', 0), (3, 'binary', 1), (500, 'binary', 2),
+    (500, 'groups', 3)])
+def test_grouped_fraction_zeroes_or_null(n_rows, target, seed, batch_cells,
+                                         max_onehot_groups, use_profile):
+    df = generate_classes_df(n_rows, target, seed)
+    # columns without and only of zeroes or nulls
+    df['no_zero'] = 1
+    df['all_zero'] = 0
+    df_expected = df.groupby('target').agg(utils.fraction_zeroes_or_null)
+    profile = None
+    if use_profile:
+        # the profile has the counts of half of the columns
+        profile = column_profile.ColumnProfile(df)
+        profile.stat(df, 'n_zero_or_null', df.columns[::2])
+    df_fract = utils.grouped_fraction_zeroes_or_null(
+        df, 'target', batch_cells, max_onehot_groups, profile)
+    # agg returns the nullable float dtype for the nullable columns
+    pd.testing.assert_frame_equal(df_fract, df_expected.astype(np.float64))
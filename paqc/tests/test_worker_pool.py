@@ -0,0 +1,52 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paqc.connectors import parse_utils
+from paqc.utils import worker_pool
+
+
+def double(ss):
+    return ss * 2
+
+
+@pytest.mark.parametrize("n_rows, n_cols, n_batches_min, batch_cells, "
+                         "n_batches", [
+                             (10, 6, 2, 1000, 2),
+                             (10, 6, 1, 30, 2),
+                             (10, 6, 1, 25, 2),
+                             (10, 6, 10, 1000, 6),
+                             (0, 3, 2, 1000, 1),
+                             (10, 0, 2, 1000, 0),
+                         ])
+def test_batch_columns(n_rows, n_cols, n_batches_min, batch_cells, n_batches):
+    df = pd.DataFrame(np.zeros((n_rows, n_cols)))
+    ls_batches = worker_pool.batch_columns(df, n_batches_min, batch_cells)
+    assert len(ls_batches) == n_batches
+    assert [col for batch in ls_batches for col in batch] == list(df.columns)
+
+
+@pytest.mark.parametrize("processes, batch_cells", [(1, 1000000), (2, 10)])
+def test_map_columns(processes, batch_cells):
+    df = pd.DataFrame(np.arange(60).reshape(10, 6), columns=list('abcdef'))
+    with worker_pool.WorkerPool(processes, batch_cells) as pool:
+        assert worker_pool.get_pool() is pool
+        pd.testing.assert_frame_equal(
+            parse_utils.apply_parallel(df, double), df * 2)
+        assert pool.stats['maps'] == 1
+        assert pool.stats['tasks'] == len(worker_pool.batch_columns(
+            df, processes, batch_cells))
+        assert 'Worker pool of %d processes' % processes in pool.report()
+    assert worker_pool.get_pool() is not pool
+    assert pool._pool is None
+
+
+def test_pickled_pool():
+    with worker_pool.WorkerPool(1) as pool:
+        pool.get_pool()
+        pool_unpickled = pickle.loads(pickle.dumps(pool))
+        assert pool_unpickled._pool is None
+        assert pool_unpickled.map(abs, [-1, 2]) == [1, 2]
+        pool_unpickled.close()
@@ -0,0 +1,131 @@
+"""
+The catalog of the QCs, i.e. their descriptions and whether they compare two
+dataframes. It's compiled from the Status_QC.xlsx file in data, which has to be
+exported and downloaded from the online tracker manually every time it's
+updated.
+
+Parsing Excel files is slow, so the compiled catalog is saved next to the
+workbook as a JSON sidecar, together with the size, modification time and
+hash of the workbook it was compiled from. The workbook is only parsed again
+if it has changed since, and within a process the catalog is loaded once.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data')
+STATUS_QC_PATH = os.path.join(DATA_DIR, 'Status_QC.xlsx')
+CATALOG_PATH = os.path.join(DATA_DIR, 'Status_QC.json')
+
+
+class QCCatalog:
+    """
+    Holds the description and the type of each QC listed in Status_QC.xlsx.
+    """
+
+    def __init__(self, qcs):
+        """
+        :param qcs: Dict of qc_num: {'desc': description, 'compare': bool}
+        """
+        self.qcs = qcs
+
+    def get_descriptions(self):
+        """
+        :return: Dictionary of qc_num: qc description pairs.
+        """
+        return {qc_num: qc['desc'] for qc_num, qc in self.qcs.items()}
+
+    def get_compare(self):
+        """
+        :return: Dictionary of qc_num: boolean, whether the QC is a compare.
+        """
+        return {qc_num: qc['compare'] for qc_num, qc in self.qcs.items()}
+
+
+def hash_file(path):
+    """
+    :param path: Path to a file.
+    :return: Hex string of the SHA-1 hash of the file's content.
+    """
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def compile_catalog(status_qc_path=STATUS_QC_PATH):
+    """
+    Parses the Status_QC.xlsx file. Each QC is listed once, rows without an ID
+    are ignored and the first row of a duplicated ID is kept.
+
+    :param status_qc_path: Path to the Status_QC.xlsx file.
+    :return: Dict of qc_num: {'desc': description, 'compare': bool}
+    """
+    # only needed when the catalog is recompiled, so imported lazily
+    import pandas as pd
+
+    df = pd.read_excel(status_qc_path)
+    qcs = dict()
+    for qc_id, test_data, desc in zip(df['ID'], df['Test data'],
+                                      df['Test description']):
+        if pd.isnull(qc_id):
+            continue
+        key = 'qc%d' % qc_id
+        if key not in qcs:
+            qcs[key] = {'desc': None if pd.isnull(desc) else desc,
+                        'compare': test_data == "Compare"}
+    return qcs
+
+
+def load_catalog(status_qc_path=STATUS_QC_PATH, catalog_path=CATALOG_PATH):
+    """
+    Loads the compiled catalog from its JSON sidecar if it's up to date with
+    the Status_QC.xlsx file, otherwise it recompiles it and tries to update the
+    sidecar. A sidecar with matching size and modification time is trusted
+    without hashing the workbook; the hash catches workbooks that were only
+    touched, e.g. by a fresh checkout.
+
+    :param status_qc_path: Path to the Status_QC.xlsx file.
+    :param catalog_path: Path to the JSON sidecar.
+    :return: :obj:`~utils.catalog.QCCatalog`
+    """
+    sidecar = None
+    if os.path.exists(catalog_path):
+        with open(catalog_path) as f:
+            sidecar = json.load(f)
+    # without the workbook, the sidecar is all we have
+    if not os.path.exists(status_qc_path):
+        if sidecar is None:
+            raise FileNotFoundError("Neither %s nor its compiled catalog %s "
+                                    "exist." % (status_qc_path, catalog_path))
+        return QCCatalog(sidecar['qcs'])
+
+    stat = os.stat(status_qc_path)
+    if sidecar is not None:
+        if (sidecar['size'] == stat.st_size and
+                sidecar['mtime'] == stat.st_mtime):
+            return QCCatalog(sidecar['qcs'])
+        source_hash = hash_file(status_qc_path)
+        if sidecar['hash'] == source_hash:
+            return QCCatalog(sidecar['qcs'])
+    else:
+        source_hash = hash_file(status_qc_path)
+
+    qcs = compile_catalog(status_qc_path)
+    try:
+        with open(catalog_path, 'w') as f:
+            json.dump({'hash': source_hash, 'size': stat.st_size,
+                       'mtime': stat.st_mtime, 'qcs': qcs}, f, indent=2,
+                      sort_keys=True)
+    # a read-only install still works, it just has to parse the workbook
+    except OSError:
+        pass
+    return QCCatalog(qcs)
+
+
+@lru_cache(maxsize=None)
+def get_catalog():
+    """
+    :return: The :obj:`~utils.catalog.QCCatalog` of this process, it's only
+             loaded on the first call.
+    """
+    return load_catalog()
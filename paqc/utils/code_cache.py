@@ -0,0 +1,79 @@
+"""
+Cache of the clinical code files (ICD, NCD, CPT, HCPC and speciality) that map
+codes to their PROD_CUSTOM_LVL1_DESC and PROD_CUSTOM_LVL2_DESC descriptions.
+
+Several QCs of an input file, and the QCs of every input file, look up the
+level 2 descriptions of a level 1 description. Each code file is therefore read
+only once per process, and read again only if its size or modification time
+changes. Its level 2 descriptions are grouped by level 1 description and
+cleaned with :func:`~utils.utils.clean_string` once, when the file is read.
+"""
+import os
+
+import pandas as pd
+
+from paqc.utils import utils
+
+CODE_LVL1_COL = 'PROD_CUSTOM_LVL1_DESC'
+CODE_LVL2_COL = 'PROD_CUSTOM_LVL2_DESC'
+CODE_FILES = ('ICD_file', 'NCD_file', 'CPT_file', 'HCPC_file',
+              'speciality_file')
+
+# absolute path: (size, modification time, grouped level 2 descriptions)
+_code_files = dict()
+
+
+def group_code_file(path):
+    """
+    :param path: Path to a clinical code csv file.
+    :return: Dict of level 1 description: {level 2 description: level 2
+             description cleaned with :func:`~utils.utils.clean_string`}
+    """
+    df = pd.read_csv(path, usecols=[CODE_LVL1_COL, CODE_LVL2_COL])
+    df = df.drop_duplicates()
+    dict_groups = dict()
+    for lvl1_desc, lvl2_desc in zip(df[CODE_LVL1_COL], df[CODE_LVL2_COL]):
+        # empty level 2 descriptions don't name a feature
+        if pd.isnull(lvl2_desc):
+            continue
+        dict_groups.setdefault(lvl1_desc, dict())[lvl2_desc] = \
+            utils.clean_string(lvl2_desc)
+    return dict_groups
+
+
+def get_code_file(path):
+    """
+    :param path: Path to a clinical code csv file.
+    :return: The grouped level 2 descriptions of the file, see
+             :func:`~utils.code_cache.group_code_file`. They're only read
+             again if the file changed since the last call.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _code_files.get(path)
+    if cached is None or cached[:2] != (stat.st_size, stat.st_mtime):
+        cached = (stat.st_size, stat.st_mtime, group_code_file(path))
+        _code_files[path] = cached
+    return cached[2]
+
+
+def get_lvl2_descs(general, lvl1_desc):
+    """
+    :param general: General section of the config, with the paths of the
+           clinical code files.
+    :param lvl1_desc: Level 1 description, e.g. 1, 2 or 3.
+    :return: List of the cleaned level 2 descriptions that have the level 1
+             description in any of the code files.
+    """
+    dict_lvl2_desc = dict()
+    for file in CODE_FILES:
+        dict_lvl2_desc.update(get_code_file(general[file]).get(lvl1_desc,
+                                                                dict()))
+    return list(dict_lvl2_desc.values())
+
+
+def clear():
+    """
+    Empties the cache, e.g. after code files were edited within a second.
+    """
+    _code_files.clear()
@@ -0,0 +1,116 @@
+"""
+Index of the column names of a DataFrame, grouped by the column types of the
+general section of the config (flag, count, freq, date columns, etc.) and by
+feature. The Driver computes it once for each loaded input file and hands it to
+the QCs through their mini config object, so
+:func:`~utils.utils.generate_list_columns` and
+:func:`~utils.utils.generate_dict_grouped_columns` don't have to rescan all
+column names with regexes in every QC.
+"""
+import re
+from collections import defaultdict
+
+from paqc.utils import utils
+
+# The keys of the general section of the config that define column names or
+# suffixes. Other keys are indexed the first time they are looked up.
+COLUMN_KEYS = ('date_cols', 'count_cols', 'freq_cols', 'flag_cols',
+               'first_exp_date_cols', 'last_exp_date_cols', 'index_date_col',
+               'lookback_date_col', 'target_col', 'patient_id_col',
+               'gender_col', 'age_col', 'matched_patient_id_col')
+
+
+class ColumnIndex:
+    """
+    For each column key of the general section of the config, the index holds
+    the columns whose name ends with the key's value, together with the
+    feature of the column, i.e. its name without that suffix.
+    """
+
+    def __init__(self, columns, general, keys=COLUMN_KEYS):
+        """
+        :param columns: Columns of the DataFrame, e.g. df.columns.
+        :param general: General section of the config.
+        :param keys: Keys of the general section to index straight away.
+        """
+        self.columns = columns
+        self.general = general
+        # key: list of (column position, column name, feature) tuples
+        self.key_matches = dict()
+        # feature: feature cleaned with utils.clean_string
+        self.clean_features = dict()
+
+        dict_progs = {key: re.compile("%s$" % general[key]) for key in keys
+                      if key in general and isinstance(general[key], str)}
+        key_matches = defaultdict(list)
+        # single pass over the columns, matching each one against all keys
+        for i, colname in enumerate(columns):
+            for key, prog in dict_progs.items():
+                match = prog.search(colname)
+                if match:
+                    key_matches[key].append((i, colname,
+                                             colname[:match.start()]))
+        for key in dict_progs:
+            self.key_matches[key] = key_matches[key]
+
+    def matches(self, df):
+        """
+        :param df: pandas DataFrame.
+        :return: Boolean, whether the index was built for the columns of df.
+        """
+        return df.columns is self.columns or df.columns.equals(self.columns)
+
+    def get_key_matches(self, key):
+        """
+        :param key: Key of the general section of the config.
+        :return: List of (column position, column name, feature) tuples.
+        """
+        if key not in self.key_matches:
+            prog = re.compile("%s$" % self.general[key])
+            ls_matches = []
+            for i, colname in enumerate(self.columns):
+                match = prog.search(colname)
+                if match:
+                    ls_matches.append((i, colname, colname[:match.start()]))
+            self.key_matches[key] = ls_matches
+        return self.key_matches[key]
+
+    def clean_feature(self, feature):
+        """
+        :param feature: Column name without its suffix.
+        :return: The feature cleaned with :func:`~utils.utils.clean_string`.
+        """
+        if feature not in self.clean_features:
+            self.clean_features[feature] = utils.clean_string(feature)
+        return self.clean_features[feature]
+
+    def list_columns(self, list_keys):
+        """
+        Same output as :func:`~utils.utils.generate_list_columns`.
+
+        :param list_keys: Keys of the general section of the config.
+        :return: List of the column names that match any of the keys, in the
+                 order of the columns.
+        """
+        positions = set()
+        for key in list_keys:
+            if key in self.general:
+                positions.update(i for i, colname, feature in
+                                 self.get_key_matches(key))
+        return [self.columns[i] for i in sorted(positions)]
+
+    def grouped_columns(self, list_keys):
+        """
+        Same output as :func:`~utils.utils.generate_dict_grouped_columns`.
+
+        :param list_keys: Keys of the general section of the config.
+        :return: A dictionary of dictionaries, feature: {type: column name}.
+        """
+        dict_grouped_cols = defaultdict(dict)
+        for key in list_keys:
+            if key in self.general:
+                col_type = re.sub(r'_cols$', '', key)
+                for i, colname, feature in self.get_key_matches(key):
+                    dict_grouped_cols[feature][col_type] = colname
+        return {self.clean_feature(feature): dict_cols for feature, dict_cols
+                in dict_grouped_cols.items()}
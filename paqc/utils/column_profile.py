@@ -0,0 +1,233 @@
+"""
+Profile of the columns of a loaded DataFrame: their dtype, number of null,
+zero and negative values, min and max. Many QCs look at these (qc3, qc15,
+qc16, qc49, qc50), so the Driver hands a :class:`ColumnProfile` of each
+loaded input file to its QCs through their mini config object, and the
+stats of a column are computed at most once, the first time a QC asks for
+them. The null values are counted on the :class:`~utils.null_mask.NullMask`
+of the input, if there is one.
+
+Zero and negative values are only counted in numeric columns, as by
+:func:`~utils.utils.is_zero_or_null`; the min and max skip the null values
+and are only computed for numeric and datetime columns.
+
+The profile doesn't hold the DataFrame, so it can be pickled to the worker
+processes without it. With the processes executor, the workers can't share
+what they profile, so the Driver profiles all columns before the QCs are
+sent out, see PROFILE_QCS. The min and max are left out, as only the
+comparison QCs, which aren't executed by the executors, read them.
+"""
+import numpy as np
+import pandas as pd
+
+from paqc.utils import utils
+
+# the QCs that read the profile
+PROFILE_QCS = ('qc3', 'qc15', 'qc16', 'qc49', 'qc50')
+COUNTS = ('n_null', 'n_zero', 'n_negative')
+RANGE = ('min', 'max')
+NAT_INT = np.iinfo(np.int64).min
+
+
+def count_null(ss):
+    """
+    :param ss: pandas Series.
+    :return: Dict with the n_null of ss.
+    """
+    values = ss.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biu':
+        return {'n_null': 0}
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return {'n_null': int(np.count_nonzero(np.isnan(values)))}
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'mM':
+        return {'n_null': int(np.count_nonzero(
+            values.view(np.int64) == NAT_INT))}
+    return {'n_null': int(ss.isnull().sum())}
+
+
+def count_zero(ss):
+    """
+    :param ss: pandas Series.
+    :return: Dict with the n_zero of ss.
+    """
+    values = ss.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        return {'n_zero': int(np.count_nonzero(values == 0))}
+    if pd.api.types.is_numeric_dtype(ss.dtype):
+        # comparisons of the missing values of nullable dtypes are NA, and
+        # are skipped by the sum
+        return {'n_zero': int((ss == 0).sum())}
+    return {'n_zero': 0}
+
+
+def count_negative(ss):
+    """
+    :param ss: pandas Series.
+    :return: Dict with the n_negative of ss.
+    """
+    values = ss.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        return {'n_negative': int(np.count_nonzero(values < 0))}
+    if pd.api.types.is_numeric_dtype(ss.dtype):
+        return {'n_negative': int((ss < 0).sum())}
+    return {'n_negative': 0}
+
+
+def range_column(ss):
+    """
+    :param ss: pandas Series.
+    :return: Dict with the min and max of ss, NaN for numeric columns without
+             values and None for columns that are neither numeric nor
+             datetime.
+    """
+    values = ss.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        if len(values) == 0:
+            return {'min': np.nan, 'max': np.nan}
+        # fmin and fmax skip NaNs, and are NaN for columns of NaNs
+        return {'min': np.fmin.reduce(values), 'max': np.fmax.reduce(values)}
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'M':
+        unit = np.datetime_data(values.dtype)[0]
+        arr = values.view(np.int64)
+        arr_valid = arr[arr != NAT_INT]
+        if len(arr_valid) == 0:
+            return {'min': pd.NaT, 'max': pd.NaT}
+        return {'min': utils.transform_int_to_dt(arr_valid.min(), unit),
+                'max': utils.transform_int_to_dt(arr_valid.max(), unit)}
+    if pd.api.types.is_numeric_dtype(ss.dtype):
+        if ss.isnull().all():
+            return {'min': np.nan, 'max': np.nan}
+        return {'min': ss.min(), 'max': ss.max()}
+    return {'min': None, 'max': None}
+
+
+# the functions computing the COUNTS and RANGE, each computes a group of stats
+# at once
+STAT_GROUPS = ((('n_null',), count_null), (('n_zero',), count_zero),
+               (('n_negative',), count_negative), (RANGE, range_column))
+
+
+class ColumnProfile:
+    """
+    Profiles of the columns of a DataFrame, computed the first time they are
+    looked up. The methods take the DataFrame the profile was created for,
+    or a subset of its columns.
+    """
+
+    def __init__(self, df, null_mask=None):
+        """
+        :param df: pandas DataFrame to profile.
+        :param null_mask: :class:`~utils.null_mask.NullMask` of df the null
+               values are counted on, or None.
+        """
+        self.columns = df.columns
+        self.null_mask = null_mask
+        self.set_columns = set(df.columns)
+        self.n_rows = len(df)
+        # column name: dict of the COUNTS and RANGE of the column computed
+        # so far
+        self.profiles = dict()
+
+    def matches(self, df):
+        """
+        :param df: pandas DataFrame.
+        :return: Boolean, whether the profile was created for df, or for a
+                 DataFrame it is a subset of the columns of.
+        """
+        if len(df) != self.n_rows:
+            return False
+        return df.columns is self.columns or \
+            all(colname in self.set_columns for colname in df.columns)
+
+    def get(self, df, colname, stats=COUNTS + RANGE):
+        """
+        :param df: pandas DataFrame the profile matches.
+        :param colname: Name of a column of df.
+        :param stats: The COUNTS and RANGE stats to compute if they aren't
+               yet.
+        :return: Dict of the profile of the column, with at least stats.
+        """
+        dict_profile = self.profiles.get(colname, dict())
+        for group_stats, function in STAT_GROUPS:
+            if not any(stat in stats and stat not in dict_profile
+                       for stat in group_stats):
+                continue
+            if group_stats == ('n_null',) and self.null_mask is not None:
+                dict_profile = dict(dict_profile, n_null=int(
+                    self.null_mask.count(df, [colname])[0]))
+            else:
+                dict_profile = dict(dict_profile, **function(df[colname]))
+        # with the threads executor, two QCs may profile the same column at
+        # once, they store the same values
+        self.profiles[colname] = dict_profile
+        return dict_profile
+
+    def known(self, colname, stats):
+        """
+        :param colname: Name of a column of the profiled DataFrame.
+        :param stats: The COUNTS and RANGE stats.
+        :return: Boolean, whether the stats of the column are computed.
+        """
+        dict_profile = self.profiles.get(colname, dict())
+        return all(stat in dict_profile for stat in stats)
+
+    def profile_all(self, df, stats=COUNTS + RANGE):
+        """
+        Profiles all columns of df that aren't yet.
+
+        :param df: pandas DataFrame the profile matches.
+        :param stats: The COUNTS and RANGE stats to compute.
+        :return: None
+        """
+        for colname in df.columns:
+            self.get(df, colname, stats)
+
+    def value(self, df, colname, stat):
+        """
+        :param df: pandas DataFrame the profile matches.
+        :param colname: Name of a column of df.
+        :param stat: One of COUNTS, RANGE, dtype, numeric, n_zero_or_null or
+               all_null.
+        :return: The stat of the column.
+        """
+        if stat == 'dtype':
+            return df[colname].dtype
+        if stat == 'numeric':
+            return pd.api.types.is_numeric_dtype(df[colname].dtype)
+        if stat == 'n_zero_or_null':
+            dict_profile = self.get(df, colname, ('n_null', 'n_zero'))
+            return dict_profile['n_null'] + dict_profile['n_zero']
+        if stat == 'all_null':
+            return self.get(df, colname, ('n_null',))['n_null'] == \
+                self.n_rows
+        return self.get(df, colname, (stat,))[stat]
+
+    def stat(self, df, stat, ls_cols=None):
+        """
+        :param df: pandas DataFrame the profile matches.
+        :param stat: See :func:`ColumnProfile.value`.
+        :param ls_cols: List of column names of df, all columns if None.
+        :return: pandas Series of the stat, indexed by the column names.
+        """
+        if ls_cols is None:
+            ls_cols = df.columns
+        ls_values = [self.value(df, colname, stat) for colname in ls_cols]
+        if stat in COUNTS or stat == 'n_zero_or_null':
+            dtype = np.int64
+        elif stat in ('numeric', 'all_null'):
+            dtype = bool
+        else:
+            dtype = object
+        return pd.Series(ls_values, index=pd.Index(ls_cols), dtype=dtype)
+
+
+def get_profile(df, profile=None):
+    """
+    :param df: pandas DataFrame.
+    :param profile: :class:`ColumnProfile` from the mini config object of a
+           QC, or None.
+    :return: profile if it matches df, otherwise a new ColumnProfile of df.
+    """
+    if profile is not None and profile.matches(df):
+        return profile
+    return ColumnProfile(df)
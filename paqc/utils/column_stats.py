@@ -0,0 +1,163 @@
+"""
+Descriptive statistics of many numeric and datetime columns at once, for
+qc49: min, max, mean, median and fraction of values being zero or null.
+
+The int and float columns are reduced in batches of columns of the same
+dtype, with a few numpy reductions over a 2D int64/float64 array of each
+batch, instead of a Python function per column and statistic. Datetime
+columns are reduced as int64 views in the unit of their dtype, and converted
+back to Timestamps at the end. Columns of other dtypes, e.g. nullable
+integers, go through the functions of :mod:`~utils.utils` one by one.
+
+The statistics are the same as the ones of
+:func:`~utils.utils.mean_all_types`, :func:`~utils.utils.median_all_types`,
+np.min, np.max and :func:`~utils.utils.fraction_zeroes_or_null`: missing
+values are skipped, except by the median of numeric columns, which is NaN if
+the column has any.
+"""
+import numpy as np
+import pandas as pd
+
+from paqc.utils import utils
+
+STATS = ['min', 'max', 'mean', 'median', 'null']
+# number of cells of a batch of numeric columns reduced at once
+BATCH_CELLS = 10000000
+NAT_INT = np.iinfo(np.int64).min
+
+
+def describe_numeric(arr, ls_stats=STATS):
+    """
+    :param arr: 2D int64 or float64 numpy array, with a column per column.
+    :param ls_stats: The STATS to compute.
+    :return: Dict of stat: 1D float64 numpy array, for the ls_stats.
+    """
+    n_rows = arr.shape[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if arr.dtype.kind == 'f':
+            arr_null = np.isnan(arr)
+            arr_count = n_rows - arr_null.sum(axis=0)
+            arr_sum = np.where(arr_null, 0, arr).sum(axis=0)
+        else:
+            arr_null = None
+            arr_count = np.full(arr.shape[1], n_rows)
+            arr_sum = arr.sum(axis=0, dtype=np.float64)
+        dict_stats = {
+            'mean': np.where(arr_count > 0, arr_sum / arr_count, np.nan)}
+        if 'null' in ls_stats:
+            arr_zero_null = arr == 0
+            if arr_null is not None:
+                arr_zero_null |= arr_null
+            dict_stats['null'] = arr_zero_null.sum(axis=0) / n_rows
+        for stat in ['min', 'max', 'median']:
+            if stat not in ls_stats:
+                continue
+            if n_rows == 0:
+                dict_stats[stat] = np.full(arr.shape[1], np.nan)
+            # fmin and fmax skip NaNs, and are NaN for columns of NaNs
+            elif stat == 'min':
+                dict_stats[stat] = np.fmin.reduce(arr, axis=0).astype(
+                    np.float64)
+            elif stat == 'max':
+                dict_stats[stat] = np.fmax.reduce(arr, axis=0).astype(
+                    np.float64)
+            else:
+                dict_stats[stat] = np.median(arr, axis=0).astype(np.float64)
+    return dict_stats
+
+
+def describe_datetime(ss):
+    """
+    :param ss: pandas Series of a datetime64 dtype.
+    :return: Dict of stat: value, for the STATS.
+    """
+    unit = np.datetime_data(ss.dtype)[0]
+    arr = ss.to_numpy().view(np.int64)
+    arr_valid = arr[arr != NAT_INT]
+    n_rows = len(arr)
+
+    def to_timestamp(date_int):
+        return utils.transform_int_to_dt(date_int, unit)
+
+    if len(arr_valid) == 0:
+        dict_stats = {stat: pd.NaT for stat in ['min', 'max', 'mean',
+                                                'median']}
+    else:
+        dict_stats = {'min': to_timestamp(arr_valid.min()),
+                      'max': to_timestamp(arr_valid.max()),
+                      'mean': to_timestamp(int(np.mean(arr_valid))),
+                      'median': to_timestamp(int(np.median(arr_valid)))}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dict_stats['null'] = np.float64(n_rows - len(arr_valid)) / n_rows
+    return dict_stats
+
+
+def describe_other(ss):
+    """
+    :param ss: pandas Series.
+    :return: Dict of stat: value, for the STATS.
+    """
+    return {'min': np.min(ss), 'max': np.max(ss),
+            'mean': utils.mean_all_types(ss),
+            'median': utils.median_all_types(ss),
+            'null': utils.fraction_zeroes_or_null(ss)}
+
+
+def describe_columns(df, profile=None):
+    """
+    :param df: pandas DataFrame of numeric and datetime columns.
+    :param profile: :class:`~utils.column_profile.ColumnProfile` of df, or
+           None. The min, max and null of the int and float columns are
+           taken from it.
+    :return: pandas DataFrame with a row per column of df and the STATS as
+             columns.
+    """
+    n_cols = df.shape[1]
+    # stat: list of the values of the columns, in the order of df
+    dict_stats = {stat: [None] * n_cols for stat in STATS}
+
+    def set_stats(position, dict_col_stats):
+        for stat in STATS:
+            dict_stats[stat][position] = dict_col_stats[stat]
+
+    # positions of the columns reduced as int64 and float64, in batches
+    dict_numeric = {'i': [], 'f': []}
+    all_numeric = True
+    for position, dtype in enumerate(df.dtypes):
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iuf':
+            dict_numeric['i' if dtype.kind == 'i' else 'f'].append(position)
+            continue
+        all_numeric = False
+        if isinstance(dtype, np.dtype) and dtype.kind == 'M':
+            set_stats(position, describe_datetime(df.iloc[:, position]))
+        else:
+            set_stats(position, describe_other(df.iloc[:, position]))
+
+    ls_stats = STATS
+    if profile is not None:
+        ls_stats = ['mean', 'median']
+        for position in dict_numeric['i'] + dict_numeric['f']:
+            dict_profile = profile.get(df, df.columns[position])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                null = np.float64(dict_profile['n_null'] +
+                                  dict_profile['n_zero']) / len(df)
+            set_stats(position, {'min': float(dict_profile['min']),
+                                 'max': float(dict_profile['max']),
+                                 'mean': None, 'median': None,
+                                 'null': float(null)})
+
+    batch_cols = max(BATCH_CELLS // max(len(df), 1), 1)
+    for kind, ls_positions in dict_numeric.items():
+        dtype = np.float64 if kind == 'f' else np.int64
+        for start in range(0, len(ls_positions), batch_cols):
+            ls_batch = ls_positions[start:start + batch_cols]
+            arr = df.iloc[:, ls_batch].to_numpy(dtype=dtype)
+            dict_batch_stats = describe_numeric(arr, ls_stats)
+            for j, position in enumerate(ls_batch):
+                for stat, values in dict_batch_stats.items():
+                    dict_stats[stat][position] = float(values[j])
+
+    # like the transposed output of DataFrame.apply, the statistics of
+    # numeric columns are floats, and objects if there are other columns
+    return pd.DataFrame(dict_stats, index=df.columns, columns=STATS,
+                        dtype=np.float64 if all_numeric else object)
@@ -87,10 +87,63 @@ def config_checker(yml):
             return False
         else:
             if general['source'] not in ['csv', 'sql', 'bdf', 'dataframe',
-                                         'rds', 'feather']:
+                                         'rds', 'feather', 'parquet']:
                 print("ConfigError: Source must be one of: csv, bdf, sql.")
                 return False
 
+        # check how the QCs of an input file should be executed
+        if 'executor' in general:
+            if general['executor'] not in ['serial', 'threads', 'processes']:
+                print("ConfigError: Executor must be one of: serial, threads, "
+                      "processes.")
+                return False
+
+        # check how many chunk files of multi-file inputs are QC-ed at once
+        if 'shard_workers' in general:
+            if (not isinstance(general['shard_workers'], int) or
+                    general['shard_workers'] < 1):
+                print("ConfigError: shard_workers has to be a positive "
+                      "integer.")
+                return False
+
+        # check the number of rows read at once when streaming input files
+        if general.get('chunksize') is not None:
+            if (not isinstance(general['chunksize'], int) or
+                    general['chunksize'] < 1):
+                print("ConfigError: chunksize has to be a positive integer.")
+                return False
+
+        # check whether feather input files are memory-mapped
+        if 'memory_map' in general:
+            if not isinstance(general['memory_map'], bool):
+                print("ConfigError: memory_map has to be true or false.")
+                return False
+
+        # check whether input files are hashed by their bytes
+        if 'hash_files' in general:
+            if not isinstance(general['hash_files'], bool):
+                print("ConfigError: hash_files has to be true or false.")
+                return False
+
+        # check where and how much of the results of QCs are cached
+        if 'cache_dir' in general:
+            if not isinstance(general['cache_dir'], str):
+                print("ConfigError: cache_dir has to be a path.")
+                return False
+        if 'cache_max_mb' in general:
+            if (isinstance(general['cache_max_mb'], bool) or
+                    not isinstance(general['cache_max_mb'], (int, float)) or
+                    general['cache_max_mb'] <= 0):
+                print("ConfigError: cache_max_mb has to be a positive "
+                      "number.")
+                return False
+
+        # check how .rds input files are read
+        if 'rds_reader' in general:
+            if general['rds_reader'] not in ['rpy2', 'native']:
+                print("ConfigError: rds_reader must be one of: rpy2, native.")
+                return False
+
         # test mandatory column name fields
         mandatory_general_fields = {'flag_cols', 'count_cols', 'freq_cols',
                                     'first_exp_date_cols', 'last_exp_date_cols',
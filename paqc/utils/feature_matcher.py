@@ -0,0 +1,48 @@
+"""
+Matcher that finds which features contain any of a set of (cleaned) clinical
+code descriptions, e.g. to select the columns of the CC01_CP features.
+
+This used to be done with one regex alternation "(a)|(b)|..." of all the
+descriptions, which the regex engine tries one by one at every position of
+every feature, and in which the descriptions weren't escaped. The matcher
+instead puts the descriptions in a set and looks up the substrings of a feature
+that have the length of a description, so its cost grows with the number of
+distinct description lengths rather than with the number of descriptions.
+"""
+
+
+class FeatureMatcher:
+    """
+    Matches strings that contain any of the patterns as a literal substring.
+    """
+
+    def __init__(self, patterns):
+        """
+        :param patterns: Iterable of literal strings, e.g. the output of
+               :func:`~utils.utils.generate_list_cc0x_feats`.
+        """
+        self.patterns = frozenset(patterns)
+        self.lengths = sorted(set(len(pattern) for pattern in self.patterns))
+
+    def search(self, s):
+        """
+        :param s: String, e.g. a cleaned feature.
+        :return: Boolean, whether s contains any of the patterns.
+        """
+        patterns = self.patterns
+        len_s = len(s)
+        for length in self.lengths:
+            if length > len_s:
+                break
+            for i in range(len_s - length + 1):
+                if s[i:i + length] in patterns:
+                    return True
+        return False
+
+    def filter(self, strings):
+        """
+        :param strings: Iterable of strings.
+        :return: List of the strings that contain any of the patterns, in
+                 their original order.
+        """
+        return [s for s in strings if self.search(s)]
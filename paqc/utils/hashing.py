@@ -0,0 +1,245 @@
+"""
+Hashes of the data the QCs were executed on, for the data_hash of the
+report.
+
+A DataFrame is hashed column by column: pd.util.hash_pandas_object gives
+each value a 64 bit hash, with a fixed key so it's the same in every process,
+and these are fed to a blake2b hash per column, a block of rows at a time. So
+the memory needed is bounded by the size of a block, the columns can be
+hashed on different workers, and a file streamed chunk by chunk has the same
+hash as the fully loaded file, see :class:`FrameHasher`.
+
+Equal numbers have the same hash whatever their dtype: integers, and floats
+with an integer value, are hashed as int64, the other floats from their bits.
+Datetimes are hashed as seconds and nanoseconds, whatever their resolution,
+and missing values all the same. So the hash doesn't depend on the dtypes
+pandas infers, which can differ between the chunks of a file and the whole
+file, and no two different numbers or datetimes are hashed alike before
+their 64 bit hashes are.
+
+Input files on disk can also be identified by the hash of their bytes, see
+:func:`file_hash`, which doesn't need the file to be parsed at all.
+
+The comparison QCs only need to know which columns of two DataFrames may
+differ. For them, :func:`column_fingerprints` hashes the bytes of numeric and
+datetime columns as they are, which is several times faster than the hash of
+their values.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from paqc.utils import worker_pool
+
+# number of rows hashed at once
+HASH_BLOCK_ROWS = 1000000
+# number of cells from which the columns are hashed on the worker pool
+HASH_PARALLEL_MIN_CELLS = 50000000
+# number of bytes of a file read at once
+FILE_BLOCK_BYTES = 2 ** 20
+DIGEST_SIZE = 16
+# hash of missing values, whatever the dtype of their column
+NULL_HASH = np.uint64(2 ** 64 - 1)
+# mixed into the hashes of the floats without an integer value, so they
+# aren't hashed as the integers with the same bits
+FLOAT_KEY = np.uint64(0x9e3779b97f4a7c15)
+NS_PER_SECOND = 10 ** 9
+
+# file hashes: abspath: (size, mtime, hash)
+_file_hashes = dict()
+
+
+def value_hashes(ss):
+    """
+    :param ss: pandas Series.
+    :return: 1D uint64 numpy array, the hash of each value of ss, with
+             integers and floats with an integer value hashed as int64 and
+             datetimes as seconds and nanoseconds.
+    """
+    arr_null = ss.isnull().to_numpy(dtype=bool)
+    if pd.api.types.is_bool_dtype(ss) or pd.api.types.is_integer_dtype(ss):
+        # uint64 values above the int64 range keep their bits
+        arr_hashes = pd.util.hash_array(ss.to_numpy(dtype=np.int64,
+                                                    na_value=0))
+    elif pd.api.types.is_float_dtype(ss):
+        arr = ss.to_numpy(dtype=np.float64, na_value=np.nan)
+        arr_integral = np.isfinite(arr) & (arr == np.trunc(arr)) & \
+            (np.abs(arr) < 2.0 ** 63)
+        arr_bits = arr.view(np.uint64).copy()
+        arr_bits[arr_integral] = arr[arr_integral].astype(np.int64).view(
+            np.uint64)
+        arr_hashes = pd.util.hash_array(arr_bits)
+        arr_hashes[~arr_integral] ^= FLOAT_KEY
+    elif pd.api.types.is_datetime64_dtype(ss):
+        arr = ss.to_numpy()
+        units_per_second = np.timedelta64(1, 's') // np.timedelta64(
+            1, np.datetime_data(arr.dtype)[0])
+        arr_seconds, arr_units = np.divmod(arr.view(np.int64),
+                                           units_per_second)
+        arr_ns = arr_units * (NS_PER_SECOND // units_per_second)
+        arr_hashes = pd.util.hash_array(
+            pd.util.hash_array(arr_seconds) ^ arr_ns.view(np.uint64))
+    else:
+        arr_hashes = pd.util.hash_pandas_object(ss, index=False).to_numpy(
+            dtype=np.uint64, copy=True)
+    arr_hashes[arr_null] = NULL_HASH
+    return arr_hashes
+
+
+class FrameHasher:
+    """
+    Hash of the columns of a DataFrame, which can be updated with one chunk of
+    rows after the other.
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.column_hashers = []
+
+    def update(self, df):
+        """
+        Adds the rows of df to the hash.
+
+        :param df: pandas DataFrame, with the same columns as the chunks
+               before it.
+        :return: None
+        """
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self.column_hashers = [hashlib.blake2b(digest_size=DIGEST_SIZE)
+                                   for _ in self.columns]
+        for i, hasher in enumerate(self.column_hashers):
+            ss = df.iloc[:, i]
+            for start in range(0, len(ss), HASH_BLOCK_ROWS):
+                arr_hashes = value_hashes(ss.iloc[start:start +
+                                                  HASH_BLOCK_ROWS])
+                hasher.update(arr_hashes.tobytes())
+
+    def column_digests(self):
+        """
+        :return: List of the hex digests of the columns.
+        """
+        return [hasher.hexdigest() for hasher in self.column_hashers]
+
+    def hexdigest(self):
+        """
+        :return: Hex digest of the column names and column digests.
+        """
+        return combine_digests(self.columns or [], self.column_digests())
+
+
+def combine_digests(columns, ls_digests):
+    """
+    :param columns: List of column names.
+    :param ls_digests: List of the hex digests of the columns.
+    :return: Hex digest of the DataFrame.
+    """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for col, digest in zip(columns, ls_digests):
+        hasher.update(repr(col).encode('utf-8'))
+        hasher.update(digest.encode('ascii'))
+    return hasher.hexdigest()
+
+
+def column_digest(ss):
+    """
+    Runs in the workers of :func:`hash_frame`.
+
+    :param ss: pandas Series.
+    :return: pandas Series of the hex digest of ss, named after it.
+    """
+    hasher = FrameHasher()
+    hasher.update(ss.to_frame())
+    return pd.Series(hasher.column_digests(), name=ss.name)
+
+
+def hash_frame(df, parallel=None):
+    """
+    :param df: pandas DataFrame.
+    :param parallel: Boolean, whether to hash the columns on the active
+           :class:`~utils.worker_pool.WorkerPool`. If None, they are if df
+           has at least HASH_PARALLEL_MIN_CELLS cells.
+    :return: Hex digest of df, see :class:`FrameHasher`.
+    """
+    if parallel is None:
+        parallel = df.size >= HASH_PARALLEL_MIN_CELLS
+    if parallel and df.shape[1] > 1:
+        df_digests = worker_pool.get_pool().map_columns(column_digest, df)
+        return combine_digests(list(df.columns),
+                               df_digests.iloc[0].tolist())
+    hasher = FrameHasher()
+    hasher.update(df)
+    return hasher.hexdigest()
+
+
+def column_fingerprint(ss):
+    """
+    Columns of a numpy dtype are hashed from their bytes, the others as in
+    :class:`FrameHasher`. Two columns with the same fingerprint have the same
+    values and missing values in the same rows, but columns with the same
+    values can have different fingerprints, e.g. 1 and 1.0, or NaNs with
+    different bits.
+
+    :param ss: pandas Series.
+    :return: Hex digest of the dtype and values of ss.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(str(ss.dtype).encode('utf-8'))
+    if isinstance(ss.dtype, np.dtype) and ss.dtype.kind in 'biufcmM':
+        hasher.update(np.ascontiguousarray(ss.to_numpy()).view(np.uint8))
+    else:
+        frame_hasher = FrameHasher()
+        frame_hasher.update(ss.to_frame())
+        hasher.update(frame_hasher.column_digests()[0].encode('ascii'))
+    return hasher.hexdigest()
+
+
+def fingerprint_series(ss):
+    """
+    Runs in the workers of :func:`column_fingerprints`.
+
+    :param ss: pandas Series.
+    :return: pandas Series of the fingerprint of ss, named after it.
+    """
+    return pd.Series([column_fingerprint(ss)], name=ss.name)
+
+
+def column_fingerprints(df, parallel=None):
+    """
+    :param df: pandas DataFrame.
+    :param parallel: Boolean, whether to fingerprint the columns on the active
+           :class:`~utils.worker_pool.WorkerPool`. If None, they are if df
+           has at least HASH_PARALLEL_MIN_CELLS cells.
+    :return: List of the fingerprints of the columns of df, see
+             :func:`column_fingerprint`.
+    """
+    if parallel is None:
+        parallel = df.size >= HASH_PARALLEL_MIN_CELLS
+    if parallel and df.shape[1] > 1:
+        df_fingerprints = worker_pool.get_pool().map_columns(
+            fingerprint_series, df)
+        return df_fingerprints.iloc[0].tolist()
+    return [column_fingerprint(df.iloc[:, i]) for i in range(df.shape[1])]
+
+
+def file_hash(path):
+    """
+    Hashes the bytes of a file, which is remembered as long as the file's
+    size and modification time don't change.
+
+    :param path: Path to the file.
+    :return: Hex digest of the file.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _file_hashes.get(path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(FILE_BLOCK_BYTES), b''):
+            hasher.update(block)
+    _file_hashes[path] = (stat.st_size, stat.st_mtime_ns, hasher.hexdigest())
+    return _file_hashes[path][2]
@@ -0,0 +1,198 @@
+"""
+Bit-packed cache of where the null values of a loaded DataFrame are, so the
+QCs looking for nulls (qc6, qc7, qc12, qc14, qc26, qc41) don't each build
+their own DataFrame of booleans with df.isnull(), at a byte per cell. The
+Driver hands a :class:`NullMask` of each loaded input file to its QCs
+through their mini config object.
+
+The nulls of a column are packed with np.packbits, a bit per row, the first
+time a QC reads them, and are kept for the rest of the run: 1/8 of the
+memory of the boolean DataFrame. Rows are reduced over many columns on the
+packed bytes, 8 rows at a time, before they are unpacked.
+
+The packed columns aren't pickled, so a NullMask sent to a worker process
+starts empty and packs the columns its QC reads.
+"""
+import numpy as np
+import pandas as pd
+
+NAT_INT = np.iinfo(np.int64).min
+# number of bits set in each byte, for numpy versions without bitwise_count
+BIT_COUNTS = np.array([bin(i).count('1') for i in range(256)],
+                      dtype=np.uint8)
+
+
+def count_bits(arr_packed):
+    """
+    :param arr_packed: 1D uint8 numpy array.
+    :return: Int, the number of bits set in arr_packed.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(arr_packed).sum(dtype=np.int64))
+    return int(BIT_COUNTS[arr_packed].sum(dtype=np.int64))
+
+
+def null_values(ss):
+    """
+    :param ss: pandas Series.
+    :return: 1D boolean numpy array, same as ss.isnull().
+    """
+    values = ss.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biu':
+        return np.zeros(len(values), dtype=bool)
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return np.isnan(values)
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'mM':
+        return values.view(np.int64) == NAT_INT
+    return ss.isnull().to_numpy(dtype=bool)
+
+
+class NullMask:
+    """
+    The nulls of the columns of a DataFrame, packed a column at a time the
+    first time they are read. The methods take the DataFrame the mask was
+    created for, or a subset of its columns.
+    """
+
+    def __init__(self, df):
+        """
+        :param df: pandas DataFrame.
+        """
+        self.columns = df.columns
+        self.set_columns = set(df.columns)
+        self.n_rows = len(df)
+        # column name: 1D uint8 numpy array of the packed nulls
+        self.packed_columns = dict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['packed_columns'] = dict()
+        return state
+
+    def matches(self, df):
+        """
+        :param df: pandas DataFrame.
+        :return: Boolean, whether the mask was created for df, or for a
+                 DataFrame it is a subset of the columns of.
+        """
+        if len(df) != self.n_rows:
+            return False
+        return df.columns is self.columns or \
+            all(colname in self.set_columns for colname in df.columns)
+
+    def packed(self, df, colname):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param colname: Name of a column of df.
+        :return: 1D uint8 numpy array of the nulls of the column, a bit per
+                 row, padded with zeroes to whole bytes.
+        """
+        arr_packed = self.packed_columns.get(colname)
+        if arr_packed is None:
+            arr_packed = np.packbits(null_values(df[colname]))
+            # with the threads executor, two QCs may pack the same column at
+            # once, they store the same bytes
+            self.packed_columns[colname] = arr_packed
+        return arr_packed
+
+    def column(self, df, colname):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param colname: Name of a column of df.
+        :return: 1D boolean numpy array, same as df[colname].isnull().
+        """
+        return np.unpackbits(self.packed(df, colname),
+                             count=self.n_rows).view(bool)
+
+    def block(self, df, ls_cols, start, stop):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param ls_cols: List of column names of df.
+        :param start: Position of the first row of the block.
+        :param stop: Position after the last row of the block.
+        :return: 2D boolean numpy array of shape (rows, len(ls_cols)), in
+                 column-major order, the nulls of df.iloc[start:stop] in the
+                 columns.
+        """
+        start = max(min(start, self.n_rows), 0)
+        stop = max(min(stop, self.n_rows), start)
+        arr_null = np.empty((stop - start, len(ls_cols)), dtype=bool,
+                            order='F')
+        # only the bytes holding the rows of the block are unpacked
+        byte_start = start // 8
+        byte_stop = (stop + 7) // 8
+        offset = start - 8 * byte_start
+        for j, colname in enumerate(ls_cols):
+            arr_bits = np.unpackbits(
+                self.packed(df, colname)[byte_start:byte_stop])
+            arr_null[:, j] = arr_bits[offset:offset + stop - start]
+        return arr_null
+
+    def count(self, df, ls_cols=None):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param ls_cols: List of column names of df, all columns if None.
+        :return: 1D int64 numpy array, the number of nulls of each column.
+        """
+        if ls_cols is None:
+            ls_cols = df.columns
+        return np.array([count_bits(self.packed(df, colname))
+                         for colname in ls_cols], dtype=np.int64)
+
+    def column_all(self, df, ls_cols=None):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param ls_cols: List of column names of df, all columns if None.
+        :return: 1D boolean numpy array, whether each column is all null,
+                 same as df[ls_cols].isnull().all(axis=0).
+        """
+        return self.count(df, ls_cols) == self.n_rows
+
+    def reduce_rows(self, df, ufunc, ls_cols=None):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param ufunc: np.bitwise_or or np.bitwise_and.
+        :param ls_cols: List of column names of df, all columns if None.
+        :return: 1D boolean numpy array, the packed nulls of the columns
+                 reduced with ufunc, unpacked to a value per row.
+        """
+        if ls_cols is None:
+            ls_cols = df.columns
+        # the identity of the reduction, for the rows of frames without
+        # columns
+        arr_bytes = np.full((self.n_rows + 7) // 8,
+                            0 if ufunc is np.bitwise_or else 255,
+                            dtype=np.uint8)
+        for colname in ls_cols:
+            ufunc(arr_bytes, self.packed(df, colname), out=arr_bytes)
+        return np.unpackbits(arr_bytes, count=self.n_rows).view(bool)
+
+    def row_any(self, df, ls_cols=None):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param ls_cols: List of column names of df, all columns if None.
+        :return: 1D boolean numpy array, same as
+                 df[ls_cols].isnull().any(axis=1).
+        """
+        return self.reduce_rows(df, np.bitwise_or, ls_cols)
+
+    def row_all(self, df, ls_cols=None):
+        """
+        :param df: pandas DataFrame the mask matches.
+        :param ls_cols: List of column names of df, all columns if None.
+        :return: 1D boolean numpy array, same as
+                 df[ls_cols].isnull().all(axis=1).
+        """
+        return self.reduce_rows(df, np.bitwise_and, ls_cols)
+
+
+def get_null_mask(df, null_mask=None):
+    """
+    :param df: pandas DataFrame.
+    :param null_mask: :class:`NullMask` from the mini config object of a QC,
+           or None.
+    :return: null_mask if it matches df, otherwise a new NullMask of df.
+    """
+    if null_mask is not None and null_mask.matches(df):
+        return null_mask
+    return NullMask(df)
@@ -0,0 +1,215 @@
+"""
+Persistent cache of the ReportItems of the QCs, so the QCs of an input file
+that didn't change since an earlier run aren't executed again, e.g. on the
+chunk files of a multi-file input when the same config is run every night.
+
+The ReportItem of a QC is keyed by the hash of:
+    - the input file: the hash of its bytes (see
+      :func:`~utils.hashing.file_hash`), or of the DataFrame for the dataframe
+      source,
+    - the qc section of the QC in the config, i.e. its qc_num, level and
+      qc_params,
+    - the general section of the config, without the input files and the
+      options that only change how the QCs are executed,
+    - the files named in the two sections, e.g. the clinical code files, by
+      the hash of their bytes,
+    - the source code of paqc, so results of other versions aren't reused,
+    - whether the data was hashed (to_hash of the Driver).
+
+The ReportItems are pickled into cache_dir (general section of the config,
+paqc_cache in the output_dir by default). Once the cache is larger than
+cache_max_mb megabytes, the least recently used ReportItems are deleted.
+The ErrorItems of the QCs that couldn't be executed aren't cached, as their
+errors may be transient.
+"""
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+
+from paqc.report import report
+from paqc.utils import hashing
+
+# bumped when the format of the entries changes
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = 'paqc_cache'
+DEFAULT_CACHE_MAX_MB = 512
+ENTRY_SUFFIX = '.pkl'
+# options of the general section that don't change the ReportItems
+EXECUTION_OPTIONS = ('output_dir', 'executor', 'shard_workers', 'chunksize',
+                     'memory_map', 'cache_dir', 'cache_max_mb')
+# keys of the qc section the Driver fills in for each input file
+QC_RUN_KEYS = ('input_file', 'input_file_path', 'data_hash')
+
+# hash of the source code of paqc, computed once per process
+_code_version = None
+
+
+def code_version():
+    """
+    :return: Hex digest of the .py files of paqc, without its tests.
+    """
+    global _code_version
+    if _code_version is None:
+        package_dir = os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)))
+        hasher = hashlib.blake2b(digest_size=hashing.DIGEST_SIZE)
+        for dir_path, dir_names, file_names in os.walk(package_dir):
+            dir_names[:] = sorted(dir_name for dir_name in dir_names
+                                  if dir_name not in ('tests', '__pycache__'))
+            for file_name in sorted(file_names):
+                if file_name.endswith('.py'):
+                    path = os.path.join(dir_path, file_name)
+                    hasher.update(os.path.relpath(path, package_dir).encode(
+                        'utf-8'))
+                    hasher.update(hashing.file_hash(path).encode('ascii'))
+        _code_version = hasher.hexdigest()
+    return _code_version
+
+
+def fingerprint_config(value):
+    """
+    :param value: A section of the config, or a value of it.
+    :return: value with its dicts as sorted lists of (key, value) and the
+             paths of existing files as (path, hash of the file's bytes).
+    """
+    if isinstance(value, dict):
+        return sorted((str(k), fingerprint_config(v))
+                      for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [fingerprint_config(v) for v in value]
+    if isinstance(value, str) and os.path.isfile(value):
+        return value, hashing.file_hash(value)
+    return value
+
+
+def qc_key(input_fingerprint, qc, general, to_hash=False):
+    """
+    :param input_fingerprint: Hex digest of the input file, see
+           :func:`~utils.hashing.file_hash` and
+           :func:`~utils.hashing.hash_frame`.
+    :param qc: dictionary of the qc in the config.
+    :param general: General section of the config.
+    :param to_hash: Boolean, whether the data_hash of the ReportItem is set.
+    :return: Hex digest the ReportItem of the QC is cached under.
+    """
+    qc = {k: v for k, v in qc.items() if k not in QC_RUN_KEYS}
+    general = {k: v for k, v in general.items()
+               if k not in EXECUTION_OPTIONS and
+               not re.match(r"^input\d{1,2}$", k)}
+    hasher = hashlib.blake2b(digest_size=hashing.DIGEST_SIZE)
+    hasher.update(repr((CACHE_VERSION, code_version(), input_fingerprint,
+                        fingerprint_config(qc), fingerprint_config(general),
+                        bool(to_hash))).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of pickled ReportItems, one file per key. Entries are written
+    to a temporary file first and then renamed, so the processes QC-ing the
+    chunk files of an input at once can share the cache.
+    """
+
+    def __init__(self, cache_dir, max_mb=DEFAULT_CACHE_MAX_MB):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = int(max_mb * 2 ** 20)
+
+    def entry_path(self, key):
+        """
+        :param key: Output of :func:`~utils.result_cache.qc_key`.
+        :return: Path to the file of the entry.
+        """
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """
+        :param key: Output of :func:`~utils.result_cache.qc_key`.
+        :return: The cached :obj:`~report.report.ReportItem`, or None if
+                 there's none or it can't be read.
+        """
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                rpi = report.ReportItem(**pickle.load(f))
+        except Exception:
+            return None
+        # mark the entry as recently used for the eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return rpi
+
+    def put(self, key, rpi):
+        """
+        :param key: Output of :func:`~utils.result_cache.qc_key`.
+        :param rpi: :obj:`~report.report.ReportItem` to cache.
+        :return: None
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(vars(rpi), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.entry_path(key))
+        except:
+            os.remove(tmp_path)
+            raise
+
+    def entries(self):
+        """
+        :return: List of (modification time, size, path) of the entries.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        ls_entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                stat = entry.stat()
+                ls_entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return ls_entries
+
+    def evict(self):
+        """
+        Deletes the least recently used entries, until the cache is at most
+        max_mb megabytes.
+
+        :return: Number of deleted entries.
+        """
+        ls_entries = sorted(self.entries())
+        total_bytes = sum(size for _, size, _ in ls_entries)
+        n_deleted = 0
+        for _, size, path in ls_entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            n_deleted += 1
+        return n_deleted
+
+    def clear(self):
+        """
+        Deletes all entries.
+
+        :return: None
+        """
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+def cache_from_config(general):
+    """
+    :param general: General section of the config.
+    :return: :class:`ResultCache` in cache_dir, by default paqc_cache in the
+             output_dir, with at most cache_max_mb megabytes.
+    """
+    cache_dir = general.get('cache_dir')
+    if cache_dir is None:
+        cache_dir = os.path.join(general['output_dir'], DEFAULT_CACHE_DIR)
+    return ResultCache(cache_dir, general.get('cache_max_mb',
+                                              DEFAULT_CACHE_MAX_MB))
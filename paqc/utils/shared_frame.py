@@ -0,0 +1,188 @@
+"""
+Hands DataFrames to worker processes without pickling their numeric and
+datetime columns.
+
+A :class:`SharedFrame` copies the numpy buffers of those columns once into a
+block of shared memory. What's sent to the workers is a small
+:class:`SharedFrameHandle`, with the name of the block and where each column
+lives in it, from which the workers rebuild the DataFrame as read-only views
+on the shared memory. Other columns, e.g. strings, are pickled along with the
+handle as before. The columns are placed by position, so DataFrames with
+duplicate column names are rebuilt as they were.
+
+The process that creates the SharedFrame owns the shared memory and frees it
+when the SharedFrame is closed, so it has to outlive the tasks that use it,
+e.g. by using it as a context manager around the map.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# column buffers start at multiples of this, in bytes
+ALIGNMENT = 64
+
+# shared memory blocks this process attached to: name: SharedMemory
+_attached = dict()
+
+
+def is_shareable(ss):
+    """
+    :param ss: pandas Series.
+    :return: Boolean, whether the values of ss are a numpy array of numbers,
+             booleans or datetimes, which can be put in shared memory.
+    """
+    values = ss.values
+    return isinstance(values, np.ndarray) and values.dtype.kind in 'biufcmM'
+
+
+def release_stale(name=None):
+    """
+    Closes the mappings of shared memory blocks that couldn't be closed when
+    they were detached, because something still referenced them then.
+
+    :param name: Name of a block to keep.
+    :return: None
+    """
+    for stale_name in list(_attached):
+        if stale_name != name:
+            try:
+                _attached[stale_name].close()
+            except BufferError:
+                continue
+            del _attached[stale_name]
+
+
+class SharedFrameHandle:
+    """
+    Picklable description of (some of the columns of) a SharedFrame.
+    """
+
+    def __init__(self, name, columns, layout, index, df_other):
+        """
+        :param name: Name of the shared memory block.
+        :param columns: List of all column names, in order.
+        :param layout: List of the (dtype string, offset in bytes) of each
+               column in shared memory, None for the columns that aren't
+               shared.
+        :param index: Index of the DataFrame.
+        :param df_other: DataFrame of the columns that aren't shared, in
+               order.
+        """
+        self.name = name
+        self.columns = columns
+        self.layout = layout
+        self.index = index
+        self.df_other = df_other
+
+    def attach(self):
+        """
+        :return: pandas DataFrame whose shared columns are read-only views on
+                 the shared memory. Call :meth:`detach` once it's not needed
+                 anymore.
+        """
+        release_stale(self.name)
+        if self.name not in _attached:
+            _attached[self.name] = shared_memory.SharedMemory(name=self.name)
+        buf = _attached[self.name].buf
+        # position of the column: Series
+        dict_cols = dict()
+        i_other = 0
+        for i, placement in enumerate(self.layout):
+            if placement is None:
+                dict_cols[i] = self.df_other.iloc[:, i_other]
+                i_other += 1
+            else:
+                dtype, offset = placement
+                arr = np.ndarray(len(self.index), dtype=np.dtype(dtype),
+                                 buffer=buf, offset=offset)
+                arr.flags.writeable = False
+                dict_cols[i] = pd.Series(arr, index=self.index, copy=False)
+        df = pd.DataFrame(dict_cols, index=self.index,
+                          columns=range(len(self.layout)), copy=False)
+        df.columns = pd.Index(self.columns)
+        return df
+
+    def detach(self):
+        """
+        Closes this process' mapping of the shared memory. DataFrames
+        returned by :meth:`attach` mustn't be used anymore after this, if any
+        still reference it, the mapping is kept until the next detach.
+
+        :return: None
+        """
+        shm = _attached.get(self.name)
+        if shm is None:
+            return
+        try:
+            shm.close()
+        except BufferError:
+            return
+        del _attached[self.name]
+
+    def subset(self, positions):
+        """
+        :param positions: List of column positions.
+        :return: SharedFrameHandle of only these columns, sharing the memory.
+        """
+        # position of the column: its position in df_other
+        dict_other = {i: i_other for i_other, i in enumerate(
+            i for i, placement in enumerate(self.layout) if placement is None)}
+        return SharedFrameHandle(
+            self.name, [self.columns[i] for i in positions],
+            [self.layout[i] for i in positions], self.index,
+            self.df_other.iloc[:, [dict_other[i] for i in positions
+                                   if i in dict_other]])
+
+
+class SharedFrame:
+    """
+    Owner of the shared memory that holds the shareable columns of a
+    DataFrame.
+    """
+
+    def __init__(self, df):
+        """
+        :param df: pandas DataFrame, its shareable columns are copied to
+               shared memory.
+        """
+        layout = []
+        size = 0
+        for i in range(df.shape[1]):
+            values = df.iloc[:, i].values
+            if is_shareable(df.iloc[:, i]):
+                layout.append((values.dtype.str, size))
+                size += -(-values.nbytes // ALIGNMENT) * ALIGNMENT
+            else:
+                layout.append(None)
+        # a block can't be empty
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for i, placement in enumerate(layout):
+            if placement is not None:
+                dtype, offset = placement
+                arr = np.ndarray(len(df), dtype=np.dtype(dtype),
+                                 buffer=self.shm.buf, offset=offset)
+                arr[:] = df.iloc[:, i].values
+        self.handle = SharedFrameHandle(
+            self.shm.name, list(df.columns), layout, df.index,
+            df.iloc[:, [i for i, placement in enumerate(layout)
+                        if placement is None]])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        """
+        Frees the shared memory. Workers that still have it attached keep
+        their mapping until they detach.
+
+        :return: None
+        """
+        if self.shm is not None:
+            self.handle.detach()
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
@@ -6,20 +6,24 @@ import pandas as pd
 import numpy as np
 import re
 import operator
-import os
+
+from paqc.utils import catalog
+from paqc.utils import hashing
+from paqc.utils.feature_matcher import FeatureMatcher
 
 
 def generate_hash(df):
     """
     Given a pandas DataFrame, this function will generate a unique hash value
     of it. This enables us to precisely identify which version of a data file
-    the test was carried out on.
+    the test was carried out on. The hash is the same in every process, and
+    is computed column by column, see :mod:`~utils.hashing`.
 
     :param df: Pandas DataFrame object.
-    :return: Hash integer that uniquely maps to a certain DataFrame.
+    :return: Hex string that uniquely maps to a certain DataFrame.
     """
 
-    return hash(df.values.tobytes())
+    return hashing.hash_frame(df)
 
 
 def write_list_to_csv(ls_items, path_csv):
@@ -92,15 +96,12 @@ def generate_list_cc0x_columns(df, dict_config, lvl1_desc, list_keys=(
     """
     # Take all the column names based on the keys for the dict_config
     ls_cols = generate_list_columns(df, dict_config, list_keys)
-    # Take all the feature names that belong to the right lvl1_desc and
-    # clean string
-    ls_cc0x_feats = generate_list_cc0x_feats(dict_config, lvl1_desc=lvl1_desc)
-    ls_cc0x_feats = [clean_string(cc0x_feat) for cc0x_feat in ls_cc0x_feats]
+    # Match the feature names that belong to the right lvl1_desc
+    matcher = generate_cc0x_matcher(dict_config, lvl1_desc=lvl1_desc)
 
     # Take all column names that belong both to right key and have the right
     # PROD_CUSTOM_LVL1_DESC
-    prog = re.compile("(" + ")|(".join(ls_cc0x_feats) + ")")
-    ls_cc0x_cols = [colname for colname in ls_cols if prog.search(
+    ls_cc0x_cols = [colname for colname in ls_cols if matcher.search(
         clean_string(colname))]
     return ls_cc0x_cols
 
@@ -110,28 +111,27 @@ def generate_list_cc0x_feats(dict_config, lvl1_desc):
 
     :param dict_config:
     :param lvl1_desc:
-    :return:
+    :return: List of the level 2 descriptions that have the level 1
+             description in the clinical code files, cleaned with
+             :func:`clean_string`.
     """
-    code_lvl1_col = 'PROD_CUSTOM_LVL1_DESC'
-    code_lvl2_col = 'PROD_CUSTOM_LVL2_DESC'
-    ls_files = ['ICD_file', 'NCD_file', 'CPT_file', 'HCPC_file',
-                'speciality_file']
+    # code_cache uses clean_string, so it's only imported here
+    from paqc.utils import code_cache
 
-    # Load the seperate CSV files
-    dict_dfs = {}
-    for file in ls_files:
-        dict_dfs[file] = pd.read_csv(dict_config['general'][file])
+    # The code files are read, grouped by level 1 description and cleaned
+    # once per process, see utils.code_cache
+    return code_cache.get_lvl2_descs(dict_config['general'], lvl1_desc)
 
-    # Create the dict of 3 sets, each containing the level 2 descriptions that
-    # have the level 1 description of the dictionary key.
-    set_lvl2_desc = set()
-    for df in dict_dfs.values():
-        set_lvl2_desc.update(df[df[code_lvl1_col] == lvl1_desc][code_lvl2_col])
-    # Changes set into list and make sure that each description string in
-    # those lists is in the right format
-    ls_lvl2_desc = [clean_string(desc) for desc in set_lvl2_desc]
 
-    return ls_lvl2_desc
+def generate_cc0x_matcher(dict_config, lvl1_desc):
+    """
+    :param dict_config:
+    :param lvl1_desc:
+    :return: :obj:`~utils.feature_matcher.FeatureMatcher` of the cleaned
+             level 2 descriptions that have the level 1 description, see
+             :func:`generate_list_cc0x_feats`.
+    """
+    return FeatureMatcher(generate_list_cc0x_feats(dict_config, lvl1_desc))
 
 
 def generate_list_columns(df, dict_config, list_keys):
@@ -149,6 +149,10 @@ def generate_list_columns(df, dict_config, list_keys):
     :return: List of all column names that match the values of the key-value
     pairs from list_keys.
     """
+    # use the column index the Driver computed for this DataFrame
+    column_index = dict_config.get('column_index')
+    if column_index is not None and column_index.matches(df):
+        return column_index.list_columns(list_keys)
     list_regex = ["%s$" % dict_config['general'][key] for key in list_keys
                   if key in dict_config['general']]
     if list_regex:
@@ -180,6 +184,10 @@ def generate_dict_grouped_columns(df, dict_config, list_keys):
             suffixes.
     :return: A dictionary of dictionaries
     """
+    # use the column index the Driver computed for this DataFrame
+    column_index = dict_config.get('column_index')
+    if column_index is not None and column_index.matches(df):
+        return column_index.grouped_columns(list_keys)
     dict_regex = {re.sub(r'_cols$', '', key): "%s$" % dict_config['general'][
         key] for key in list_keys if key in dict_config['general']}
 
@@ -251,6 +259,119 @@ def fraction_zeroes_or_null(ss):
     return is_zero_or_null(ss).sum()/len(ss)
 
 
+def zero_or_null_matrix(df, ls_cols, arr_null=None):
+    """
+    Applies :func:`is_zero_or_null` to several columns at once.
+
+    :param df: Pandas DataFrame
+    :param ls_cols: List of column names of df
+    :param arr_null: 2D boolean numpy array of the nulls of the columns in
+           column-major order, e.g. from :class:`~utils.null_mask.NullMask`,
+           which is filled in and returned. If None, the nulls are computed.
+    :return: 2D boolean numpy array of shape (len(df), len(ls_cols)), column
+             j holds is_zero_or_null(df[ls_cols[j]]).
+    """
+    if arr_null is not None:
+        # only the zeroes of the numeric columns are left to add
+        for j, colname in enumerate(ls_cols):
+            ss = df[colname]
+            if pd.api.types.is_numeric_dtype(ss.dtype):
+                values = ss.values
+                if isinstance(values, np.ndarray):
+                    arr_null[:, j] |= values == 0
+                else:
+                    arr_null[:, j] |= (ss == 0).fillna(False).to_numpy(
+                        dtype=bool)
+        return arr_null
+
+    # column-major, each column is filled with one contiguous write
+    arr_zero_null = np.empty((len(df), len(ls_cols)), dtype=bool, order='F')
+    for j, colname in enumerate(ls_cols):
+        ss = df[colname]
+        values = ss.values
+        # same as is_zero_or_null, on the numpy array to skip building
+        # intermediate Series
+        if not isinstance(values, np.ndarray):
+            arr_zero_null[:, j] = is_zero_or_null(ss).values
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            np.logical_or(values == 0, pd.isnull(values),
+                          out=arr_zero_null[:, j])
+        else:
+            arr_zero_null[:, j] = pd.isnull(values)
+    return arr_zero_null
+
+
+def grouped_fraction_zeroes_or_null(df, group_col, batch_cells=10000000,
+                                    max_onehot_groups=64, profile=None):
+    """
+    Same values as df.groupby(group_col).agg(fraction_zeroes_or_null),
+    without calling a function per column and group: the
+    :func:`zero_or_null_matrix` of a batch of columns is counted per group
+    with a single product of a one-hot matrix of the groups and the matrix.
+    Rows with a missing group_col are skipped and the groups are sorted, as
+    by groupby.
+
+    :param df: Pandas DataFrame
+    :param group_col: Name of the column to group by, KeyError if it isn't
+           a column of df.
+    :param batch_cells: Number of cells of the columns counted at once.
+    :param max_onehot_groups: Above this number of groups, the rows are
+           sorted by group and summed instead, to bound the memory of the
+           one-hot matrix.
+    :param profile: :class:`~utils.column_profile.ColumnProfile` of df, or
+           None. The columns it already counted no zero or null values in,
+           or only zero or null values, have a fraction of 0 or 1 in all
+           groups and aren't counted per group.
+    :return: Pandas DataFrame of float64, with a row per group and the other
+             columns of df as columns.
+    """
+    codes, uniques = pd.factorize(df[group_col], sort=True)
+    n_groups = len(uniques)
+    columns = df.columns.drop(group_col)
+    ls_cols = columns.tolist()
+    arr_valid = codes >= 0
+    arr_fract = np.empty((n_groups, len(ls_cols)))
+    # positions in ls_cols of the columns to count per group
+    arr_positions = np.arange(len(ls_cols))
+    if profile is not None:
+        # counting the zero or null values of the other columns would take
+        # about as long as counting them per group
+        arr_known = np.array([profile.known(colname, ('n_null', 'n_zero'))
+                              for colname in ls_cols], dtype=bool)
+        arr_n = profile.stat(df, 'n_zero_or_null',
+                             [ls_cols[j] for j in arr_positions[arr_known]]
+                             ).to_numpy()
+        arr_constant = (arr_n == 0) | (arr_n == len(df))
+        arr_skip = arr_positions[arr_known][arr_constant]
+        arr_fract[:, arr_skip] = arr_n[arr_constant] > 0
+        arr_positions = np.setdiff1d(arr_positions, arr_skip)
+    if n_groups <= max_onehot_groups:
+        # float32 sums of zeroes and ones are exact up to 2 ** 24 rows
+        dtype = np.float32 if len(df) <= 2 ** 24 else np.float64
+        arr_onehot = np.zeros((n_groups, len(df)), dtype=dtype)
+        arr_onehot[codes[arr_valid], np.flatnonzero(arr_valid)] = 1
+    else:
+        arr_order = np.argsort(codes, kind='stable')
+        arr_order = arr_order[arr_valid[arr_order]]
+        arr_starts = np.searchsorted(codes[arr_order], np.arange(n_groups))
+    arr_sizes = np.bincount(codes[arr_valid], minlength=n_groups)
+
+    batch_cols = max(batch_cells // max(len(df), 1), 1)
+    for start in range(0, len(arr_positions), batch_cols):
+        arr_batch = arr_positions[start:start + batch_cols]
+        arr_zero_null = zero_or_null_matrix(df, [ls_cols[j] for j in
+                                                 arr_batch])
+        if n_groups <= max_onehot_groups:
+            arr_counts = arr_onehot @ arr_zero_null.astype(dtype)
+        else:
+            arr_counts = np.add.reduceat(arr_zero_null[arr_order],
+                                         arr_starts, axis=0, dtype=np.int64)
+        arr_fract[:, arr_batch] = arr_counts / arr_sizes[:, np.newaxis]
+
+    return pd.DataFrame(arr_fract, index=pd.Index(uniques, name=group_col),
+                        columns=columns)
+
+
 def mean_all_types(ss):
     """
     Uses the correct mean function, based on the input type.
@@ -292,8 +413,11 @@ def mean_datetime(ss_datetime):
     :return:
     """
     ss_datetime_int = ss_datetime[~ss_datetime.isnull()].astype('int64')
+    if len(ss_datetime_int) == 0:
+        return pd.NaT
     dt_mean_int = int(np.mean(ss_datetime_int))
-    return transform_int_to_dt(dt_mean_int)
+    return transform_int_to_dt(dt_mean_int,
+                               np.datetime_data(ss_datetime.dtype)[0])
 
 
 def median_datetime(ss_datetime):
@@ -303,55 +427,39 @@ def median_datetime(ss_datetime):
     :return:
     """
     ss_datetime_int = ss_datetime[~ss_datetime.isnull()].astype('int64')
+    if len(ss_datetime_int) == 0:
+        return pd.NaT
     dt_median_int = int(np.median(ss_datetime_int))
-    return transform_int_to_dt(dt_median_int)
+    return transform_int_to_dt(dt_median_int,
+                               np.datetime_data(ss_datetime.dtype)[0])
 
 
-def transform_int_to_dt(date_int):
-    return pd.to_datetime(np.datetime64(date_int, 'ns'))
+def transform_int_to_dt(date_int, unit='ns'):
+    """
+    :param date_int: Integer, number of units since the epoch.
+    :param unit: Unit of date_int, e.g. the unit of the datetime64 dtype of
+           the column it comes from.
+    :return: pandas Timestamp.
+    """
+    return pd.to_datetime(np.datetime64(int(date_int), unit))
 
 
 def get_qcs_desc():
     """
-    Loads the qc list file from data, which has to be exported and downloaded
-    from the online tracker manually every time it's updated.
+    Looks up the descriptions of the QCs in the catalog compiled from the qc
+    list file in data, see :mod:`~utils.catalog`.
 
     :return: Dictionary of qc_num: qc description pairs.
     """
-    dirname = os.path.dirname(os.path.abspath(__file__))
-    status_QC_path = os.path.join(dirname, '../data/Status_QC.xlsx')
-    df = pd.read_excel(status_QC_path)
-    qc_dict = dict()
-
-    for i in df.index:
-        row = df.loc[i]
-        id = row.ID
-        if not pd.isnull(id) and id not in qc_dict:
-            key = 'qc%d' % id
-            qc_dict[key] = row['Test description']
-    return qc_dict
+    return catalog.get_catalog().get_descriptions()
 
 
 def get_qcs_compare():
     """
-    Loads the qc list file from data, which has to be exported and downloaded
-    from the online tracker manually every time it's updated. For each QC it
-    checks if it's a comparison type, i.e. it requires two dataframes as input.
+    Looks up for each QC in the catalog compiled from the qc list file in data,
+    whether it's a comparison type, i.e. it requires two dataframes as input.
+    See :mod:`~utils.catalog`.
 
     :return: Dictionary of qc_num: boolean, whether the QC is a compare.
     """
-    dirname = os.path.dirname(os.path.abspath(__file__))
-    status_QC_path = os.path.join(dirname, '../data/Status_QC.xlsx')
-    df = pd.read_excel(status_QC_path)
-    qc_dict = dict()
-
-    for i in df.index:
-        row = df.loc[i]
-        id = row.ID
-        if not pd.isnull(id) and id not in qc_dict:
-            key = 'qc%d' % id
-            if row['Test data'] == "Compare":
-                qc_dict[key] = True
-            else:
-                qc_dict[key] = False
-    return qc_dict
+    return catalog.get_catalog().get_compare()
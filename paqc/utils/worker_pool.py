@@ -0,0 +1,235 @@
+"""
+Process pool shared by the connectors (e.g. the date parser) and any QC that
+wants to fan work out to other cores.
+
+The Driver creates a single :class:`WorkerPool` and activates it for the whole
+run with a ``with`` block, so the worker processes are started at most once
+per run instead of once per file. Code that needs a pool gets the active one
+with :func:`get_pool`; outside of a Driver run this is a default pool that
+lives as long as the process.
+
+The pool keeps track of how long it took to start, how long its maps took and
+how much of that time the workers actually spent computing, so its overhead
+can be compared to the useful work it did.
+"""
+import atexit
+import os
+import time
+from functools import partial
+from multiprocessing import cpu_count, Pool
+
+import pandas as pd
+
+from paqc.utils import shared_frame
+
+# Number of cells (rows x columns) a batch of columns aims for, so small
+# columns aren't sent to the workers one by one
+BATCH_CELLS = 1000000
+
+
+def _timed_call(func, item):
+    """
+    Runs in the workers.
+
+    :return: Tuple of the time func(item) took in seconds and its output.
+    """
+    start = time.perf_counter()
+    output = func(item)
+    return time.perf_counter() - start, output
+
+
+def _apply_columns(func, kwargs, df_batch):
+    """
+    Runs in the workers.
+
+    :return: DataFrame of func applied to each column of df_batch.
+    """
+    return pd.concat([func(df_batch.iloc[:, i], **kwargs)
+                      for i in range(df_batch.shape[1])], axis=1)
+
+
+def _apply_columns_shared(func, kwargs, handle):
+    """
+    Runs in the workers, same as :func:`_apply_columns` on the columns of a
+    :class:`~utils.shared_frame.SharedFrameHandle`.
+    """
+    df_batch = handle.attach()
+    try:
+        return _apply_columns(func, kwargs, df_batch)
+    finally:
+        del df_batch
+        handle.detach()
+
+
+def batch_columns(df, n_batches_min, batch_cells=BATCH_CELLS):
+    """
+    Splits the columns of df in consecutive batches of about batch_cells
+    cells, but in at least n_batches_min batches if there are enough columns.
+
+    :param df: pandas DataFrame.
+    :param n_batches_min: Minimum number of batches, e.g. the number of
+           workers.
+    :param batch_cells: Number of cells a batch aims for.
+    :return: List of lists of column names.
+    """
+    n_cells = len(df) * df.shape[1]
+    batch_cells = max(1, min(batch_cells, n_cells // max(1, n_batches_min)))
+    ls_batches = []
+    ls_batch = []
+    for col in df.columns:
+        ls_batch.append(col)
+        if len(ls_batch) * len(df) >= batch_cells:
+            ls_batches.append(ls_batch)
+            ls_batch = []
+    if ls_batch:
+        ls_batches.append(ls_batch)
+    return ls_batches
+
+
+class WorkerPool:
+    """
+    Lazily started multiprocessing Pool, which records its overhead.
+    """
+
+    def __init__(self, processes=None, batch_cells=BATCH_CELLS):
+        """
+        :param processes: Number of worker processes, all cores by default.
+        :param batch_cells: Number of cells a batch of columns aims for, see
+               :func:`batch_columns`.
+        """
+        self.processes = processes or cpu_count()
+        self.batch_cells = batch_cells
+        self._pool = None
+        self._pid = None
+        self.stats = dict(startup=0., maps=0, tasks=0, wall=0., work=0.,
+                          overhead=0.)
+
+    def __enter__(self):
+        _active_pools.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        _active_pools.remove(self)
+        self.close()
+
+    def __getstate__(self):
+        """
+        A pickled pool, e.g. as part of the Driver sent to another process,
+        starts its own workers when it's used there.
+        """
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pid'] = None
+        return state
+
+    def get_pool(self):
+        """
+        :return: The multiprocessing Pool, started on the first call.
+        """
+        # the workers of a pool belong to the process that started it, a
+        # forked process has to start its own
+        if self._pool is not None and self._pid != os.getpid():
+            self._pool = None
+        if self._pool is None:
+            start = time.perf_counter()
+            self._pool = Pool(self.processes)
+            self._pid = os.getpid()
+            self.stats['startup'] += time.perf_counter() - start
+            self.stats['overhead'] += time.perf_counter() - start
+        return self._pool
+
+    def map(self, func, items):
+        """
+        Same as Pool.map, with timing.
+
+        :param func: Picklable function of a single argument.
+        :param items: List of arguments.
+        :return: List of the outputs of func, in the order of items.
+        """
+        pool = self.get_pool()
+        start = time.perf_counter()
+        ls_outputs = pool.map(partial(_timed_call, func), items)
+        wall = time.perf_counter() - start
+        work = sum(elapsed for elapsed, output in ls_outputs)
+        self.stats['maps'] += 1
+        self.stats['tasks'] += len(items)
+        self.stats['wall'] += wall
+        self.stats['work'] += work
+        # time on top of the work perfectly spread over the workers
+        parallelism = max(1, min(self.processes, len(items)))
+        self.stats['overhead'] += max(0., wall - work / parallelism)
+        return [output for elapsed, output in ls_outputs]
+
+    def map_columns(self, func, df, **kwargs):
+        """
+        Applies func to each column of df on the workers, sending the columns
+        in batches. Numeric and datetime columns are handed over through
+        shared memory, see :class:`~utils.shared_frame.SharedFrame`.
+
+        :param func: Picklable function of a pandas Series.
+        :param df: pandas DataFrame.
+        :param kwargs: Keyword arguments of func.
+        :return: pandas DataFrame of the outputs of func, in the order of the
+                 columns of df.
+        """
+        # the batches are consecutive columns, they're taken by position as
+        # column names can be duplicated
+        ls_positions = []
+        start = 0
+        for ls_batch in batch_columns(df, self.processes, self.batch_cells):
+            ls_positions.append(list(range(start, start + len(ls_batch))))
+            start += len(ls_batch)
+        if not any(shared_frame.is_shareable(df.iloc[:, i])
+                   for i in range(df.shape[1])):
+            ls_dfs = self.map(partial(_apply_columns, func, kwargs),
+                              [df.iloc[:, positions]
+                               for positions in ls_positions])
+        else:
+            # numeric and datetime columns are read from shared memory
+            # instead of being pickled to the workers
+            with shared_frame.SharedFrame(df) as frame:
+                ls_dfs = self.map(partial(_apply_columns_shared, func, kwargs),
+                                  [frame.handle.subset(positions)
+                                   for positions in ls_positions])
+        return pd.concat(ls_dfs, axis=1)
+
+    def report(self):
+        """
+        :return: String summary of the pool's overhead and useful work.
+        """
+        return ("Worker pool of %d processes: started in %.2fs, %d maps of %d "
+                "tasks took %.2fs, %.2fs of work in the workers, %.2fs "
+                "overhead." % (self.processes, self.stats['startup'],
+                               self.stats['maps'], self.stats['tasks'],
+                               self.stats['wall'], self.stats['work'],
+                               self.stats['overhead']))
+
+    def close(self):
+        """
+        Stops the workers, if they were started. The pool starts new ones if
+        it's used again.
+        """
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.close()
+            self._pool.join()
+        self._pool = None
+        self._pid = None
+
+
+# pools activated with a with block, the last one is used
+_active_pools = []
+_default_pool = None
+
+
+def get_pool():
+    """
+    :return: The :class:`WorkerPool` activated last with a with block, or the
+             default pool of this process if there's none.
+    """
+    global _default_pool
+    if _active_pools:
+        return _active_pools[-1]
+    if _default_pool is None:
+        _default_pool = WorkerPool()
+        atexit.register(_default_pool.close)
+    return _default_pool